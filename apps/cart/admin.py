@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Cart, CartItem
+from .models import Cart, CartItem, StockReservation
 
 
 class CartItemInline(admin.TabularInline):
@@ -15,10 +15,14 @@ class CartAdmin(admin.ModelAdmin):
     list_filter = ("created_at", "updated_at")
     inlines = [CartItemInline]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_totals()
+
     def total(self, obj):
         return obj.total
 
     total.short_description = "Итоговая сумма"
+    total.admin_order_field = "subtotal"
 
 
 @admin.register(CartItem)
@@ -28,3 +32,14 @@ class CartItemAdmin(admin.ModelAdmin):
     readonly_fields = ("total_price",)
     search_fields = ("cart__id", "product__name")
     list_filter = ("cart__created_at",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_totals().select_related("product")
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = ("product", "cart_id", "quantity", "expires_at", "created_at")
+    list_select_related = ("product",)
+    search_fields = ("cart_id", "product__name", "product__sku")
+    list_filter = ("expires_at",)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CartConfig(AppConfig):
     # default_auto_field = "django.db.models.UUIDField"
     name = "apps.cart"
+
+    def ready(self):
+        from apps.cart import signals  # noqa: F401
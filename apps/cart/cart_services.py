@@ -1,54 +1,82 @@
 from decimal import Decimal
 
-from django.db import transaction
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.utils.module_loading import import_string
 
 from apps.cart.models import Cart, CartItem
-from apps.cart.validators import validate_stock
-from apps.catalog.models import Product
+from apps.cart.storage import DatabaseCartStorage
 
 
 class CartService:
-    def __init__(self, cart: Cart):
-        self.cart = cart
+    """
+    Операции с корзиной поверх хранилища (apps.cart.storage).
+    Корзины пользователей хранятся в БД, гостевые — в CART_GUEST_STORAGE.
+    """
+
+    def __init__(self, cart: Cart = None, storage=None):
+        self.storage = storage or DatabaseCartStorage(cart=cart)
+
+    @property
+    def cart(self) -> Cart:
+        return self.storage.cart
 
     @staticmethod
     def get_or_create_cart(request) -> Cart:
+        return DatabaseCartStorage.get_or_create(request)
+
+    @staticmethod
+    def guest_storage(request):
+        return import_string(settings.CART_GUEST_STORAGE)(request=request)
+
+    @staticmethod
+    def merge_guest_cart(request, user):
+        """Переносит гостевую корзину сессии в корзину пользователя (вход)."""
+        service = CartService(storage=CartService.guest_storage(request))
+        if service.materialize(user=user) is not None:
+            service.clear()
+
+    @staticmethod
+    def for_request(request) -> "CartService":
         if request.user.is_authenticated:
-            cart, _ = Cart.objects.get_or_create(user=request.user)
-        else:
-            if not request.session.session_key:
-                request.session.save()
-            cart, _ = Cart.objects.get_or_create(
-                session_key=request.session.session_key
-            )
-        return cart
-
-    @transaction.atomic
+            return CartService(storage=DatabaseCartStorage(request=request))
+        return CartService(storage=CartService.guest_storage(request))
+
     def add_item(self, product_id: str, quantity: int) -> CartItem:
-        product = get_object_or_404(Product, id=product_id)
-        item, created = CartItem.objects.get_or_create(cart=self.cart, product=product)
-        new_quantity = quantity if created else item.quantity + quantity
-        validate_stock(product, new_quantity)
-        item.quantity = new_quantity
-        item.save()
-        return item
-
-    @transaction.atomic
+        return self.storage.add_item(product_id, quantity)
+
     def update_item(self, item_id: str, quantity: int) -> CartItem:
-        item = get_object_or_404(CartItem, id=item_id, cart=self.cart)
-        validate_stock(item.product, quantity)
-        item.quantity = quantity
-        item.save()
-        return item
+        return self.storage.update_item(item_id, quantity)
 
-    @transaction.atomic
     def remove_item(self, item_id: str):
-        item = get_object_or_404(CartItem, id=item_id, cart=self.cart)
-        item.delete()
+        self.storage.remove_item(item_id)
+
+    def add_items(self, items) -> Cart:
+        """
+        Добавляет список {"product_id", "quantity"} (повторы суммируются)
+        и возвращает пересчитанную корзину.
+        """
+        quantities = {}
+        for item in items:
+            product_id = item["product_id"]
+            quantities[product_id] = quantities.get(product_id, 0) + item["quantity"]
+        self.storage.add_items(quantities)
+        return self.get_detail()
 
     def get_items(self):
-        return self.cart.items.select_related("product")
+        return self.storage.get_items()
+
+    def get_detail(self) -> Cart:
+        """
+        Корзина с итогами (subtotal/items_count) и позициями с line_total.
+        Для корзины в БД — два запроса независимо от числа позиций.
+        """
+        return self.storage.get_detail()
 
     def total(self) -> Decimal:
-        return self.cart.total
+        return self.storage.total()
+
+    def materialize(self, user=None):
+        return self.storage.materialize(user)
+
+    def clear(self):
+        self.storage.clear()
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.utils import timezone
+
+from apps.cart.models import Cart, CartItem, StockReservation
+
+
+class CleanupService:
+    """
+    Очистка истёкших сессий и брошенных гостевых корзин.
+
+    Удаление идёт пачками по batch_size строк, каждая пачка — в своей
+    короткой транзакции, поэтому блокировки не держатся долго. Методы
+    sweep_* — генераторы: отдают число удалённых строк после каждой пачки.
+    """
+
+    @staticmethod
+    def sessions_in_db() -> bool:
+        """Сессии хранятся в django_session (db, cached_db)."""
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        return hasattr(store, "get_model_class") and issubclass(
+            store.get_model_class(), Session
+        )
+
+    @staticmethod
+    def sweep_sessions(batch_size=1000):
+        if not CleanupService.sessions_in_db():
+            # file/cache/signed_cookies: очистку делает сам движок (или она не нужна)
+            import_module(settings.SESSION_ENGINE).SessionStore.clear_expired()
+            return
+        now = timezone.now()
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now).values_list(
+                    "session_key", flat=True
+                )[:batch_size]
+            )
+            if not keys:
+                return
+            yield Session.objects.filter(session_key__in=keys).delete()[0]
+
+    @staticmethod
+    def stale_guest_carts(now=None):
+        """
+        Гостевые корзины без заказа, не менявшиеся дольше
+        CART_GUEST_STALE_AFTER секунд. Cart.session_key — токен из данных
+        сессии (apps.cart.tokens), а не ключ сессии, поэтому «сиротство»
+        определяется по возрасту: сессия с токеном живёт не дольше
+        SESSION_COOKIE_AGE с последнего изменения.
+        """
+        now = now or timezone.now()
+        cutoff = now - timedelta(seconds=settings.CART_GUEST_STALE_AFTER)
+        return Cart.objects.filter(
+            updated_at__lt=cutoff, user__isnull=True, order__isnull=True
+        )
+
+    @staticmethod
+    def sweep_guest_carts(batch_size=1000):
+        """
+        Удаляет корзины вместе с позициями и резервами. Строки корзин пачки
+        блокируются (SKIP LOCKED) и заново проверяются на отсутствие заказа,
+        чтобы не удалить корзину, которую в этот момент оформляют.
+        """
+        now = timezone.now()
+        skipped = set()
+        while True:
+            ids = list(
+                CleanupService.stale_guest_carts(now)
+                .exclude(pk__in=skipped)
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return
+            with transaction.atomic():
+                locked = list(
+                    CleanupService.stale_guest_carts(now)
+                    .select_for_update(skip_locked=True, of=("self",))
+                    .filter(pk__in=ids)
+                    .values_list("pk", flat=True)
+                )
+                skipped.update(set(ids) - set(locked))
+                CartItem.objects.filter(cart_id__in=locked).delete()
+                StockReservation.objects.filter(cart_id__in=locked).delete()
+                deleted = (
+                    Cart.objects.filter(pk__in=locked)
+                    .delete()[1]
+                    .get(Cart._meta.label, 0)
+                )
+            yield deleted
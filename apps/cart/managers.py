@@ -0,0 +1,124 @@
+from decimal import Decimal
+
+from django.db import connections, models
+from django.db.models import Case, Count, F, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+MONEY = models.DecimalField(max_digits=12, decimal_places=2)
+ZERO = Value(Decimal("0.00"), output_field=MONEY)
+
+
+def line_price(prefix=""):
+    """Цена позиции: цена со скидкой, если товар доступен к заказу, иначе 0."""
+    return Case(
+        When(
+            **{f"{prefix}product__available_for_order": True},
+            then=F(f"{prefix}product___actual_price"),
+        ),
+        default=ZERO,
+        output_field=MONEY,
+    )
+
+
+def line_total(prefix=""):
+    return models.ExpressionWrapper(
+        line_price(prefix) * F(f"{prefix}quantity"), output_field=MONEY
+    )
+
+
+class CartItemQuerySet(models.QuerySet):
+    def with_totals(self):
+        """Аннотирует line_price и line_total (см. CartItem.price/total_price)."""
+        return self.annotate(line_price=line_price(), line_total=line_total())
+
+    def merge_into(self, cart_id, quantities=None):
+        """
+        Добавляет позиции в корзину cart_id одним INSERT ... SELECT ... ON
+        CONFLICT (unique_product_in_cart) DO UPDATE: количества суммируются
+        с уже лежащими в корзине и ограничиваются доступным остатком (stock
+        за вычетом активных резервов других корзин), удалённые и недоступные
+        товары пропускаются. Источник — позиции этого QuerySet
+        (одной корзины) или словарь quantities {product_id: количество}.
+        Возвращает число вставленных и обновлённых позиций.
+        """
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        meta = self.model._meta
+        cart_pk = meta.get_field("cart").target_field
+        product_field = meta.get_field("product")
+        product_pk = product_field.target_field
+
+        if quantities is None:
+            source, source_params = (
+                self.order_by()
+                .values_list("product_id", "quantity")
+                .query.sql_with_params()
+            )
+        elif not quantities:
+            return 0
+        else:
+            rows = ", ".join(["(%s, %s)"] * len(quantities))
+            source = f"SELECT column1 AS product_id, column2 AS quantity FROM (VALUES {rows}) AS v"
+            source_params = []
+            for product_id, quantity in quantities.items():
+                source_params += [
+                    product_pk.get_db_prep_value(product_id, connection),
+                    quantity,
+                ]
+
+        # Активные резервы других корзин (StockReservation через related_name)
+        reservations = product_field.related_model._meta.get_field(
+            "reservations"
+        ).related_model
+        reserved, reserved_params = (
+            reservations.objects.using(self.db)
+            .active()
+            .exclude(cart_id=cart_id)
+            .order_by()
+            .values("product_id")
+            .annotate(reserved=Sum("quantity"))
+            .values_list("product_id", "reserved")
+            .query.sql_with_params()
+        )
+
+        available = "p.stock - COALESCE(r.reserved, 0)"
+        items = quote(meta.db_table)
+        products = quote(product_field.related_model._meta.db_table)
+        sql = (
+            f"INSERT INTO {items} (id, cart_id, product_id, quantity) "
+            f"SELECT gen_random_uuid(), %s, src.product_id, "
+            f"LEAST(src.quantity + COALESCE(cur.quantity, 0), {available}) "
+            f"FROM ({source}) AS src "
+            f"JOIN {products} AS p ON p.id = src.product_id "
+            f"LEFT JOIN ({reserved}) AS r ON r.product_id = src.product_id "
+            f"LEFT JOIN {items} AS cur "
+            f"ON cur.cart_id = %s AND cur.product_id = src.product_id "
+            f"WHERE {available} > 0 "
+            f"ON CONFLICT (cart_id, product_id) DO UPDATE SET quantity = EXCLUDED.quantity"
+        )
+        cart_id = cart_pk.get_db_prep_value(cart_id, connection)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [cart_id, *source_params, *reserved_params, cart_id])
+            return cursor.rowcount
+
+
+class CartQuerySet(models.QuerySet):
+    def with_totals(self):
+        """
+        Аннотирует subtotal, items_count (сумма количеств) и lines_count
+        одним агрегирующим запросом по позициям корзины.
+        """
+        return self.annotate(
+            subtotal=Coalesce(Sum(line_total("items__")), ZERO, output_field=MONEY),
+            items_count=Coalesce(Sum("items__quantity"), 0),
+            lines_count=Count("items"),
+        )
+
+
+class StockReservationQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0006_alter_cart_options_alter_cartitem_options_and_more"),
+        ("catalog", "0007_product_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="cartitem",
+            name="unique_product_in_cart",
+        ),
+        migrations.AddConstraint(
+            model_name="cartitem",
+            constraint=models.UniqueConstraint(
+                fields=("cart", "product"), name="unique_product_in_cart"
+            ),
+        ),
+    ]
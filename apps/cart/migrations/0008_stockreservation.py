@@ -0,0 +1,66 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:48
+
+import uuid
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0007_cartitem_unique_product_unconditional"),
+        ("catalog", "0007_product_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockReservation",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("cart_id", models.UUIDField(verbose_name="Корзина")),
+                (
+                    "quantity",
+                    models.PositiveIntegerField(
+                        validators=[django.core.validators.MinValueValidator(1)]
+                    ),
+                ),
+                ("expires_at", models.DateTimeField(verbose_name="Истекает")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reservations",
+                        to="catalog.product",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Резерв товара",
+                "verbose_name_plural": "Резервы товаров",
+                "indexes": [
+                    models.Index(
+                        fields=["product", "expires_at"],
+                        name="reservation_product_exp_idx",
+                    ),
+                    models.Index(fields=["expires_at"], name="reservation_expires_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("cart_id", "product"),
+                        name="unique_reservation_per_cart",
+                    )
+                ],
+            },
+        ),
+    ]
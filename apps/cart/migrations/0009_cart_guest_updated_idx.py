@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cart", "0008_stockreservation"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="cart",
+            index=models.Index(
+                condition=models.Q(("user__isnull", True)),
+                fields=["updated_at"],
+                name="cart_guest_updated_idx",
+            ),
+        ),
+    ]
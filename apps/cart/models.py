@@ -5,6 +5,12 @@ from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, RegexValidator
 from django.db import models
 
+from apps.cart.managers import (
+    CartItemQuerySet,
+    CartQuerySet,
+    StockReservationQuerySet,
+    line_total,
+)
 from apps.catalog.models import Product
 
 User = get_user_model()
@@ -22,6 +28,8 @@ class Cart(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -30,11 +38,25 @@ class Cart(models.Model):
                 name="cart_has_user_or_session",
             )
         ]
-        indexes = [models.Index(fields=["user"]), models.Index(fields=["session_key"])]
+        indexes = [
+            models.Index(fields=["user"]),
+            models.Index(fields=["session_key"]),
+            # Поиск брошенных гостевых корзин (sweep_guest_data)
+            models.Index(
+                fields=["updated_at"],
+                condition=models.Q(user__isnull=True),
+                name="cart_guest_updated_idx",
+            ),
+        ]
 
     @property
     def total(self) -> Decimal:
-        total = sum((item.total_price for item in self.items.all()), Decimal("0.00"))
+        """Сумма корзины: из аннотации with_totals() или одним агрегатом."""
+        if hasattr(self, "subtotal"):
+            total = self.subtotal
+        else:
+            total = self.items.aggregate(total=models.Sum(line_total()))["total"]
+        total = total or Decimal("0.00")
         return total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
     def __str__(self):
@@ -49,18 +71,22 @@ class CartItem(models.Model):
     )
     quantity = models.PositiveIntegerField(default=1, validators=[MinValueValidator(1)])
 
+    objects = CartItemQuerySet.as_manager()
+
     class Meta:
         constraints = [
+            # Без условия, чтобы ON CONFLICT (cart_id, product_id) мог его
+            # использовать; NULL в product и так не конфликтуют между собой
             models.UniqueConstraint(
-                fields=["cart", "product"],
-                name="unique_product_in_cart",
-                condition=models.Q(product__isnull=False),
+                fields=["cart", "product"], name="unique_product_in_cart"
             )
         ]
         indexes = [models.Index(fields=["cart"]), models.Index(fields=["product"])]
 
     @property
     def price(self) -> Decimal:
+        if hasattr(self, "line_price"):
+            return self.line_price
         return (
             self.product.actual_price
             if self.product and self.product.available_for_order
@@ -69,9 +95,50 @@ class CartItem(models.Model):
 
     @property
     def total_price(self) -> Decimal:
+        if hasattr(self, "line_total"):
+            return self.line_total
         return (self.price * Decimal(self.quantity)).quantize(
             Decimal("0.01"), rounding=ROUND_HALF_UP
         )
 
     def __str__(self):
         return f"{self.product.name if self.product else 'Удалённый товар'} × {self.quantity}"
+
+
+class StockReservation(models.Model):
+    """
+    Временный резерв товара под позицию корзины.
+
+    cart_id — id корзины в БД или гостевой корзины в кэше, поэтому без
+    внешнего ключа. Доступный остаток = stock − активные резервы других корзин.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    cart_id = models.UUIDField("Корзина")
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="reservations"
+    )
+    quantity = models.PositiveIntegerField(validators=[MinValueValidator(1)])
+    expires_at = models.DateTimeField("Истекает")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = StockReservationQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Резерв товара"
+        verbose_name_plural = "Резервы товаров"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cart_id", "product"], name="unique_reservation_per_cart"
+            )
+        ]
+        indexes = [
+            # Сумма активных резервов по товару и выборка истёкших для очистки
+            models.Index(
+                fields=["product", "expires_at"], name="reservation_product_exp_idx"
+            ),
+            models.Index(fields=["expires_at"], name="reservation_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"Резерв {self.product_id} × {self.quantity} до {self.expires_at}"
@@ -1,22 +1,22 @@
 from rest_framework.permissions import BasePermission
 
+from apps.cart.tokens import get_cart_token
+
 
 class IsCartAccessAllowed(BasePermission):
     """
     Пользователь имеет доступ к корзине, если:
-    - Это GET/POST-запросы (list, add) без учёта владельца корзины.
-    - Для остальных действий — требуется быть владельцем корзины (по user или session_key).
+    - Это GET/POST-запросы (list, add, bulk_add) без учёта владельца корзины.
+    - Для остальных действий — требуется быть владельцем корзины (по user или токену гостевой корзины).
     """
 
     def has_permission(self, request, view) -> bool:
         """
         Проверяет, может ли пользователь выполнить действие на уровне запроса.
         """
-        if view.action in ("retrieve", "list", "add"):
+        if view.action in ("retrieve", "list", "add", "bulk_add"):
             return True
-        return request.user.is_authenticated or bool(
-            hasattr(request, "session") and request.session.session_key
-        )
+        return request.user.is_authenticated or bool(get_cart_token(request))
 
     def has_object_permission(self, request, view, obj) -> bool:
         """
@@ -25,7 +25,6 @@ class IsCartAccessAllowed(BasePermission):
         if request.user.is_staff:
             return True
         if request.user.is_authenticated:
-            return obj.cart.user == request.user
-        if hasattr(request, "session") and request.session.session_key:
-            return obj.cart.session_key == request.session.session_key
-        return False
+            return obj.cart.user_id == request.user.pk
+        token = get_cart_token(request)
+        return bool(token) and obj.cart.session_key == token
@@ -0,0 +1,171 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.cart.models import StockReservation
+from apps.cart.validators import validate_stock
+from apps.catalog.models import Product
+
+
+class ReservationService:
+    """
+    Резервы товаров под корзины на CART_RESERVATION_TTL секунд.
+
+    Резервы создаются и проверяются под блокировкой строк товаров
+    (SELECT ... FOR UPDATE в порядке pk), поэтому параллельные корзины
+    и оформления заказов не могут занять больше, чем есть на складе.
+
+    Порядок блокировок везде один: товары, затем позиции корзины, затем
+    резервы. Цена — изменение даже гостевой корзины в кэше (CacheCartStorage)
+    пишет резерв в БД и ждёт блокировки товара, пока его меняет другая
+    корзина или заказ. Просмотр корзины по-прежнему обходится без записей.
+    """
+
+    @staticmethod
+    def expires_at():
+        return timezone.now() + timedelta(seconds=settings.CART_RESERVATION_TTL)
+
+    @staticmethod
+    def reserved_quantities(product_ids, exclude_cart_id=None) -> dict:
+        """Сумма активных резервов по товарам (индекс product, expires_at)."""
+        queryset = StockReservation.objects.active().filter(product_id__in=product_ids)
+        if exclude_cart_id is not None:
+            queryset = queryset.exclude(cart_id=exclude_cart_id)
+        return dict(
+            queryset.values("product_id")
+            .annotate(total=Sum("quantity"))
+            .values_list("product_id", "total")
+        )
+
+    @staticmethod
+    def available_stock(products, exclude_cart_id=None) -> dict:
+        """Доступный остаток {product_id: stock − чужие активные резервы}."""
+        reserved = ReservationService.reserved_quantities(
+            [product.pk for product in products], exclude_cart_id
+        )
+        return {
+            product.pk: product.stock - reserved.get(product.pk, 0)
+            for product in products
+        }
+
+    @staticmethod
+    def lock_products(product_ids) -> dict:
+        """
+        Блокирует товары в порядке pk (без взаимных блокировок). product_ids —
+        список или подзапрос (values("product_id")).
+        """
+        products = Product.objects.select_for_update().filter(pk__in=product_ids)
+        return {product.pk: product for product in products.order_by("pk")}
+
+    @staticmethod
+    @transaction.atomic
+    def reserve(cart_id, quantities: dict, products=None) -> dict:
+        """
+        Устанавливает резервы корзины {product_id: итоговое количество}
+        и продлевает их. Возвращает заблокированные товары; products —
+        уже заблокированные вызывающим кодом (см. lock_products).
+        """
+        if products is None:
+            products = ReservationService.lock_products(list(quantities))
+        missing = [str(pk) for pk in quantities if pk not in products]
+        if missing:
+            raise ValidationError(f"Товары не найдены: {', '.join(missing)}.")
+
+        available = ReservationService.available_stock(products.values(), cart_id)
+        for product_id, quantity in quantities.items():
+            validate_stock(
+                products[product_id], quantity, available=available[product_id]
+            )
+
+        expires_at = ReservationService.expires_at()
+        StockReservation.objects.bulk_create(
+            [
+                StockReservation(
+                    cart_id=cart_id,
+                    product_id=product_id,
+                    quantity=quantity,
+                    expires_at=expires_at,
+                )
+                for product_id, quantity in quantities.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["cart_id", "product"],
+            update_fields=["quantity", "expires_at"],
+        )
+        return products
+
+    @staticmethod
+    def release(cart_id, product_ids=None):
+        queryset = StockReservation.objects.filter(cart_id=cart_id)
+        if product_ids is not None:
+            queryset = queryset.filter(product_id__in=product_ids)
+        queryset.delete()
+
+    @staticmethod
+    @transaction.atomic
+    def transfer(from_cart_id, to_cart_id):
+        """
+        Переносит активные резервы гостевой корзины, суммируя совпадающие
+        товары. Сумма ограничивается доступным остатком (без резервов других
+        корзин), истёкшие резервы не переносятся и удаляются.
+        """
+        if from_cart_id == to_cart_id:
+            return
+        held = dict(
+            StockReservation.objects.active()
+            .filter(cart_id=from_cart_id)
+            .values_list("product_id", "quantity")
+        )
+        products = ReservationService.lock_products(list(held))
+        StockReservation.objects.filter(cart_id=from_cart_id).delete()
+        if not products:
+            return
+
+        current = dict(
+            StockReservation.objects.active()
+            .filter(cart_id=to_cart_id, product_id__in=list(products))
+            .values_list("product_id", "quantity")
+        )
+        available = ReservationService.available_stock(products.values(), to_cart_id)
+        quantities = {
+            product_id: min(held[product_id] + current.get(product_id, 0), stock)
+            for product_id, stock in available.items()
+        }
+        StockReservation.objects.filter(
+            cart_id=to_cart_id,
+            product_id__in=[pk for pk, quantity in quantities.items() if quantity < 1],
+        ).delete()
+        expires_at = ReservationService.expires_at()
+        StockReservation.objects.bulk_create(
+            [
+                StockReservation(
+                    cart_id=to_cart_id,
+                    product_id=product_id,
+                    quantity=quantity,
+                    expires_at=expires_at,
+                )
+                for product_id, quantity in quantities.items()
+                if quantity > 0
+            ],
+            update_conflicts=True,
+            unique_fields=["cart_id", "product"],
+            update_fields=["quantity", "expires_at"],
+        )
+
+    @staticmethod
+    def sweep(batch_size=1000) -> int:
+        """Удаляет истёкшие резервы пачками; возвращает их число."""
+        deleted = 0
+        while True:
+            ids = list(
+                StockReservation.objects.expired().values_list("pk", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not ids:
+                return deleted
+            deleted += StockReservation.objects.filter(pk__in=ids).delete()[0]
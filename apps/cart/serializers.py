@@ -46,10 +46,17 @@ class CartItemSerializer(serializers.ModelSerializer):
 class CartSerializer(serializers.ModelSerializer):
     items = CartItemSerializer(many=True, read_only=True)
     total = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    items_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Cart
-        fields = ["id", "items", "total"]
+        fields = ["id", "items", "total", "items_count"]
+
+    @extend_schema_field(serializers.IntegerField())
+    def get_items_count(self, obj):
+        if hasattr(obj, "items_count"):
+            return obj.items_count
+        return sum(item.quantity for item in obj.items.all())
 
 
 class AddToCartSerializer(serializers.Serializer):
@@ -65,5 +72,15 @@ class AddToCartSerializer(serializers.Serializer):
         return data
 
 
+class BulkCartItemSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class BulkAddToCartSerializer(serializers.Serializer):
+    # Товары и остатки проверяются в CartService.add_items одним запросом
+    items = BulkCartItemSerializer(many=True, min_length=1, max_length=100)
+
+
 class CartItemUpdateSerializer(serializers.Serializer):
     quantity = serializers.IntegerField(min_value=1)
@@ -0,0 +1,12 @@
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+
+from apps.cart.cart_services import CartService
+
+
+@receiver(user_logged_in)
+def materialize_guest_cart(sender, request, user, **kwargs):
+    """Гостевая корзина из кэша переносится в корзину пользователя при входе."""
+    if request is None or not hasattr(request, "session"):
+        return
+    CartService.merge_guest_cart(request, user)
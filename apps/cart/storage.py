@@ -0,0 +1,369 @@
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+
+from apps.cart.models import Cart, CartItem
+from apps.cart.reservation_services import ReservationService
+from apps.cart.tokens import drop_cart_token, ensure_cart_token, get_cart_token
+from apps.cart.validators import validate_stock
+from apps.catalog.models import Product
+from apps.core.cache import require_shared_cache
+
+
+class BaseCartStorage(ABC):
+    """
+    Хранилище корзины для CartService. Бэкенд без любого из абстрактных
+    методов не создаётся (TypeError при создании экземпляра).
+
+    Изменения количеств проходят через ReservationService: остаток
+    проверяется с учётом чужих резервов, резерв корзины продлевается.
+    Строки товаров блокируются раньше позиций корзины (как при оформлении
+    заказа).
+
+    get_detail() возвращает корзину, готовую для CartSerializer
+    (итоги и позиции уже загружены), materialize() — корзину в БД.
+    """
+
+    def __init__(self, request=None, cart=None):
+        self.request = request
+        self._cart = cart
+
+    @property
+    @abstractmethod
+    def cart(self) -> Cart:
+        pass
+
+    @abstractmethod
+    def get_items(self):
+        pass
+
+    @abstractmethod
+    def get_detail(self) -> Cart:
+        pass
+
+    @abstractmethod
+    def add_item(self, product_id, quantity: int) -> CartItem:
+        pass
+
+    @abstractmethod
+    def update_item(self, item_id, quantity: int) -> CartItem:
+        pass
+
+    @abstractmethod
+    def remove_item(self, item_id):
+        pass
+
+    @abstractmethod
+    def add_items(self, quantities: dict):
+        """Добавляет количества {product_id: quantity} одной операцией."""
+
+    def total(self) -> Decimal:
+        return self.get_detail().total
+
+    def materialize(self, user=None):
+        """Сохраняет корзину в БД (при user — объединяет с его корзиной)."""
+        return None
+
+    def clear(self):
+        pass
+
+
+class DatabaseCartStorage(BaseCartStorage):
+    """
+    Корзина в таблицах Cart/CartItem.
+
+    Гостевая корзина находится по токену из данных сессии (apps.cart.tokens),
+    который хранится в Cart.session_key.
+    """
+
+    @property
+    def cart(self) -> Cart:
+        if self._cart is None:
+            self._cart = self.get_or_create(self.request)
+        return self._cart
+
+    @staticmethod
+    def get_or_create(request) -> Cart:
+        if request.user.is_authenticated:
+            cart, _ = Cart.objects.get_or_create(user_id=request.user.pk)
+        else:
+            cart, _ = Cart.objects.get_or_create(session_key=ensure_cart_token(request))
+        return cart
+
+    def get_items(self):
+        return self.cart.items.with_totals().select_related("product")
+
+    def get_detail(self) -> Cart:
+        return (
+            Cart.objects.with_totals()
+            .prefetch_related(Prefetch("items", queryset=self.get_items()))
+            .get(pk=self.cart.pk)
+        )
+
+    @transaction.atomic
+    def add_item(self, product_id, quantity: int) -> CartItem:
+        # Товар блокируется до позиции — порядок как при оформлении заказа
+        product = get_object_or_404(Product.objects.select_for_update(), id=product_id)
+        item, created = CartItem.objects.get_or_create(cart=self.cart, product=product)
+        new_quantity = quantity if created else item.quantity + quantity
+        ReservationService.reserve(
+            self.cart.pk, {product.pk: new_quantity}, {product.pk: product}
+        )
+        item.quantity = new_quantity
+        item.save()
+        return item
+
+    @transaction.atomic
+    def update_item(self, item_id, quantity: int) -> CartItem:
+        item = get_object_or_404(CartItem, id=item_id, cart=self.cart)
+        validate_stock(item.product, quantity)
+        ReservationService.reserve(self.cart.pk, {item.product_id: quantity})
+        item.quantity = quantity
+        item.save()
+        return item
+
+    @transaction.atomic
+    def remove_item(self, item_id):
+        item = get_object_or_404(CartItem, id=item_id, cart=self.cart)
+        item.delete()
+        ReservationService.release(self.cart.pk, [item.product_id])
+
+    @transaction.atomic
+    def add_items(self, quantities: dict):
+        products = ReservationService.lock_products(list(quantities))
+        current = dict(
+            self.cart.items.select_for_update()
+            .filter(product__in=list(quantities))
+            .values_list("product_id", "quantity")
+        )
+        totals = {
+            product_id: current.get(product_id, 0) + quantity
+            for product_id, quantity in quantities.items()
+        }
+        ReservationService.reserve(self.cart.pk, totals, products)
+        CartItem.objects.bulk_create(
+            [
+                CartItem(cart=self.cart, product_id=product_id, quantity=quantity)
+                for product_id, quantity in totals.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["cart", "product"],
+            update_fields=["quantity"],
+        )
+
+    def total(self) -> Decimal:
+        return self.cart.total
+
+    @transaction.atomic
+    def materialize(self, user=None):
+        """
+        Для гостя корзина уже в БД. При входе позиции гостевой корзины
+        добавляются к корзине пользователя одним upsert (merge_into) после
+        переноса резервов, гостевая корзина удаляется, если по ней
+        не оформлен заказ.
+        """
+        if user is None:
+            # Без токена корзины у гостя нет — пустую не создаём
+            if self._cart is None and get_cart_token(self.request) is None:
+                return None
+            return self.cart
+        token = get_cart_token(self.request)
+        if token is None:
+            return None
+        guests = Cart.objects.filter(session_key=token, user__isnull=True)
+        guest_id = guests.values_list("pk", flat=True).first()
+        if guest_id is None:
+            return None
+        cart, _ = Cart.objects.get_or_create(user=user)
+        # Сначала резервы: иначе merge_into сочтёт их чужими
+        ReservationService.transfer(guest_id, cart.pk)
+        CartItem.objects.filter(cart_id=guest_id).merge_into(cart.pk)
+        guests.filter(order__isnull=True).delete()
+        return cart
+
+    def clear(self):
+        drop_cart_token(self.request)
+
+
+class CacheCartStorage(BaseCartStorage):
+    """
+    Гостевая корзина в кэше (Redis в prod): просмотр без записей в БД,
+    изменение пишет только резерв товара (см. ReservationService).
+    Требует общего для воркеров кэша: с locmem корзина жила бы в одном
+    процессе, поэтому создание хранилища завершается ImproperlyConfigured.
+
+    Токен корзины кладётся в сессию при первом добавлении товара. Строки
+    Cart/CartItem создаются только при оформлении заказа и при входе
+    (materialize). Одновременные изменения одной корзины не блокируются —
+    сохраняется последнее.
+    """
+
+    key_prefix = "cart:guest"
+
+    def __init__(self, request=None, cart=None):
+        require_shared_cache(type(self).__name__)
+        super().__init__(request, cart)
+        self._data = None
+
+    @property
+    def token(self):
+        return get_cart_token(self.request)
+
+    def _load(self):
+        if self._data is None:
+            token = self.token
+            data = cache.get(f"{self.key_prefix}:{token}") if token else None
+            self._data = data or {"id": str(uuid4()), "items": []}
+        return self._data
+
+    def _save(self):
+        token = ensure_cart_token(self.request)
+        cache.set(f"{self.key_prefix}:{token}", self._data, settings.CART_CACHE_TTL)
+
+    def _find(self, item_id):
+        for row in self._load()["items"]:
+            if row["id"] == str(item_id):
+                return row
+        raise Http404("Позиция корзины не найдена.")
+
+    def _item(self, row, product):
+        return CartItem(
+            id=UUID(row["id"]),
+            cart=self.cart,
+            product=product,
+            quantity=row["quantity"],
+        )
+
+    @property
+    def cart(self) -> Cart:
+        if self._cart is None:
+            self._cart = Cart(id=UUID(self._load()["id"]), session_key=self.token)
+        return self._cart
+
+    def get_items(self):
+        rows = self._load()["items"]
+        products = Product.objects.in_bulk([row["product_id"] for row in rows])
+        return [self._item(row, products.get(UUID(row["product_id"]))) for row in rows]
+
+    def get_detail(self) -> Cart:
+        items = self.get_items()
+        cart = self.cart
+        cart.subtotal = sum((item.total_price for item in items), Decimal("0.00"))
+        cart.items_count = sum(item.quantity for item in items)
+        cart.lines_count = len(items)
+        # Позиции подставляются так же, как после prefetch_related("items")
+        queryset = CartItem.objects.none()
+        queryset._result_cache = items
+        queryset._prefetch_done = True
+        cart._prefetched_objects_cache = {"items": queryset}
+        return cart
+
+    def add_item(self, product_id, quantity: int) -> CartItem:
+        product = get_object_or_404(Product, id=product_id)
+        rows = self._load()["items"]
+        row = next((row for row in rows if row["product_id"] == str(product.pk)), None)
+        new_quantity = quantity if row is None else row["quantity"] + quantity
+        ReservationService.reserve(self.cart.pk, {product.pk: new_quantity})
+        if row is None:
+            row = {"id": str(uuid4()), "product_id": str(product.pk)}
+            rows.append(row)
+        row["quantity"] = new_quantity
+        self._save()
+        return self._item(row, product)
+
+    def update_item(self, item_id, quantity: int) -> CartItem:
+        row = self._find(item_id)
+        product = Product.objects.filter(pk=row["product_id"]).first()
+        validate_stock(product, quantity)
+        ReservationService.reserve(self.cart.pk, {product.pk: quantity})
+        row["quantity"] = quantity
+        self._save()
+        return self._item(row, product)
+
+    def remove_item(self, item_id):
+        row = self._find(item_id)
+        self._load()["items"].remove(row)
+        self._save()
+        ReservationService.release(self.cart.pk, [row["product_id"]])
+
+    def add_items(self, quantities: dict):
+        rows = {UUID(row["product_id"]): row for row in self._load()["items"]}
+        totals = {
+            product_id: (
+                quantity + rows[product_id]["quantity"]
+                if product_id in rows
+                else quantity
+            )
+            for product_id, quantity in quantities.items()
+        }
+        ReservationService.reserve(self.cart.pk, totals)
+        for product_id, quantity in totals.items():
+            if product_id in rows:
+                rows[product_id]["quantity"] = quantity
+            else:
+                self._data["items"].append(
+                    {
+                        "id": str(uuid4()),
+                        "product_id": str(product_id),
+                        "quantity": quantity,
+                    }
+                )
+        self._save()
+
+    @transaction.atomic
+    def materialize(self, user=None):
+        """
+        Переносит корзину в БД: для гостя — копия в корзине с session_key =
+        токен корзины (перед оформлением заказа), для пользователя — количества
+        добавляются к его корзине (при входе). Кэш не очищается — см. clear().
+        """
+        rows = self._load()["items"]
+        if not self.token or not rows:
+            return None
+
+        if user is not None:
+            # Вход: один upsert с суммированием и ограничением остатком
+            cart, _ = Cart.objects.get_or_create(user=user)
+            ReservationService.transfer(self.cart.pk, cart.pk)
+            CartItem.objects.merge_into(
+                cart.pk, {UUID(row["product_id"]): row["quantity"] for row in rows}
+            )
+            return cart
+
+        # Та же id, что у корзины в кэше, — резервы остаются за ней
+        cart, _ = Cart.objects.get_or_create(
+            session_key=self.token, defaults={"id": self.cart.pk}
+        )
+        cart.items.all().delete()
+        ReservationService.transfer(self.cart.pk, cart.pk)
+
+        alive = set(
+            Product.objects.filter(
+                pk__in=[row["product_id"] for row in rows]
+            ).values_list("pk", flat=True)
+        )
+        CartItem.objects.bulk_create(
+            CartItem(
+                id=UUID(row["id"]),
+                cart=cart,
+                product_id=UUID(row["product_id"]),
+                quantity=row["quantity"],
+            )
+            for row in rows
+            if UUID(row["product_id"]) in alive
+        )
+        return cart
+
+    def clear(self):
+        token = drop_cart_token(self.request)
+        if token:
+            cache.delete(f"{self.key_prefix}:{token}")
+        self._data = None
+        self._cart = None
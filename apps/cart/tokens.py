@@ -0,0 +1,31 @@
+from uuid import uuid4
+
+# Ключ в данных сессии. Токен не зависит от ключа сессии: переживает
+# cycle_key() при входе и работает с любым SESSION_ENGINE, включая
+# signed_cookies, где ключа сессии в БД нет вовсе.
+CART_TOKEN_SESSION_KEY = "cart_token"
+
+
+def get_cart_token(request):
+    """Токен гостевой корзины (Cart.session_key) или None."""
+    session = getattr(request, "session", None)
+    if session is None:
+        return None
+    return session.get(CART_TOKEN_SESSION_KEY)
+
+
+def ensure_cart_token(request):
+    """Возвращает токен гостевой корзины, создавая его при первом обращении."""
+    token = get_cart_token(request)
+    if token is None:
+        token = uuid4().hex
+        request.session[CART_TOKEN_SESSION_KEY] = token
+    return token
+
+
+def drop_cart_token(request):
+    """Убирает токен из сессии (после оформления заказа или входа)."""
+    session = getattr(request, "session", None)
+    if session is None:
+        return None
+    return session.pop(CART_TOKEN_SESSION_KEY, None)
@@ -4,8 +4,12 @@ from apps.catalog.models import Product
 
 
 def validate_stock(
-    product: Product, requested_quantity: int, current_quantity: int = 0
+    product: Product,
+    requested_quantity: int,
+    current_quantity: int = 0,
+    available: int = None,
 ) -> None:
+    """available — остаток с учётом резервов; по умолчанию product.stock."""
     if product is None:
         raise ValidationError("Товар не существует или был удалён.")
     if not product.available_for_order:
@@ -14,7 +18,9 @@ def validate_stock(
         raise ValidationError("Количество должно быть положительным.")
     if product.stock is None or product.stock < 0:
         raise ValidationError("Некорректное значение запасов.")
-    if requested_quantity + current_quantity > product.stock:
+    if available is None:
+        available = product.stock
+    if requested_quantity + current_quantity > available:
         raise ValidationError(
-            f"Недостаточно товара '{product.name}'. В наличии: {product.stock}."
+            f"Недостаточно товара '{product.name}'. В наличии: {max(available, 0)}."
         )
@@ -12,10 +12,12 @@ from apps.cart.models import Cart
 from apps.cart.permissions import IsCartAccessAllowed
 from apps.cart.serializers import (
     AddToCartSerializer,
+    BulkAddToCartSerializer,
     CartItemSerializer,
     CartItemUpdateSerializer,
     CartSerializer,
 )
+from apps.core.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
 
 
 @extend_schema_view(
@@ -23,9 +25,18 @@ from apps.cart.serializers import (
     list=extend_schema(responses=CartItemSerializer(many=True)),
     add=extend_schema(
         request=AddToCartSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={201: CartItemSerializer},
         summary="Добавить товар в корзину",
     ),
+    bulk_add=extend_schema(
+        request=BulkAddToCartSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        responses={200: CartSerializer},
+        summary="Добавить несколько товаров в корзину",
+        description="Добавляет количества к позициям корзины в одной транзакции "
+        "и возвращает пересчитанную корзину.",
+    ),
     update_item=extend_schema(
         request=CartItemUpdateSerializer,
         parameters=[
@@ -66,30 +77,29 @@ class CartViewSet(viewsets.ViewSet):
             return CartItemSerializer
         if self.action == "add":
             return AddToCartSerializer
+        if self.action == "bulk_add":
+            return BulkAddToCartSerializer
         if self.action == "update_item":
             return CartItemUpdateSerializer
         return None  # для remove — нет тела запроса
 
     @action(detail=False, methods=["get"], url_path="detail")
     def get_current_cart(self, request):
-        cart = CartService.get_or_create_cart(request)
-        serializer = CartSerializer(cart)
+        serializer = CartSerializer(CartService.for_request(request).get_detail())
         return Response(serializer.data)
 
     def list(self, request):
-        cart = CartService.get_or_create_cart(request)
-        service = CartService(cart)
-        items = service.get_items()
+        items = CartService.for_request(request).get_items()
         serializer = CartItemSerializer(items, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=["post"], url_path="add")
+    @idempotent
     def add(self, request):
         serializer = AddToCartSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        cart = CartService.get_or_create_cart(request)
-        service = CartService(cart)
+        service = CartService.for_request(request)
         try:
             item = service.add_item(
                 product_id=serializer.validated_data["product_id"],
@@ -104,10 +114,24 @@ class CartViewSet(viewsets.ViewSet):
                 e.message_dict if hasattr(e, "message_dict") else e.messages
             )
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    @idempotent
+    def bulk_add(self, request):
+        serializer = BulkAddToCartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        service = CartService.for_request(request)
+        try:
+            cart = service.add_items(serializer.validated_data["items"])
+        except DjangoValidationError as e:
+            raise DRFValidationError(
+                e.message_dict if hasattr(e, "message_dict") else e.messages
+            )
+        return Response(CartSerializer(cart).data)
+
     @action(detail=True, methods=["patch"], url_path="update")
     def update_item(self, request, pk=None):
-        cart = CartService.get_or_create_cart(request)
-        service = CartService(cart)
+        service = CartService.for_request(request)
 
         serializer = CartItemUpdateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -117,7 +141,6 @@ class CartViewSet(viewsets.ViewSet):
 
     @action(detail=True, methods=["delete"], url_path="remove")
     def remove(self, request, pk=None):
-        cart = CartService.get_or_create_cart(request)
-        service = CartService(cart)
+        service = CartService.for_request(request)
         service.remove_item(pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CatalogConfig(AppConfig):
     # default_auto_field = "django.db.models.UUIDField"
     name = "apps.catalog"
+
+    def ready(self):
+        from apps.catalog import signals  # noqa: F401
@@ -0,0 +1,100 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = "catalog:version:{}"
+MODIFIED_KEY = "catalog:modified:{}"
+
+
+def _version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def _modified_key(model):
+    return MODIFIED_KEY.format(model._meta.label_lower)
+
+
+def get_catalog_version(*models):
+    """
+    Версии моделей каталога для построения ключей кэша.
+    Начальное значение — время в мс, чтобы после вытеснения ключа
+    из кэша версия не совпала со старой.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, int(time.time() * 1000), None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def get_catalog_modified(*models):
+    """
+    Время последнего изменения (Unix timestamp) любой из моделей —
+    для заголовка Last-Modified без запросов к БД.
+    """
+    keys = [_modified_key(model) for model in models]
+    stamps = cache.get_many(keys)
+    for key in keys:
+        if key not in stamps:
+            cache.add(key, int(time.time()), None)
+            stamps[key] = cache.get(key)
+    return max(stamps.values())
+
+
+def _incr_version(model):
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), None)
+    cache.set(_modified_key(model), int(time.time()), None)
+
+
+def bump_catalog_version(model):
+    """
+    Инвалидирует всё, что закэшировано для модели. Версия повышается сразу
+    (чтобы автор изменения не увидел старые данные) и ещё раз после коммита,
+    чтобы не остался ответ, закэшированный параллельным запросом до коммита.
+    """
+    _incr_version(model)
+    transaction.on_commit(lambda: _incr_version(model))
+
+
+def get_or_build(key, stale_key, build, timeout):
+    """
+    Значение из кэша или build() с защитой от «стампеда» после смены версии:
+    пересчитывает только один запрос (cache.add как блокировка), остальные
+    получают последнее значение по stale_key или ждут не дольше
+    CATALOG_CACHE_LOCK_WAIT секунд. build() возвращает (value, cacheable),
+    результат — (value, hit).
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value, True
+
+    lock_key = f"{key}:lock"
+    locked = cache.add(lock_key, 1, settings.CATALOG_CACHE_LOCK_TIMEOUT)
+    if not locked:
+        stale = cache.get(stale_key)
+        if stale is not None:
+            return stale, True
+        deadline = time.monotonic() + settings.CATALOG_CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key)
+            if value is not None:
+                return value, True
+
+    try:
+        value, cacheable = build()
+        if cacheable:
+            cache.set(key, value, timeout)
+            cache.set(stale_key, value, timeout * 2)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value, False
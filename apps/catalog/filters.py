@@ -1,6 +1,9 @@
 from django_filters import rest_framework as django_filters
+from rest_framework import filters
+from rest_framework.settings import api_settings
 
 from apps.catalog.models import Category, Product
+from apps.catalog.services.search_services import ProductSearchService
 
 
 class ProductFilter(django_filters.FilterSet):
@@ -10,12 +13,10 @@ class ProductFilter(django_filters.FilterSet):
     max_price = django_filters.NumberFilter(
         field_name="price", lookup_expr="lte", label="Цена до"
     )
-    in_stock = django_filters.BooleanFilter(
-        field_name="stock", lookup_expr="gt", label="В наличии"
-    )
+    in_stock = django_filters.BooleanFilter(method="filter_in_stock", label="В наличии")
     category = django_filters.ModelChoiceFilter(
         queryset=Category.objects.all(),
-        field_name="category__slug",
+        field_name="category",
         to_field_name="slug",
         label="Категория",
     )
@@ -23,3 +24,46 @@ class ProductFilter(django_filters.FilterSet):
     class Meta:
         model = Product
         fields = ["category", "min_price", "max_price", "in_stock"]
+
+    def filter_in_stock(self, queryset, name, value):
+        return queryset.filter(stock__gt=0) if value else queryset.filter(stock=0)
+
+
+class ProductSearchFilter(filters.SearchFilter):
+    """
+    Полнотекстовый поиск по товарам с ранжированием результатов.
+    ?search_mode=fuzzy включает нечёткий поиск по триграммам.
+    При CATALOG_SEARCH_BACKEND = "basic" ведёт себя как SearchFilter.
+    Должен стоять после OrderingFilter, чтобы учитывать сортировку.
+    """
+
+    search_mode_param = "search_mode"
+    search_modes = ("fulltext", "fuzzy")
+
+    def get_search_mode(self, request):
+        mode = request.query_params.get(self.search_mode_param)
+        return mode if mode in self.search_modes else "fulltext"
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        keep_ordering = api_settings.ORDERING_PARAM in request.query_params
+        text = " ".join(search_terms)
+        if self.get_search_mode(request) == "fuzzy":
+            return ProductSearchService.fuzzy(queryset, text, keep_ordering)
+        if ProductSearchService.fulltext_enabled():
+            return ProductSearchService.fulltext(queryset, text, keep_ordering)
+        return super().filter_queryset(request, queryset, view)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.search_mode_param,
+                "required": False,
+                "in": "query",
+                "description": "Режим поиска: fulltext (по умолчанию) или fuzzy",
+                "schema": {"type": "string", "enum": list(self.search_modes)},
+            }
+        ]
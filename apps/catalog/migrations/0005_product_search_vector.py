@@ -0,0 +1,45 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_search_vector(apps, schema_editor):
+    Product = apps.get_model("catalog", "Product")
+    Product.objects.update(
+        search_vector=SearchVector(F("name"), weight="A", config="russian")
+        + SearchVector(F("sku"), weight="B", config="simple")
+        + SearchVector(
+            Coalesce(F("description"), Value(""), output_field=TextField()),
+            weight="C",
+            config="russian",
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0004_alter_productextraimage_product"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="Поисковый вектор"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="product_search_vector_idx"
+            ),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+    ]
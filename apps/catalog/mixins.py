@@ -0,0 +1,179 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.catalog.cache import get_catalog_modified, get_catalog_version, get_or_build
+from apps.core.cache import params_digest
+from apps.core.db_router import replica_reads
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified для list/retrieve и ответ 304 без сериализации.
+
+    Для списков валидаторы — версии и время изменения моделей из
+    cache_models (без запросов к БД), для объекта — его updated_at
+    (см. get_object_validators), один лёгкий запрос.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_object_validators(self, **kwargs):
+        """Значения, меняющиеся вместе с представлением объекта, и его mtime."""
+        lookup = {self.lookup_field: kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        updated_at = (
+            self.get_queryset()
+            .filter(**lookup)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None
+        return [updated_at], updated_at.timestamp()
+
+    def get_validators(self, request, **kwargs):
+        if self.action == "retrieve":
+            validators = self.get_object_validators(**kwargs)
+            if validators is None:
+                return None, None
+            values, last_modified = validators
+            values = [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in values
+            ]
+        else:
+            values = list(get_catalog_version(*self.cache_models))
+            last_modified = get_catalog_modified(*self.cache_models)
+
+        variant = [
+            self.action,
+            sorted(kwargs.items()),
+            request.accepted_renderer.format,
+            request.scheme,
+            request.get_host(),
+            params_digest(request.query_params),
+        ]
+        digest = hashlib.sha1(repr(variant + values).encode()).hexdigest()
+        return quote_etag(digest), int(last_modified)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, **kwargs)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            patch_vary_headers(response, ("Accept",))
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    GET/HEAD каталога читают из реплик (apps.core.db_router). Пока с
+    последнего изменения моделей cache_models не прошло
+    DATABASE_PIN_SECONDS, чтения идут в primary — иначе кэш ответов под
+    новой версией мог бы заполниться данными отстающей реплики.
+    """
+
+    cache_models = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or not settings.DATABASE_REPLICAS:
+            return super().dispatch(request, *args, **kwargs)
+        modified = get_catalog_modified(*self.cache_models) if self.cache_models else 0
+        if time.time() - modified < settings.DATABASE_PIN_SECONDS:
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class CachedResponseMixin:
+    """
+    Кэширование ответов list/retrieve для ViewSet каталога.
+
+    Ключ строится из действия, аргументов URL, нормализованной строки
+    запроса, хоста (абсолютные ссылки в ответе), класса пагинации
+    и версий моделей из cache_models, поэтому любое изменение этих
+    моделей делает старые записи недостижимыми.
+    """
+
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self, request, **kwargs):
+        url_kwargs = ",".join(f"{key}={value}" for key, value in sorted(kwargs.items()))
+        base = ":".join(
+            [
+                "catalog:response",
+                self.basename,
+                self.action,
+                url_kwargs,
+                request.scheme,
+                request.get_host(),
+                type(self.paginator).__name__,
+                params_digest(request.query_params),
+            ]
+        )
+        version = "-".join(map(str, get_catalog_version(*self.cache_models)))
+        return f"{base}:{version}", f"{base}:stale"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.CATALOG_CACHE_ENABLED:
+            return handler(request, *args, **kwargs)
+
+        key, stale_key = self.get_response_cache_key(request, **kwargs)
+        responses = {}
+
+        def build():
+            response = handler(request, *args, **kwargs)
+            responses["fresh"] = response
+            return response.data, response.status_code == status.HTTP_200_OK
+
+        data, hit = get_or_build(key, stale_key, build, settings.CATALOG_CACHE_TIMEOUT)
+        response = responses.get("fresh") or Response(data)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+
+class ValuesListMixin:
+    """
+    list() через values()-строки и values_serializer_class вместо
+    ModelSerializer. values_serializer_class = None — обычный list().
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        queryset = serializer.prepare_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation(page))
+        return Response(serializer.to_representation(queryset))
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import connections, models
+from django.utils import timezone
 
 
 class ProductManager(models.Manager):
@@ -11,3 +12,31 @@ class ProductManager(models.Manager):
 
     def with_extra_images(self):
         return self.prefetch_related("images")
+
+    def decrement_stock(self, quantities):
+        """
+        Списывает остатки {product_id: количество} одним запросом
+        UPDATE ... FROM (VALUES ...), только там, где stock >= qty.
+        Возвращает число обновлённых товаров.
+        """
+        if not quantities:
+            return 0
+
+        connection = connections[self.db]
+        meta = self.model._meta
+        table = connection.ops.quote_name(meta.db_table)
+        params = [
+            meta.get_field("updated_at").get_db_prep_value(timezone.now(), connection)
+        ]
+        for pk, quantity in quantities.items():
+            params += [meta.pk.get_db_prep_value(pk, connection), quantity]
+        rows = ", ".join(["(%s, %s)"] * len(quantities))
+        # column1/column2 — имена столбцов VALUES в PostgreSQL
+        sql = (
+            f"UPDATE {table} SET stock = {table}.stock - v.column2, updated_at = %s "
+            f"FROM (VALUES {rows}) AS v "
+            f"WHERE {table}.id = v.column1 AND {table}.stock >= v.column2"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
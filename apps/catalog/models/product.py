@@ -1,5 +1,7 @@
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.urls import reverse
@@ -58,6 +60,7 @@ class Product(BaseModel):
         db_index=True,
         editable=False,
     )
+    search_vector = SearchVectorField("Поисковый вектор", null=True, editable=False)
 
     objects = ProductManager()
 
@@ -67,11 +70,23 @@ class Product(BaseModel):
         ordering = ["sku"]
         indexes = [
             models.Index(fields=["slug"], name="product_slug_idx"),
-            models.Index(fields=["sku"], name="product_sku_idx"),
-            models.Index(fields=["price"], name="product_price_idx"),
+            # Составные индексы под keyset-пагинацию по каждому ordering_fields
+            models.Index(fields=["price", "id"], name="product_price_id_idx"),
+            models.Index(fields=["sku", "id"], name="product_sku_id_idx"),
+            models.Index(fields=["discount", "id"], name="product_discount_id_idx"),
+            models.Index(fields=["stock", "id"], name="product_stock_id_idx"),
             models.Index(
                 fields=["availability_status", "stock"], name="availability_idx"
             ),
+            GinIndex(fields=["search_vector"], name="product_search_vector_idx"),
+            GinIndex(
+                fields=["name"],
+                name="product_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(
+                fields=["sku"], name="product_sku_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
         ]
 
     def __str__(self):
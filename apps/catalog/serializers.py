@@ -1,4 +1,8 @@
+import decimal
+
+from django.db.models import F
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 from apps.catalog.models import Category, Product, ProductExtraImage
 
@@ -35,6 +39,85 @@ class ProductListSerializer(serializers.ModelSerializer):
         )
 
 
+class ProductListValuesSerializer:
+    """
+    Быстрый аналог ProductListSerializer для строк values().
+
+    Без создания моделей и полей DRF: цены округляются и форматируются
+    так же, как DecimalField, ссылки на изображения строятся через storage
+    поля main_image. Результат совпадает с ProductListSerializer байт в байт.
+    """
+
+    values_fields = (
+        "id",
+        "sku",
+        "name",
+        "price",
+        "discount",
+        "_actual_price",
+        "main_image",
+        "stock",
+    )
+    decimal_places = 2
+    max_digits = 10
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.storage = Product._meta.get_field("main_image").storage
+
+    def prepare_queryset(self, queryset):
+        """
+        values() с полями ответа, slug категории через JOIN и аннотациями
+        запроса (например, search_rank), нужными для сортировки и курсора.
+        Псевдонимы alias() не выбираются — они есть только в WHERE/ORDER BY.
+        """
+        return queryset.prefetch_related(None).values(
+            *self.values_fields,
+            *queryset.query.annotation_select,
+            category_slug=F("category__slug"),
+        )
+
+    def to_representation(self, rows):
+        request = self.context.get("request")
+        quantum = decimal.Decimal(1).scaleb(-self.decimal_places)
+        context = decimal.getcontext().copy()
+        context.prec = self.max_digits
+        coerce = api_settings.COERCE_DECIMAL_TO_STRING
+        storage_url = self.storage.url
+        build_uri = request.build_absolute_uri if request else None
+        urls = {}
+
+        def money(value):
+            if value is None:
+                return None
+            value = value.quantize(quantum, context=context)
+            return "{:f}".format(value) if coerce else value
+
+        data = []
+        for row in rows:
+            image = row["main_image"]
+            if image:
+                if image not in urls:
+                    url = storage_url(image)
+                    urls[image] = build_uri(url) if build_uri else url
+                image = urls[image]
+            else:
+                image = None
+            data.append(
+                {
+                    "sku": row["sku"],
+                    "name": row["name"],
+                    "price": money(row["price"]),
+                    "discount": row["discount"],
+                    "actual_price": money(row["_actual_price"]),
+                    "main_image": image,
+                    "stock": row["stock"],
+                    "category": row["category_slug"],
+                }
+            )
+        return data
+
+
 class ProductDetailSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     extra_images = ProductExtraImageSerializer(many=True, read_only=True)
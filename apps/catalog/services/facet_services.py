@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+
+from apps.catalog.cache import get_catalog_version
+from apps.catalog.models import Category, Product
+from apps.core.cache import params_digest
+
+
+class ProductFacetService:
+    """
+    Фасеты каталога: количество товаров по категориям, статусу наличия,
+    диапазонам скидки и цены для текущего набора фильтров.
+
+    Все счётчики получаются одним GROUP BY по комбинации измерений
+    и сворачиваются в Python; результат кэшируется до изменения каталога.
+    """
+
+    # Запросы, отличающиеся только этими параметрами, дают одинаковые фасеты
+    ignored_params = ("ordering", "cursor", "limit", "offset", "count")
+
+    @staticmethod
+    def discount_buckets():
+        """Диапазоны скидки, включая обе границы: [(0, 0), (1, 10), ...]."""
+        return [tuple(bucket) for bucket in settings.CATALOG_DISCOUNT_BUCKETS]
+
+    @staticmethod
+    def price_buckets():
+        """Полуинтервалы цены [low, high) по границам гистограммы."""
+        edges = list(settings.CATALOG_PRICE_BUCKETS)
+        return list(zip(edges, edges[1:] + [None]))
+
+    @staticmethod
+    def _bucket_case(field, buckets, upper_lookup):
+        whens = []
+        for position, (low, high) in enumerate(buckets):
+            condition = Q(**{f"{field}__gte": low})
+            if high is not None:
+                condition &= Q(**{f"{field}__{upper_lookup}": high})
+            whens.append(When(condition, then=Value(position)))
+        return Case(*whens, default=Value(None), output_field=IntegerField())
+
+    @staticmethod
+    def _label(low, high):
+        return f"{low}+" if high is None else f"{low}-{high}"
+
+    @classmethod
+    def compute(cls, queryset):
+        discount_buckets = cls.discount_buckets()
+        price_buckets = cls.price_buckets()
+        rows = (
+            queryset.order_by()
+            .values(
+                "category__slug",
+                "availability_status",
+                discount_bucket=cls._bucket_case("discount", discount_buckets, "lte"),
+                price_bucket=cls._bucket_case("price", price_buckets, "lt"),
+            )
+            .annotate(total=Count("id"))
+        )
+
+        total, categories, statuses = 0, {}, {}
+        discounts = [0] * len(discount_buckets)
+        prices = [0] * len(price_buckets)
+        for row in rows:
+            count = row["total"]
+            total += count
+            slug = row["category__slug"]
+            categories[slug] = categories.get(slug, 0) + count
+            status = row["availability_status"]
+            statuses[status] = statuses.get(status, 0) + count
+            if row["discount_bucket"] is not None:
+                discounts[row["discount_bucket"]] += count
+            if row["price_bucket"] is not None:
+                prices[row["price_bucket"]] += count
+
+        return {
+            "count": total,
+            "category": [
+                {"value": slug, "count": count}
+                for slug, count in sorted(categories.items(), key=lambda i: -i[1])
+            ],
+            "availability_status": [
+                {"value": status, "count": statuses.get(status, 0)}
+                for status in Product.Availability.values
+            ],
+            "discount": [
+                {
+                    "value": cls._label(low, high),
+                    "min": low,
+                    "max": high,
+                    "count": count,
+                }
+                for (low, high), count in zip(discount_buckets, discounts)
+            ],
+            "price": [
+                {
+                    "value": cls._label(low, high),
+                    "min": low,
+                    "max": high,
+                    "count": count,
+                }
+                for (low, high), count in zip(price_buckets, prices)
+            ],
+        }
+
+    @classmethod
+    def get_facets(cls, queryset, query_params):
+        version = "-".join(map(str, get_catalog_version(Product, Category)))
+        digest = params_digest(query_params, cls.ignored_params)
+        cache_key = f"catalog:facets:{version}:{digest}"
+        facets = cache.get(cache_key)
+        if facets is None:
+            facets = cls.compute(queryset)
+            cache.set(cache_key, facets, settings.CATALOG_FACETS_CACHE_TTL)
+        return facets
@@ -4,6 +4,8 @@ from decimal import Decimal
 from django.db import models
 from pytils.translit import slugify
 
+from apps.catalog.services.search_services import ProductSearchService
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +21,8 @@ class ProductServices:
 
             if product.stock is not None:
                 ProductServices.determine_availability_status(product)
+
+            ProductServices.update_search_vector(product)
         except Exception as e:
             logger.error(f"Ошибка при подготовке товара к сохранению: {e}")
             raise
@@ -50,6 +54,18 @@ class ProductServices:
                 "backorder" if product.available_for_order else "unavailable"
             )
 
+    @staticmethod
+    def update_search_vector(product):
+        product.search_vector = ProductSearchService.vector_for_instance(product)
+
+    @staticmethod
+    def refresh_search_vectors(queryset):
+        """
+        Пересчёт поискового вектора для массовых операций
+        (bulk_create, QuerySet.update, импорт), минуя save().
+        """
+        return queryset.update(search_vector=ProductSearchService.vector_for_columns())
+
     @staticmethod
     def get_next_image_order(product):
         return (
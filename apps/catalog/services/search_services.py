@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+
+class ProductSearchService:
+    """
+    Полнотекстовый поиск по товарам на базе PostgreSQL tsvector.
+
+    Вес полей: название (A) > артикул (B) > описание (C).
+    Нечёткий режим (fuzzy) ищет по триграммам названия и артикула.
+    """
+
+    @staticmethod
+    def fulltext_enabled():
+        return settings.CATALOG_SEARCH_BACKEND == "fulltext"
+
+    @staticmethod
+    def build_vector(name, sku, description):
+        """
+        Собирает взвешенный tsvector. Аргументы — выражения
+        (F() для массового обновления или Value() для одного товара).
+        """
+        config = settings.CATALOG_SEARCH_CONFIG
+        return (
+            SearchVector(name, weight="A", config=config)
+            + SearchVector(sku, weight="B", config="simple")
+            + SearchVector(
+                Coalesce(description, Value(""), output_field=TextField()),
+                weight="C",
+                config=config,
+            )
+        )
+
+    @staticmethod
+    def vector_for_instance(product):
+        return ProductSearchService.build_vector(
+            Value(product.name or ""),
+            Value(product.sku or ""),
+            Value(product.description or ""),
+        )
+
+    @staticmethod
+    def vector_for_columns():
+        return ProductSearchService.build_vector(F("name"), F("sku"), F("description"))
+
+    @staticmethod
+    def fulltext(queryset, text, keep_ordering=False):
+        """
+        Фильтрует и ранжирует товары по поисковому запросу.
+        """
+        query = SearchQuery(
+            text, config=settings.CATALOG_SEARCH_CONFIG, search_type="websearch"
+        )
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=ProductSearchService.rank(SearchRank(F("search_vector"), query))
+        )
+        return ProductSearchService.order_by_rank(queryset, keep_ordering)
+
+    @staticmethod
+    def rank(expression):
+        """
+        Ранг для search_rank, приведённый к float8. ts_rank и word_similarity
+        возвращают real (float4): после JSON-курсора значение сравнивается
+        уже как float8 и не совпадает с исходным, из-за чего keyset-пагинация
+        пропускала или повторяла строки.
+        """
+        return Cast(expression, FloatField())
+
+    @staticmethod
+    def order_by_rank(queryset, keep_ordering=False):
+        """
+        Сортирует по search_rank. При keep_ordering=True ранг используется
+        только как вторичная сортировка после явно запрошенной.
+        """
+        ordering = list(queryset.query.order_by)
+        if keep_ordering:
+            return queryset.order_by(*ordering, "-search_rank")
+        return queryset.order_by("-search_rank", *ordering)
+
+    @staticmethod
+    def fuzzy(queryset, text, keep_ordering=False):
+        """
+        Поиск с опечатками и по части артикула (pg_trgm).
+        Операторы %> и ILIKE используют GIN-индексы gin_trgm_ops. Порог
+        CATALOG_TRIGRAM_THRESHOLD проверяется в самом запросе, поэтому не
+        зависит от настроек соединения (реплика, пул); для %> он же задан
+        параметром подключения (см. DATABASES).
+        """
+        threshold = settings.CATALOG_TRIGRAM_THRESHOLD
+        queryset = (
+            queryset.alias(
+                name_similarity=TrigramWordSimilarity(text, "name"),
+                sku_similarity=TrigramWordSimilarity(text, "sku"),
+            )
+            .filter(
+                Q(name__trigram_word_similar=text, name_similarity__gte=threshold)
+                | Q(sku__trigram_word_similar=text, sku_similarity__gte=threshold)
+                | Q(sku__icontains=text)
+            )
+            .annotate(
+                search_rank=ProductSearchService.rank(
+                    Greatest(F("name_similarity"), F("sku_similarity"))
+                )
+            )
+        )
+        return ProductSearchService.order_by_rank(queryset, keep_ordering)
@@ -0,0 +1,263 @@
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+PRODUCT = "product"
+CATEGORY = "category"
+
+# Одна фоновая перестройка на все процессы: остальные пока отдают старый индекс
+REBUILD_LOCK_KEY = "catalog:suggest:rebuild"
+REBUILD_LOCK_TIMEOUT = 60
+
+
+def normalize(text):
+    text = (text or "").lower().replace("ё", "е")
+    return " ".join(text.split())
+
+
+class SuggestIndex:
+    """
+    Префиксный индекс для подсказок поиска, хранящийся в памяти процесса.
+
+    Ключи — нормализованные названия (а также каждый их хвост, начиная
+    со следующего слова) и части артикулов. Хранятся в отсортированном
+    списке кортежей (ключ, тип, id), поиск — бинарный.
+
+    Устаревший (старше TTL) индекс продолжает отвечать, пока в фоновом
+    потоке собирается новый. Изменения, пришедшие во время сборки,
+    записываются в журнал и применяются к новому индексу после подмены.
+    """
+
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._keys = []
+        self._objects = {}
+        self._built_at = None
+        self._journal = None
+
+    def _max_entries(self):
+        if self.max_entries is not None:
+            return self.max_entries
+        return settings.CATALOG_SUGGEST_MAX_ENTRIES
+
+    def _ttl(self):
+        return self.ttl if self.ttl is not None else settings.CATALOG_SUGGEST_TTL
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def __len__(self):
+        return len(self._keys)
+
+    @staticmethod
+    def product_keys(name, sku):
+        words = normalize(name).split(" ")
+        keys = {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+        sku = normalize(sku)
+        if sku:
+            keys.add(sku)
+            keys.update(part for part in re.split(r"[^\w]+", sku) if part)
+        return keys
+
+    @staticmethod
+    def category_keys(name):
+        name = normalize(name)
+        return {name} if name else set()
+
+    def _insert(self, keys, kind, object_id, payload):
+        """Вызывается под блокировкой."""
+        self._remove((kind, object_id))
+        if len(self._keys) + len(keys) > self._max_entries():
+            logger.warning(
+                "Индекс подсказок переполнен, %s %s пропущен", kind, object_id
+            )
+            return
+        for key in keys:
+            insort(self._keys, (key, kind, object_id))
+        self._objects[(kind, object_id)] = (keys, payload)
+
+    def _remove(self, obj_key):
+        """Вызывается под блокировкой."""
+        stored = self._objects.pop(obj_key, None)
+        if not stored:
+            return
+        for key in stored[0]:
+            position = bisect_left(self._keys, (key, *obj_key))
+            if position < len(self._keys) and self._keys[position] == (key, *obj_key):
+                del self._keys[position]
+
+    @staticmethod
+    def load():
+        """Категории и товары для полной сборки (id, name, [sku,] slug)."""
+        from apps.catalog.models import Category, Product
+
+        return (
+            list(Category.objects.values_list("id", "name", "slug")),
+            list(Product.objects.values_list("id", "name", "sku", "slug")),
+        )
+
+    def rebuild(self, categories=None, products=None):
+        """
+        Полная перестройка индекса одним проходом по категориям и товарам.
+        Новые структуры собираются отдельно и подменяются целиком.
+        """
+        with self._lock:
+            self._journal = []
+        try:
+            keys, objects = self._collect(categories, products)
+        except Exception:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            self._keys, self._objects = keys, objects
+            self._built_at = time.monotonic()
+            # Изменения, закоммиченные во время чтения из БД
+            for operation in self._journal or ():
+                self._apply(operation)
+            self._journal = None
+
+    def _collect(self, categories=None, products=None):
+        """Ключи и объекты нового индекса."""
+        if categories is None or products is None:
+            categories, products = self.load()
+
+        keys, objects = [], {}
+        limit = self._max_entries()
+        entries = [
+            (CATEGORY, str(pk), self.category_keys(name), {"name": name, "slug": slug})
+            for pk, name, slug in categories
+        ] + [
+            (
+                PRODUCT,
+                str(pk),
+                self.product_keys(name, sku),
+                {"name": name, "slug": slug, "sku": sku},
+            )
+            for pk, name, sku, slug in products
+        ]
+        for kind, object_id, object_keys, payload in entries:
+            if len(keys) + len(object_keys) > limit:
+                logger.warning("Индекс подсказок обрезан до %s ключей", len(keys))
+                break
+            keys.extend((key, kind, object_id) for key in object_keys)
+            objects[(kind, object_id)] = (object_keys, payload)
+        keys.sort()
+        return keys, objects
+
+    def ensure_built(self):
+        """
+        Первая сборка — синхронно и одним потоком (остальные ждут её).
+        Устаревший индекс перестраивается в фоне, запросы его не ждут.
+        """
+        if not self.is_built:
+            with self._build_lock:
+                if not self.is_built:
+                    self.rebuild()
+            return
+        if time.monotonic() - self._built_at <= self._ttl():
+            return
+        if not self._build_lock.acquire(blocking=False):
+            return
+        if not cache.add(REBUILD_LOCK_KEY, 1, REBUILD_LOCK_TIMEOUT):
+            self._build_lock.release()
+            return
+        threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Не удалось перестроить индекс подсказок")
+        finally:
+            connection.close()
+            cache.delete(REBUILD_LOCK_KEY)
+            self._build_lock.release()
+
+    def clear(self):
+        with self._lock:
+            self._keys, self._objects = [], {}
+            self._built_at = None
+            self._journal = None
+
+    def product_entry(self, product):
+        return (
+            "insert",
+            self.product_keys(product.name, product.sku),
+            PRODUCT,
+            str(product.pk),
+            {"name": product.name, "slug": product.slug, "sku": product.sku},
+        )
+
+    def category_entry(self, category):
+        return (
+            "insert",
+            self.category_keys(category.name),
+            CATEGORY,
+            str(category.pk),
+            {"name": category.name, "slug": category.slug},
+        )
+
+    def _apply(self, operation):
+        """Вызывается под блокировкой."""
+        if operation[0] == "insert":
+            self._insert(*operation[1:])
+        else:
+            self._remove(operation[1:])
+
+    def apply(self, operation):
+        """Применяет product_entry/category_entry или удаление к индексу."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(operation)
+            if self._built_at is not None:
+                self._apply(operation)
+
+    def add_product(self, product):
+        self.apply(self.product_entry(product))
+
+    def add_category(self, category):
+        self.apply(self.category_entry(category))
+
+    def remove(self, kind, object_id):
+        self.apply(("remove", kind, str(object_id)))
+
+    def suggest(self, prefix, limit=10):
+        """
+        Возвращает до limit подсказок: сначала категории, затем товары,
+        внутри группы — в алфавитном порядке ключей.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        categories, products, seen = [], [], set()
+        with self._lock:
+            position = bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(seen) < limit:
+                key, kind, object_id = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if (kind, object_id) in seen:
+                    continue
+                seen.add((kind, object_id))
+                payload = {"type": kind, **self._objects[(kind, object_id)][1]}
+                (categories if kind == CATEGORY else products).append(payload)
+        return categories + products
+
+
+suggest_index = SuggestIndex()
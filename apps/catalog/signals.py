@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.catalog.cache import bump_catalog_version
+from apps.catalog.models import Category, Product, ProductExtraImage
+from apps.catalog.services.suggest_services import CATEGORY, PRODUCT, suggest_index
+
+# Индекс подсказок меняется только после коммита: откаченная запись не
+# должна попасть в подсказки. Данные берутся в момент сохранения.
+
+
+@receiver(post_save, sender=Product)
+def update_product_suggestions(sender, instance, **kwargs):
+    entry = suggest_index.product_entry(instance)
+    transaction.on_commit(lambda: suggest_index.apply(entry))
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_suggestions(sender, instance, **kwargs):
+    entry = ("remove", PRODUCT, str(instance.pk))
+    transaction.on_commit(lambda: suggest_index.apply(entry))
+
+
+@receiver(post_save, sender=Category)
+def update_category_suggestions(sender, instance, **kwargs):
+    entry = suggest_index.category_entry(instance)
+    transaction.on_commit(lambda: suggest_index.apply(entry))
+
+
+@receiver(post_delete, sender=Category)
+def remove_category_suggestions(sender, instance, **kwargs):
+    entry = ("remove", CATEGORY, str(instance.pk))
+    transaction.on_commit(lambda: suggest_index.apply(entry))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=ProductExtraImage)
+@receiver(post_delete, sender=ProductExtraImage)
+def invalidate_catalog_cache(sender, **kwargs):
+    bump_catalog_version(sender)
@@ -1,9 +1,12 @@
+from django.urls import path
 from rest_framework import routers
 
-from .views import CategoryViewSet, ProductViewSet
+from .views import CategoryViewSet, ProductViewSet, SuggestView
 
 router = routers.DefaultRouter()
 router.register(r"products", ProductViewSet)
 router.register(r"categories", CategoryViewSet)
 
-urlpatterns = [] + router.urls
+urlpatterns = [
+    path("suggest/", SuggestView.as_view(), name="catalog-suggest"),
+] + router.urls
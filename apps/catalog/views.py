@@ -1,25 +1,54 @@
+from django.db.models import Count, Max
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import filters, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from apps.catalog.filters import ProductFilter
-from apps.catalog.models import Category, Product
+from apps.catalog.filters import ProductFilter, ProductSearchFilter
+from apps.catalog.mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ReplicaReadMixin,
+    ValuesListMixin,
+)
+from apps.catalog.models import Category, Product, ProductExtraImage
 from apps.catalog.permissions import IsAdminOrReadOnly
 from apps.catalog.serializers import (
     CategorySerializer,
     ProductCreateUpdateSerializer,
     ProductDetailSerializer,
     ProductListSerializer,
+    ProductListValuesSerializer,
 )
+from apps.catalog.services.facet_services import ProductFacetService
+from apps.catalog.services.suggest_services import suggest_index
+from apps.core.pagination import ApproximateCountPagination, KeysetPagination
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
+    cache_models = (Category,)
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = "slug"
     permission_classes = (IsAdminOrReadOnly,)
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
+    cache_models = (Product, Category, ProductExtraImage)
+    # Список сериализуется из values(); None — через ProductListSerializer
+    values_serializer_class = ProductListValuesSerializer
     queryset = Product.objects.select_related("category").prefetch_related(
         "extra_images"
     )
@@ -28,12 +57,55 @@ class ProductViewSet(viewsets.ModelViewSet):
     filterset_class = ProductFilter
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
         filters.OrderingFilter,
+        ProductSearchFilter,
     ]
     search_fields = ["name", "description", "sku"]
     ordering_fields = ["price", "sku", "discount", "stock"]
     ordering = ["price"]
+    pagination_class = KeysetPagination
+    # OFFSET-пагинация (?offset=) оставлена только для администраторов
+    staff_pagination_class = ApproximateCountPagination
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            use_offset = (
+                self.request.user.is_staff and "offset" in self.request.query_params
+            )
+            pagination_class = (
+                self.staff_pagination_class if use_offset else self.pagination_class
+            )
+            self._paginator = pagination_class()
+        return self._paginator
+
+    def get_object_validators(self, **kwargs):
+        row = (
+            Product.objects.filter(slug=kwargs["slug"])
+            .annotate(
+                images_updated=Max("extra_images__updated_at"),
+                images_count=Count("extra_images"),
+            )
+            .values_list(
+                "updated_at", "category__updated_at", "images_updated", "images_count"
+            )
+            .first()
+        )
+        if row is None:
+            return None
+        last_modified = max(value for value in row[:3] if value is not None)
+        return list(row), last_modified.timestamp()
+
+    @extend_schema(
+        summary="Фасеты каталога",
+        description="Количество товаров по категориям, наличию, скидке и цене "
+        "для текущих фильтров и поиска.",
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], url_path="facets")
+    def facets(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(ProductFacetService.get_facets(queryset, request.query_params))
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -41,3 +113,33 @@ class ProductViewSet(viewsets.ModelViewSet):
         elif self.action == "retrieve":
             return ProductDetailSerializer
         return ProductCreateUpdateSerializer
+
+
+class SuggestView(APIView):
+    """
+    Подсказки для строки поиска из индекса в памяти, без обращения к БД.
+    """
+
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+    default_limit = 10
+    max_limit = 50
+
+    @extend_schema(
+        summary="Подсказки поиска",
+        parameters=[
+            OpenApiParameter(name="q", type=str, description="Начало запроса"),
+            OpenApiParameter(name="limit", type=int, description="Не более 50"),
+        ],
+        responses={200: None},
+    )
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        suggest_index.ensure_built()
+        results = suggest_index.suggest(request.query_params.get("q", ""), limit)
+        return Response({"results": results})
@@ -0,0 +1,18 @@
+from django.contrib import admin
+
+from apps.core.models import OutboxEvent
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "topic",
+        "handler",
+        "status",
+        "attempts",
+        "available_at",
+        "created_at",
+    )
+    list_filter = ("status", "topic")
+    search_fields = ("id", "topic", "handler")
+    readonly_fields = ("created_at", "processed_at")
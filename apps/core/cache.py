@@ -0,0 +1,35 @@
+import hashlib
+import json
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+# Кэши в памяти одного процесса: другие воркеры gunicorn их не видят
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def params_digest(query_params, ignored=()):
+    """Хэш нормализованного (отсортированного) набора GET-параметров."""
+    params = sorted(
+        (key, value)
+        for key, values in query_params.lists()
+        if key not in ignored
+        for value in values
+    )
+    return hashlib.md5(json.dumps(params).encode()).hexdigest()
+
+
+def is_shared_cache(alias=DEFAULT_CACHE_ALIAS) -> bool:
+    return not isinstance(caches[alias], PROCESS_LOCAL_CACHES)
+
+
+def require_shared_cache(feature, alias=DEFAULT_CACHE_ALIAS):
+    """ImproperlyConfigured, если кэш alias живёт в памяти процесса."""
+    if not is_shared_cache(alias):
+        backend = type(caches[alias]).__name__
+        raise ImproperlyConfigured(
+            f"{feature} требует общий кэш (CACHE_BACKEND, например Redis): "
+            f"{backend} хранит данные в памяти одного процесса."
+        )
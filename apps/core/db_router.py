@@ -0,0 +1,114 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Приложения, чтения моделей которых можно отдавать репликам
+REPLICA_APP_LABELS = {"catalog"}
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+class WeightedRoundRobin:
+    """
+    Плавный взвешенный round-robin (как в nginx): при весах {a: 2, b: 1}
+    порядок a, b, a — без серий подряд к одной реплике.
+    """
+
+    def __init__(self, weights: dict):
+        self.configured = weights
+        self.weights = {
+            alias: weight for alias, weight in weights.items() if weight > 0
+        }
+        self.total = sum(self.weights.values())
+        self.current = dict.fromkeys(self.weights, 0)
+        self.lock = threading.Lock()
+
+    def next(self):
+        if not self.weights:
+            return None
+        with self.lock:
+            for alias, weight in self.weights.items():
+                self.current[alias] += weight
+            alias = max(self.current, key=self.current.get)
+            self.current[alias] -= self.total
+            return alias
+
+
+@contextmanager
+def replica_reads():
+    """Чтения моделей каталога внутри блока могут идти в реплики."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def routing_scope():
+    """Состояние маршрутизации одного запроса (сбрасывается по выходу)."""
+    tokens = _replica_reads.set(False), _pinned.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(tokens[0])
+        _pinned.reset(tokens[1])
+
+
+def pin_primary():
+    """До конца запроса все чтения — из primary."""
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+class ReplicaRouter:
+    """
+    Чтения каталога — из реплик DATABASE_REPLICAS по весам, остальное —
+    из default (primary).
+
+    Реплика используется только внутри replica_reads() (GET каталога, см.
+    ReplicaReadMixin) и только если в этом запросе ещё не было записи
+    и нет открытой транзакции — корзина, заказы и остатки при оформлении
+    читаются из primary.
+    """
+
+    def __init__(self):
+        self.balancer = WeightedRoundRobin({})
+
+    def get_balancer(self):
+        # Веса читаются из настроек при каждом вызове (override_settings в тестах)
+        if self.balancer.configured != settings.DATABASE_REPLICAS:
+            self.balancer = WeightedRoundRobin(settings.DATABASE_REPLICAS)
+        return self.balancer
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or _pinned.get():
+            return None
+        if model._meta.app_label not in REPLICA_APP_LABELS:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return self.get_balancer().next()
+
+    def db_for_write(self, model, **hints):
+        # read-your-writes внутри запроса
+        pin_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,103 @@
+import hashlib
+import json
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+# Постоянный id гостя в данных сессии. Токен корзины для этого не подходит:
+# он сбрасывается после оформления заказа, и повтор не нашёл бы ответ
+GUEST_ID_SESSION_KEY = "guest_id"
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    type=str,
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description="Уникальный ключ запроса: повтор с тем же ключом вернёт "
+    "сохранённый ответ без повторного выполнения",
+)
+
+
+def _owner(request):
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    guest_id = request.session.get(GUEST_ID_SESSION_KEY)
+    if guest_id is None:
+        guest_id = request.session[GUEST_ID_SESSION_KEY] = uuid4().hex
+    return f"guest:{guest_id}"
+
+
+def _fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{request.method}:{request.path}:{body}".encode()
+    ).hexdigest()
+
+
+def idempotent(view_method):
+    """
+    Поддержка заголовка Idempotency-Key для небезопасных методов ViewSet.
+
+    Успешный (2xx) ответ хранится в кэше IDEMPOTENCY_TTL секунд по ключу,
+    владельцу (пользователь или id гостя в сессии) и отпечатку запроса. Повтор
+    возвращается из кэша до вызова обработчика; тот же ключ с другим телом —
+    422, пока первый запрос выполняется — 409.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} длиннее {MAX_KEY_LENGTH} символов."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cache_key = f"idempotency:{_owner(request)}:{key}"
+        fingerprint = _fingerprint(request)
+        stored = cache.get(cache_key)
+        if stored is not None:
+            if stored["fingerprint"] != fingerprint:
+                return Response(
+                    {
+                        "detail": f"{IDEMPOTENCY_HEADER} уже использован с другим запросом."
+                    },
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            response = Response(stored["data"], status=stored["status"])
+            response[REPLAYED_HEADER] = "true"
+            return response
+
+        lock_key = f"{cache_key}:lock"
+        if not cache.add(lock_key, 1, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+            return Response(
+                {"detail": "Запрос с этим ключом ещё выполняется."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        try:
+            response = view_method(self, request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                cache.set(
+                    cache_key,
+                    {
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "data": response.data,
+                    },
+                    settings.IDEMPOTENCY_TTL,
+                )
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return wrapper
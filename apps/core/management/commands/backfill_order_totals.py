@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.models import Order
+
+
+class Command(BaseCommand):
+    help = "Заполнить сохранённые итоги (subtotal, items_count, total) у заказов"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Заказов за один UPDATE"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        updated = 0
+        last_pk = None
+        while True:
+            queryset = Order.objects.order_by("pk")
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            updated += Order.objects.filter(pk__in=pks).recalculate_totals()
+            last_pk = pks[-1]
+        self.stdout.write(self.style.SUCCESS(f"Updated totals of {updated} orders."))
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Посчитать соединения с БД, открытые на 1000 запросов: без постоянных "
+        "соединений и с текущими настройками DATABASES (CONN_MAX_AGE или пул). "
+        "Запросы выполняются как в WSGI-сервере — с close_old_connections() "
+        "до и после каждого. Кэш ответов каталога отключается, чтобы каждый "
+        "запрос обращался к БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument(
+            "--threads", type=int, default=1, help="Потоков, как у воркера gthread"
+        )
+        parser.add_argument("--path", default="/api/v1/catalog/categories/")
+        parser.add_argument("--host", default="localhost", help="Заголовок Host")
+
+    def handle(self, *args, **options):
+        if connection.in_atomic_block:
+            raise CommandError("Нельзя запускать внутри транзакции.")
+
+        settings_dict = connection.settings_dict
+        pooled = "pool" in settings_dict["OPTIONS"]
+        modes = [("configured", settings_dict["CONN_MAX_AGE"])]
+        if not pooled:
+            modes.insert(0, ("no persistence", 0))
+
+        for label, max_age in modes:
+            opened, elapsed = self.run(max_age, options)
+            per_1000 = opened * 1000 / options["requests"]
+            self.stdout.write(
+                f"{label} (CONN_MAX_AGE={max_age}): {per_1000:.1f} соединений "
+                f"на 1000 запросов, {options['requests'] / elapsed:.0f} запросов/с"
+            )
+        if pooled:
+            stats = connection.pool.get_stats()
+            self.stdout.write(
+                f"pool: {stats.get('connections_num', 0)} физических соединений, "
+                f"max_size={connection.pool.max_size}"
+            )
+
+    def run(self, max_age, options):
+        """Возвращает число открытых соединений и время прогона."""
+        original = connection.settings_dict["CONN_MAX_AGE"]
+        opened = 0
+        lock = threading.Lock()
+
+        def count(sender, connection, **kwargs):
+            nonlocal opened
+            with lock:
+                opened += 1
+
+        def worker(requests):
+            client = Client(HTTP_HOST=options["host"])
+            for _ in range(requests):
+                # request_started / request_finished в WSGIHandler
+                close_old_connections()
+                client.get(options["path"])
+                close_old_connections()
+            connection.close()
+
+        threads = max(options["threads"], 1)
+        share, rest = divmod(options["requests"], threads)
+        workers = [
+            threading.Thread(target=worker, args=(share + (i < rest),))
+            for i in range(threads)
+        ]
+        # settings_dict общий для потоков, соединения у каждого потока свои;
+        # срок жизни соединения считается при подключении — закрываем текущее
+        connection.settings_dict["CONN_MAX_AGE"] = max_age
+        connection.close()
+        connection_created.connect(count)
+        started = time.perf_counter()
+        try:
+            with override_settings(CATALOG_CACHE_ENABLED=False):
+                for thread in workers:
+                    thread.start()
+                for thread in workers:
+                    thread.join()
+        finally:
+            connection_created.disconnect(count)
+            connection.settings_dict["CONN_MAX_AGE"] = original
+        return opened, time.perf_counter() - started
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from apps.catalog.models import Product
+from apps.catalog.serializers import ProductListSerializer, ProductListValuesSerializer
+
+
+class Command(BaseCommand):
+    help = "Сравнить скорость сериализации страницы товаров: ModelSerializer и values()"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=100, help="Товаров на странице")
+        parser.add_argument("--repeat", type=int, default=50, help="Число повторов")
+        parser.add_argument("--host", default="localhost", help="Хост для ссылок")
+
+    def handle(self, *args, **options):
+        size, repeat = options["size"], options["repeat"]
+        request = APIRequestFactory().get(
+            "/api/v1/catalog/products/", HTTP_HOST=options["host"]
+        )
+        context = {"request": request}
+        queryset = Product.objects.select_related("category").order_by("price", "id")
+        values_serializer = ProductListValuesSerializer(context=context)
+        renderer = JSONRenderer()
+
+        def model_page():
+            rows = list(queryset[:size])
+            return renderer.render(
+                ProductListSerializer(rows, many=True, context=context).data
+            )
+
+        def values_page():
+            rows = list(values_serializer.prepare_queryset(queryset)[:size])
+            return renderer.render(values_serializer.to_representation(rows))
+
+        if model_page() != values_page():
+            self.stderr.write(self.style.ERROR("Ответы сериализаторов различаются."))
+            return
+
+        timings = {}
+        for name, build in (("ModelSerializer", model_page), ("values()", values_page)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                build()
+            timings[name] = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(f"{name}: {timings[name]:.2f} ms на страницу")
+
+        speedup = timings["ModelSerializer"] / timings["values()"]
+        self.stdout.write(self.style.SUCCESS(f"Ускорение: x{speedup:.1f}"))
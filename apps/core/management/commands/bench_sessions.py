@@ -0,0 +1,67 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.catalog.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнить стратегии хранения сессий (SESSION_ENGINES): запросы к "
+        "django_session и всего на один запрос гостя к корзине. "
+        "Изменения в БД откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rounds", type=int, default=10, help="Повторов сценария гостя"
+        )
+        parser.add_argument("--host", default="localhost", help="Заголовок Host")
+
+    def handle(self, *args, **options):
+        product = Product.objects.filter(stock__gt=0).order_by("-stock").first()
+        if product is None:
+            raise CommandError("Нужен хотя бы один товар в наличии (seed_data).")
+
+        for strategy, engine in settings.SESSION_ENGINES.items():
+            try:
+                with override_settings(SESSION_ENGINE=engine):
+                    # Проверка настроек до запросов, чтобы не ловить 500
+                    import_module(engine).SessionStore()
+                    requests, session_queries, queries = self.run_scenario(
+                        product, options["rounds"], options["host"]
+                    )
+            except ImproperlyConfigured as error:
+                # cached_db без общего кэша (CACHE_BACKEND)
+                self.stdout.write(f"{strategy}: пропущено — {error}")
+                continue
+            self.stdout.write(
+                f"{strategy}: {session_queries / requests:.2f} запросов к django_session, "
+                f"{queries / requests:.2f} всего на запрос"
+            )
+
+    def run_scenario(self, product, rounds, host):
+        """Новый гость в каждом раунде: список корзин, добавление товара, корзина."""
+        requests = 0
+        with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+            for _ in range(rounds):
+                client = Client(HTTP_HOST=host)
+                client.get(reverse("carts-list"))
+                client.post(
+                    reverse("carts-add"),
+                    {"product_id": str(product.pk), "quantity": 1},
+                    content_type="application/json",
+                )
+                client.get(reverse("carts-get-current-cart"))
+                requests += 3
+            transaction.set_rollback(True)
+        session_queries = sum(
+            "django_session" in query["sql"] for query in captured.captured_queries
+        )
+        return requests, session_queries, len(captured.captured_queries)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.cart.reservation_services import ReservationService
+
+
+class Command(BaseCommand):
+    help = "Удалить истёкшие резервы товаров (запускать по расписанию, например cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Резервов за один DELETE"
+        )
+
+    def handle(self, *args, **options):
+        deleted = ReservationService.sweep(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Released {deleted} reservations."))
@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.core.outbox import OutboxService
+
+
+class Command(BaseCommand):
+    help = (
+        "Обработка событий outbox: выборка через SELECT ... FOR UPDATE SKIP LOCKED, "
+        "обработчики в пуле потоков, повторы с экспоненциальной задержкой. "
+        "Можно запускать несколько воркеров параллельно."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Событий за одну выборку"
+        )
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Потоков для обработчиков"
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Пауза (сек.), если готовых событий нет",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Обработать готовые события и выйти"
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            try:
+                while True:
+                    claimed = OutboxService.process_batch(
+                        options["batch_size"], executor=executor
+                    )
+                    processed += claimed
+                    if claimed:
+                        continue
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+            except KeyboardInterrupt:
+                pass
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} events."))
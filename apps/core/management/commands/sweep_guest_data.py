@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.cart.cleanup_services import CleanupService
+
+
+class Command(BaseCommand):
+    help = (
+        "Удалить истёкшие сессии и брошенные гостевые корзины пачками "
+        "(запускать по расписанию, например cron)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Строк за один DELETE"
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Пауза (сек.) между пачками, чтобы снизить нагрузку на БД",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        self.sweep("sessions", CleanupService.sweep_sessions(batch_size), options)
+        self.sweep("guest carts", CleanupService.sweep_guest_carts(batch_size), options)
+
+    def sweep(self, name, batches, options):
+        started = time.monotonic()
+        total = 0
+        for number, deleted in enumerate(batches, start=1):
+            total += deleted
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"{name}: batch {number}, deleted {deleted} "
+                f"(total {total}, {total / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {total} {name} in {elapsed:.2f}s ({rate:.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.models import Product
+from apps.catalog.services.product_services import ProductServices
+
+
+class Command(BaseCommand):
+    help = "Пересчитать поисковые векторы товаров (после импорта или массовых правок)"
+
+    def handle(self, *args, **options):
+        updated = ProductServices.refresh_search_vectors(Product.objects.all())
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} products."))
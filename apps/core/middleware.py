@@ -0,0 +1,34 @@
+from django.conf import settings
+
+from apps.core.db_router import pin_primary, routing_scope
+
+PIN_COOKIE = "db_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class PrimaryPinMiddleware:
+    """
+    Read-your-writes при чтении из реплик: после небезопасного запроса
+    (изменение корзины, правка в админке) клиент получает cookie, и
+    DATABASE_PIN_SECONDS секунд все его чтения идут в primary — дольше,
+    чем отстаёт реплика.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routing_scope():
+            writes = request.method not in SAFE_METHODS
+            if writes or request.COOKIES.get(PIN_COOKIE):
+                pin_primary()
+            response = self.get_response(request)
+        if writes:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DATABASE_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
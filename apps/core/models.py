@@ -0,0 +1,45 @@
+from uuid import uuid4
+
+from django.db import models
+
+
+class OutboxEvent(models.Model):
+    """
+    Событие transactional outbox: пишется в той же транзакции, что и
+    доменные изменения, и обрабатывается воркером run_outbox_worker.
+    Одна строка — одно событие для одного обработчика.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает"
+        PROCESSING = "processing", "Обрабатывается"
+        DONE = "done", "Обработано"
+        FAILED = "failed", "Ошибка"
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    topic = models.CharField("Тема", max_length=100)
+    handler = models.CharField("Обработчик", max_length=255)
+    payload = models.JSONField("Данные", default=dict)
+    status = models.CharField(
+        "Статус", max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField("Попыток", default=0)
+    # Для PENDING — время следующей попытки, для PROCESSING — конец аренды
+    available_at = models.DateTimeField("Доступно с")
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    created_at = models.DateTimeField("Создано", auto_now_add=True)
+    processed_at = models.DateTimeField("Обработано", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Событие outbox"
+        verbose_name_plural = "События outbox"
+        indexes = [
+            models.Index(
+                fields=["available_at"],
+                condition=models.Q(status__in=["pending", "processing"]),
+                name="outbox_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} → {self.handler} ({self.get_status_display()})"
@@ -0,0 +1,136 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# {тема: {имя обработчика: функция(payload)}}
+_handlers = defaultdict(dict)
+
+
+def handler(topic):
+    """
+    Регистрирует обработчик события. Модуль с обработчиками нужно
+    импортировать в AppConfig.ready(), чтобы регистрация прошла до publish().
+    """
+
+    def decorator(func):
+        _handlers[topic][f"{func.__module__}.{func.__qualname__}"] = func
+        return func
+
+    return decorator
+
+
+def publish(topic, payload):
+    """
+    Записывает событие для всех обработчиков темы в текущей транзакции:
+    если транзакция откатится, событий не будет.
+    """
+    now = timezone.now()
+    return OutboxEvent.objects.bulk_create(
+        OutboxEvent(topic=topic, handler=name, payload=payload, available_at=now)
+        for name in _handlers.get(topic, ())
+    )
+
+
+class OutboxService:
+    """Выборка и обработка событий outbox (см. run_outbox_worker)."""
+
+    @staticmethod
+    def backoff(attempts) -> timedelta:
+        """Экспоненциальная задержка перед повтором, не больше OUTBOX_BACKOFF_MAX."""
+        seconds = settings.OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1)
+        return timedelta(seconds=min(seconds, settings.OUTBOX_BACKOFF_MAX))
+
+    @staticmethod
+    @transaction.atomic
+    def claim(batch_size) -> list:
+        """
+        Забирает до batch_size готовых событий (SELECT ... FOR UPDATE SKIP
+        LOCKED) и берёт их в аренду на OUTBOX_LEASE секунд. События упавшего
+        воркера снова станут доступны по окончании аренды.
+        """
+        now = timezone.now()
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutboxEvent.Status.PENDING, OutboxEvent.Status.PROCESSING],
+                available_at__lte=now,
+            )
+            .order_by("available_at")[:batch_size]
+        )
+        if events:
+            OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+                status=OutboxEvent.Status.PROCESSING,
+                available_at=now + timedelta(seconds=settings.OUTBOX_LEASE),
+                attempts=F("attempts") + 1,
+            )
+            for event in events:
+                event.attempts += 1
+        return events
+
+    @staticmethod
+    def run_handler(event):
+        """Выполняет обработчик; возвращает текст ошибки или None."""
+        try:
+            func = _handlers.get(event.topic, {}).get(event.handler)
+            if func is None:
+                return f"Обработчик {event.handler} не зарегистрирован"
+            func(event.payload)
+            return None
+        except Exception as exc:
+            logger.exception("Outbox event %s failed", event.pk)
+            return f"{type(exc).__name__}: {exc}"
+
+    @staticmethod
+    def run_handler_in_thread(event):
+        """
+        run_handler для потока пула: у каждого потока своё соединение с БД,
+        оно переиспользуется или закрывается по правилам CONN_MAX_AGE.
+        """
+        close_old_connections()
+        try:
+            return OutboxService.run_handler(event)
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def complete(event, error):
+        now = timezone.now()
+        if error is None:
+            event.status = OutboxEvent.Status.DONE
+            event.processed_at = now
+            event.last_error = ""
+        elif event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            event.status = OutboxEvent.Status.FAILED
+            event.last_error = error
+        else:
+            event.status = OutboxEvent.Status.PENDING
+            event.available_at = now + OutboxService.backoff(event.attempts)
+            event.last_error = error
+        event.save(
+            update_fields=["status", "available_at", "processed_at", "last_error"]
+        )
+
+    @staticmethod
+    def process_batch(batch_size=100, executor=None) -> int:
+        """
+        Обрабатывает одну пачку событий. Обработчики выполняются в executor
+        (пул потоков воркера) или последовательно, если он не передан.
+        Возвращает число забранных событий.
+        """
+        events = OutboxService.claim(batch_size)
+        if executor is None:
+            errors = [OutboxService.run_handler(event) for event in events]
+        else:
+            errors = list(executor.map(OutboxService.run_handler_in_thread, events))
+        for event, error in zip(events, errors):
+            OutboxService.complete(event, error)
+        return len(events)
@@ -0,0 +1,376 @@
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import (
+    EmptyResultSet,
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError,
+)
+from django.db import models
+from django.db.models import F, Func, Q, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class Row(Func):
+    """Кортеж значений для построчного сравнения: (a, b) > (x, y)."""
+
+    template = "(%(expressions)s)"
+    output_field = models.Field()
+
+
+def estimate_count(queryset):
+    """
+    Оценка числа строк планировщиком PostgreSQL (EXPLAIN) без выполнения
+    запроса.
+    """
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CountMixin:
+    """
+    Общее число результатов для пагинаторов.
+
+    Точный COUNT(*) кэшируется на PAGINATION_COUNT_CACHE_TTL секунд
+    по SQL выборки с параметрами — ключ различается и для фильтров из
+    запроса, и для наложенных view (например, user_id владельца). Если планировщик оценивает
+    выборку в PAGINATION_ESTIMATE_COUNT_THRESHOLD строк и больше,
+    возвращается оценка (count_exact = false). ?count=false отключает подсчёт.
+    """
+
+    count_query_param = "count"
+    count_by_default = True
+
+    def count_requested(self, request):
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.count_by_default
+        return value.lower() not in ("0", "false", "no")
+
+    def get_count_cache_key(self, queryset, request):
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.md5(repr((queryset.db, sql, params)).encode()).hexdigest()
+        return f"pagination:count:{queryset.model._meta.label_lower}:{digest}"
+
+    def get_total_count(self, queryset, request):
+        """Возвращает (count, exact) или (None, None), если подсчёт отключён."""
+        if not self.count_requested(request):
+            return None, None
+
+        try:
+            cache_key = self.get_count_cache_key(queryset, request)
+        except EmptyResultSet:
+            # Заведомо пустая выборка (filter(pk__in=[]), none())
+            return 0, True
+        count = cache.get(cache_key)
+        if count is not None:
+            return count, True
+
+        estimate = estimate_count(queryset)
+        if estimate >= settings.PAGINATION_ESTIMATE_COUNT_THRESHOLD:
+            return estimate, False
+
+        count = queryset.count()
+        cache.set(cache_key, count, settings.PAGINATION_COUNT_CACHE_TTL)
+        return count, True
+
+    def get_count_data(self):
+        if self.count is None:
+            return []
+        return [("count", self.count), ("count_exact", self.count_exact)]
+
+    def get_count_schema(self):
+        return {
+            "count": {"type": "integer", "example": 123},
+            "count_exact": {"type": "boolean"},
+        }
+
+    def get_count_schema_parameter(self):
+        return {
+            "name": self.count_query_param,
+            "required": False,
+            "in": "query",
+            "description": "false — не считать общее количество",
+            "schema": {"type": "boolean"},
+        }
+
+
+class ApproximateCountPagination(CountMixin, LimitOffsetPagination):
+    """
+    LimitOffsetPagination с оценочным/кэшированным count.
+    Наличие следующей страницы определяется по limit + 1 строке,
+    а не по count, поэтому работает и с оценкой, и без подсчёта.
+    Номера страниц в browsable API показываются, только если count известен.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.count, self.count_exact = self.get_total_count(queryset, request)
+        window = slice(self.offset, self.offset + self.limit + 1)
+        rows = list(queryset[window])
+        self.has_more = len(rows) > self.limit
+        self.display_page_controls = (
+            self.template is not None
+            and self.count is not None
+            and (self.has_more or self.offset > 0)
+        )
+        return rows[: self.limit]
+
+    def get_html_context(self):
+        if self.count is None:
+            # ?count=false: без числа страниц, только соседние ссылки
+            return {
+                "previous_url": self.get_previous_link(),
+                "next_url": self.get_next_link(),
+                "page_links": [],
+            }
+        return super().get_html_context()
+
+    def get_next_link(self):
+        if not self.has_more:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                self.get_count_data()
+                + [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        response_schema["properties"].update(self.get_count_schema())
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            self.get_count_schema_parameter()
+        ]
+
+
+class KeysetPagination(CountMixin, BasePagination):
+    """
+    Курсорная (keyset) пагинация.
+
+    К сортировке запроса добавляется уникальный tiebreaker (id) в том же
+    направлении, что и последнее поле, поэтому каждая следующая страница —
+    это WHERE (поля) > (значения последней строки) по составному индексу,
+    без OFFSET и COUNT(*). Курсор — непрозрачный base64-токен.
+    Поля сортировки должны быть NOT NULL.
+    Общее количество не считается, если не запрошено ?count=true.
+    """
+
+    count_by_default = False
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    tiebreaker = "id"
+    invalid_cursor_message = "Неверный курсор."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        self.model = queryset.model
+        self.count, self.count_exact = self.get_total_count(queryset, request)
+
+        cursor = self.decode_cursor(request)
+        self.is_reverse = bool(cursor and cursor["reverse"])
+        if cursor:
+            queryset = queryset.filter(
+                self.keyset_condition(cursor["values"], self.is_reverse)
+            )
+
+        ordering = self.ordering
+        if self.is_reverse:
+            ordering = [self._invert(name) for name in ordering]
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.is_reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = cursor is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """
+        Сортировка берётся из запроса (OrderingFilter, поиск) или Meta.ordering
+        модели; tiebreaker добавляется в направлении последнего поля.
+        Сортировка по выражению не поддерживается: его значение не попадает
+        в курсор — нужна аннотация и сортировка по её имени.
+        """
+        ordering = []
+        for name in queryset.query.order_by or queryset.model._meta.ordering:
+            if not isinstance(name, str):
+                raise ImproperlyConfigured(
+                    f"{type(self).__name__}: сортировка по выражению {name!r} "
+                    "не поддерживается, используйте аннотацию."
+                )
+            if name.lstrip("-") != self.tiebreaker:
+                ordering.append(name)
+        descending = bool(ordering) and ordering[-1].startswith("-")
+        return ordering + [f"-{self.tiebreaker}" if descending else self.tiebreaker]
+
+    @staticmethod
+    def _invert(name):
+        return name[1:] if name.startswith("-") else f"-{name}"
+
+    def keyset_condition(self, values, reverse=False):
+        """
+        Условие «строго после» (или «строго до» при reverse) позиции курсора.
+        Если направления всех полей совпадают — одно построчное сравнение,
+        которое PostgreSQL выполняет как Index Cond; иначе — развёрнутое OR.
+        """
+        fields = [name.lstrip("-") for name in self.ordering]
+        greater = [name.startswith("-") == reverse for name in self.ordering]
+        values = [
+            Value(value, output_field=self._field(name))
+            for name, value in zip(fields, values)
+        ]
+
+        if len(set(greater)) == 1:
+            lookup = GreaterThan if greater[0] else LessThan
+            return lookup(Row(*[F(name) for name in fields]), Row(*values))
+
+        condition = Q()
+        for position, name in enumerate(fields):
+            step = Q(**{fields[i]: values[i] for i in range(position)})
+            op = "gt" if greater[position] else "lt"
+            condition |= step & Q(**{f"{name}__{op}": values[position]})
+        return condition
+
+    def _field(self, name):
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def _position(self, row):
+        position = []
+        for name in self.ordering:
+            name = name.lstrip("-")
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, row, reverse=False):
+        payload = {
+            "o": self.ordering,
+            "v": self._position(row),
+            "r": int(reverse),
+        }
+        raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+        token = urlsafe_b64encode(raw).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            if payload["o"] != self.ordering or len(payload["v"]) != len(self.ordering):
+                raise ValueError
+            values = []
+            for name, value in zip(self.ordering, payload["v"]):
+                field = self._field(name.lstrip("-"))
+                values.append(field.to_python(value) if field else value)
+            return {"values": values, "reverse": bool(payload["r"])}
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                self.get_count_data()
+                + [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                **self.get_count_schema(),
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Курсор страницы из ссылок next/previous",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Количество результатов на странице",
+                "schema": {"type": "integer"},
+            },
+            self.get_count_schema_parameter(),
+        ]
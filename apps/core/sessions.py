@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+from apps.core.cache import require_shared_cache
+
+
+class SessionStore(CachedDBStore):
+    """
+    cached_db-сессии только поверх общего кэша: с locmem каждый воркер
+    читал бы свою, устаревшую копию сессии (и токена гостевой корзины).
+    """
+
+    def __init__(self, session_key=None):
+        require_shared_cache("Сессии cached_db", settings.SESSION_CACHE_ALIAS)
+        super().__init__(session_key)
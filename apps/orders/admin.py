@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from apps.orders.services.order_services import OrderService
+
 from .models import Order, OrderItem
 
 
@@ -10,11 +12,25 @@ class OrderItemInline(admin.TabularInline):
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
-    list_display = ("id", "full_name", "phone", "status", "created_at", "updated_at")
+    list_display = (
+        "id",
+        "full_name",
+        "phone",
+        "status",
+        "items_count",
+        "total",
+        "created_at",
+        "updated_at",
+    )
     search_fields = ("full_name", "phone", "email")
     list_filter = (("status", admin.ChoicesFieldListFilter), "created_at")
+    readonly_fields = ("subtotal", "items_count", "total")
     inlines = [OrderItemInline]
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        OrderService.recalculate_totals(form.instance)
+
 
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
@@ -26,3 +42,16 @@ class OrderItemAdmin(admin.ModelAdmin):
         return obj.total_price
 
     total_price.short_description = "Сумма по позиции"
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        OrderService.recalculate_totals(obj.order)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        OrderService.recalculate_totals(obj.order)
+
+    def delete_queryset(self, request, queryset):
+        order_ids = list(queryset.values_list("order_id", flat=True).distinct())
+        super().delete_queryset(request, queryset)
+        Order.objects.filter(pk__in=order_ids).recalculate_totals()
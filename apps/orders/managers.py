@@ -1,4 +1,32 @@
 from django.db import models
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.cart.managers import MONEY, ZERO
+
+
+class OrderQuerySet(models.QuerySet):
+    def recalculate_totals(self):
+        """
+        Пересчитывает сохранённые subtotal/items_count/total по позициям
+        одним UPDATE с подзапросами. Возвращает число обновлённых заказов.
+        """
+        OrderItem = self.model._meta.get_field("items").related_model
+        lines = (
+            OrderItem.objects.filter(order=OuterRef("pk")).order_by().values("order")
+        )
+        subtotal = Coalesce(
+            Subquery(
+                lines.annotate(
+                    value=Sum(F("price") * F("quantity"), output_field=MONEY)
+                ).values("value")
+            ),
+            ZERO,
+        )
+        items_count = Coalesce(
+            Subquery(lines.annotate(value=Sum("quantity")).values("value")), Value(0)
+        )
+        return self.update(subtotal=subtotal, total=subtotal, items_count=items_count)
 
 
 class OrderItemManager(models.Manager):
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_order_notes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="items_count",
+            field=models.PositiveIntegerField(default=0, verbose_name="Товаров"),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="subtotal",
+            field=models.DecimalField(
+                decimal_places=2, default=0, max_digits=12, verbose_name="Сумма позиций"
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="total",
+            field=models.DecimalField(
+                decimal_places=2, default=0, max_digits=12, verbose_name="Итого"
+            ),
+        ),
+    ]
@@ -8,7 +8,7 @@ from phonenumber_field.modelfields import PhoneNumberField
 
 from apps.cart.models import Cart
 from apps.catalog.models import Product
-from apps.orders.managers import OrderItemManager
+from apps.orders.managers import OrderItemManager, OrderQuerySet
 
 User = get_user_model()
 
@@ -42,21 +42,32 @@ class Order(models.Model):
         verbose_name="Статус заказа",
     )
     notes = models.TextField(null=True, blank=True, verbose_name="Заметки")
+    # Итоги хранятся в заказе (OrderService), чтобы списки их не агрегировали
+    subtotal = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Сумма позиций"
+    )
+    items_count = models.PositiveIntegerField(default=0, verbose_name="Товаров")
+    total = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, verbose_name="Итого"
+    )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлен")
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Заказ"
         verbose_name_plural = "Заказы"
+        indexes = [
+            # История заказов пользователя: keyset по (-created_at, -id)
+            models.Index(
+                fields=["user", "created_at", "id"], name="order_user_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Заказ #{self.id} - {self.get_status_display()}"
 
-    @property
-    def total(self):
-        """Общая стоимость заказа"""
-        return sum(item.total_price for item in self.items.all())
-
 
 class OrderItem(models.Model):
     """Товар в заказе"""
@@ -3,6 +3,7 @@ from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework import serializers
 
 from apps.cart.models import Cart
+from apps.cart.tokens import get_cart_token
 from apps.catalog.models import Product
 from apps.orders.models import Order, OrderItem
 
@@ -34,7 +35,12 @@ class OrderSerializer(serializers.ModelSerializer):
     """Сериализатор для получения заказа"""
 
     items = OrderItemSerializer(many=True, read_only=True)
-    total = serializers.SerializerMethodField()
+    subtotal = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    total = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
 
     class Meta:
         model = Order
@@ -46,6 +52,8 @@ class OrderSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
             "updated_at",
+            "subtotal",
+            "items_count",
             "total",
             "items",
         )
@@ -53,32 +61,83 @@ class OrderSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
             "updated_at",
+            "subtotal",
+            "items_count",
             "total",
             "items",
         )
 
-    @extend_schema_field({"type": "number", "format": "decimal"})
-    def get_total(self, obj):
-        return round(obj.total, 2)
+
+class OrderItemSummarySerializer(serializers.ModelSerializer):
+    """Позиция в краткой истории заказов"""
+
+    product_id = serializers.UUIDField(read_only=True)
+    name = serializers.CharField(source="product.name", read_only=True)
+    slug = serializers.CharField(source="product.slug", read_only=True)
+
+    class Meta:
+        model = OrderItem
+        fields = ("product_id", "name", "slug", "quantity", "price")
+
+
+class OrderSummarySerializer(serializers.ModelSerializer):
+    """Краткое представление заказа для истории (списка) заказов"""
+
+    items = OrderItemSummarySerializer(many=True, read_only=True)
+    total = serializers.DecimalField(
+        max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+
+    # Поля заказа и позиций, загружаемые для списка (QuerySet.only)
+    order_fields = ("id", "status", "created_at", "items_count", "total")
+    item_fields = (
+        "id",
+        "order_id",
+        "product_id",
+        "quantity",
+        "price",
+        "product__id",
+        "product__name",
+        "product__slug",
+    )
+
+    class Meta:
+        model = Order
+        fields = ("id", "status", "created_at", "items_count", "total", "items")
+        read_only_fields = fields
 
 
 class OrderCreateSerializer(serializers.Serializer):
     """Сериализатор для создания заказа"""
 
-    full_name = serializers.CharField(max_length=255)
-    phone = PhoneNumberField(region="RU")
+    full_name = serializers.CharField(max_length=255, required=False)
+    phone = PhoneNumberField(region="RU", required=False)
     email = serializers.EmailField(required=False)
 
+    # Обязательны для гостя; пользователю подставляются из профиля
+    contact_fields = ("full_name", "phone")
+
     def validate(self, data):
         """
-        Проверка наличия корзины и её содержимого
+        Контакты по умолчанию и проверка наличия корзины и её содержимого
         """
         request = self.context["request"]
         user = request.user if request.user.is_authenticated else None
-        session_key = request.session.session_key
+        session_key = get_cart_token(request)
+
+        if user is not None:
+            data = self.with_profile_defaults(data, user)
+        missing = {
+            name: self.fields[name].error_messages["required"]
+            for name in self.contact_fields
+            if not data.get(name)
+        }
+        if missing:
+            raise serializers.ValidationError(missing)
 
         cart = Cart.objects.filter(
-            user=user if user else None, session_key=session_key if not user else None
+            user_id=user.pk if user else None,
+            session_key=session_key if not user else None,
         ).first()
 
         if not cart:
@@ -91,6 +150,22 @@ class OrderCreateSerializer(serializers.Serializer):
 
         return data
 
+    @staticmethod
+    def with_profile_defaults(data, user):
+        """
+        Незаполненные контакты берутся из профиля. С JWT только здесь
+        request.user загружается из БД, и только если чего-то не хватает.
+        """
+        profile = {
+            "full_name": lambda: user.get_full_name().strip(),
+            "phone": lambda: user.phone,
+            "email": lambda: user.email,
+        }
+        for name, value in profile.items():
+            if not data.get(name):
+                data[name] = value()
+        return data
+
 
 class OrderUpdateSerializer(serializers.ModelSerializer):
     phone = PhoneNumberField(region="RU")
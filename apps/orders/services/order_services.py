@@ -1,8 +1,14 @@
+from decimal import Decimal
+
 from django.db import models, transaction
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
 from apps.cart.models import Cart
+from apps.cart.reservation_services import ReservationService
+from apps.catalog.cache import bump_catalog_version
 from apps.catalog.models import Product
+from apps.core.outbox import publish
 from apps.orders.models import Order, OrderItem
 
 
@@ -11,52 +17,90 @@ class OrderService:
     @transaction.atomic
     def create_order_from_cart(user=None, session_key=None, contact_data=None):
         """
-        Создает заказ из корзины с валидацией и обработкой транзакции
+        Создает заказ из корзины с валидацией и обработкой транзакции.
+
+        Товары корзины и её позиции блокируются (SELECT ... FOR UPDATE) в том
+        же порядке, что и при добавлении в корзину: сначала товары (в порядке
+        pk), затем позиции — так оформление и изменение корзины не блокируют
+        друг друга взаимно. Остатки списываются одним UPDATE с условием
+        stock >= qty. События для обработчиков "order.created" пишутся
+        в outbox в той же транзакции.
         """
-        cart = OrderService._get_valid_cart(user, session_key)
+        cart = OrderService._get_cart(user, session_key)
+        products = ReservationService.lock_products(cart.items.values("product_id"))
+        items = list(
+            cart.items.select_for_update(of=("self",)).with_totals().order_by("pk")
+        )
+        if not items:
+            raise ValidationError("Нельзя оформить заказ с пустой корзиной")
+        if any(item.product_id not in products for item in items if item.product_id):
+            # Товар добавлен в корзину между двумя блокировками
+            raise ValidationError("Корзина изменилась, повторите оформление заказа")
+
+        for item in items:
+            item.product = products.get(item.product_id)
+        available = ReservationService.available_stock(products.values(), cart.pk)
+        OrderService._validate_stock(items, available)
+
+        subtotal = sum((item.total_price for item in items), Decimal("0.00"))
         order = Order.objects.create(
-            user=user,
+            user_id=user.pk if user else None,
             cart=cart,
             full_name=contact_data["full_name"],
             phone=contact_data["phone"],
             email=contact_data.get("email"),
             status=Order.Status.NEW,
+            subtotal=subtotal,
+            items_count=sum(item.quantity for item in items),
+            total=subtotal,
         )
-        OrderItem.objects.bulk_create_from_cart(
-            order, cart.items.select_related("product")
-        )
+        OrderItem.objects.bulk_create_from_cart(order, items)
+        # Побочные эффекты (письма, CRM, аналитика) — через outbox, после коммита
+        publish("order.created", {"order_id": str(order.pk)})
 
-        # Обновление склада
-        for cart_item in cart.items.select_related("product"):
-            Product.objects.filter(pk=cart_item.product.pk).update(
-                stock=models.F("stock") - cart_item.quantity
-            )
+        quantities = {item.product_id: item.quantity for item in items}
+        if Product.objects.decrement_stock(quantities) != len(quantities):
+            raise ValidationError("Остатки изменились, повторите оформление заказа")
+        bump_catalog_version(Product)
+        ReservationService.release(cart.pk)
         cart.items.all().delete()
 
         return order
 
     @staticmethod
-    def _get_valid_cart(user, session_key):
-        """Валидация корзины перед созданием заказа"""
+    def _get_cart(user, session_key):
+        """Корзина пользователя или гостя"""
         if user:
-            cart = Cart.objects.filter(user=user).first()
+            cart = Cart.objects.filter(user_id=user.pk).first()
         else:
             cart = Cart.objects.filter(session_key=session_key).first()
 
         if not cart:
             raise ValidationError("Корзина не найдена")
+        return cart
 
-        if not cart.items.exists():
-            raise ValidationError("Нельзя оформить заказ с пустой корзиной")
-
-        for item in cart.items.select_related("product"):
-            if item.quantity > item.product.stock:
+    @staticmethod
+    def _validate_stock(items, available):
+        """Проверка остатков (за вычетом чужих резервов) по позициям корзины"""
+        for item in items:
+            if item.product is None:
+                raise ValidationError("В корзине есть товар, который был удалён")
+            stock = available[item.product.pk]
+            if item.quantity > stock:
                 raise ValidationError(
                     f"Недостаточно товара '{item.product.name}' на складе. "
-                    f"Доступно: {item.product.stock}, запрошено: {item.quantity}"
+                    f"Доступно: {max(stock, 0)}, запрошено: {item.quantity}"
                 )
 
-        return cart
+    @staticmethod
+    def recalculate_totals(order):
+        """
+        Пересчёт сохранённых итогов заказа после изменения позиций
+        (например, в админке). Отмена итоги не меняет: состав заказа остаётся.
+        """
+        Order.objects.filter(pk=order.pk).recalculate_totals()
+        order.refresh_from_db(fields=["subtotal", "items_count", "total"])
+        return order
 
     @staticmethod
     def cancel_order(order, reason=None):
@@ -70,8 +114,9 @@ class OrderService:
         with transaction.atomic():
             for item in order.items.select_related("product"):
                 Product.objects.filter(pk=item.product.pk).update(
-                    stock=models.F("stock") + item.quantity
+                    stock=models.F("stock") + item.quantity, updated_at=timezone.now()
                 )
+            bump_catalog_version(Product)
             order.status = Order.Status.CANCELLED
             if reason:
                 order.notes = f"Причина отмены: {reason}"
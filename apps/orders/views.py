@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -5,10 +6,15 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from apps.orders.models import Order
+from apps.cart.cart_services import CartService
+from apps.cart.tokens import get_cart_token
+from apps.core.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from apps.core.pagination import KeysetPagination
+from apps.orders.models import Order, OrderItem
 from apps.orders.serializers import (
     OrderCreateSerializer,
     OrderSerializer,
+    OrderSummarySerializer,
     OrderUpdateSerializer,
 )
 from apps.orders.services.order_services import OrderService
@@ -21,6 +27,7 @@ from apps.orders.services.order_services import OrderService
         "Для гостей требуется full_name, phone, email (опционально). "
         "Для аутентифицированных пользователей данные берутся из профиля, но могут быть переопределены.",
         request=OrderCreateSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={
             201: OpenApiResponse(
                 description="Заказ создан",
@@ -34,9 +41,10 @@ from apps.orders.services.order_services import OrderService
     ),
     list=extend_schema(
         summary="Получить список заказов",
-        description="Возвращает список заказов текущего аутентифицированного пользователя.",
+        description="Возвращает историю заказов текущего аутентифицированного пользователя "
+        "в кратком виде, от новых к старым, с курсорной пагинацией.",
         responses={
-            200: OrderSerializer(many=True),
+            200: OrderSummarySerializer(many=True),
             401: OpenApiResponse(description="Пользователь не аутентифицирован"),
         },
     ),
@@ -74,11 +82,12 @@ from apps.orders.services.order_services import OrderService
         },
     ),
 )
-class OrderViewSet(viewsets.ViewSet):
+class OrderViewSet(viewsets.GenericViewSet):
     """ViewSet для работы с заказами"""
 
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    pagination_class = KeysetPagination
 
     def get_permissions(self):
         """Разрешения для эндпоинтов"""
@@ -86,38 +95,66 @@ class OrderViewSet(viewsets.ViewSet):
             return [IsAuthenticated()]
         return [AllowAny()]
 
+    @staticmethod
+    def get_orders():
+        """Заказы с позициями и товарами: итоги уже сохранены в заказе"""
+        return Order.objects.prefetch_related(
+            Prefetch("items", queryset=OrderItem.objects.select_related("product"))
+        )
+
     def get_serializer_class(self):
         """Выбор сериализатора в зависимости от действия"""
         if self.action == "create":
             return OrderCreateSerializer
+        if self.action == "list":
+            return OrderSummarySerializer
         return OrderSerializer
 
+    @idempotent
     def create(self, request):
+        # Гостевая корзина из кэша записывается в БД только при оформлении
+        cart_service = CartService.for_request(request)
+        cart_service.materialize()
+
         serializer = OrderCreateSerializer(
             data=request.data, context={"request": request}
         )
         serializer.is_valid(raise_exception=True)
 
         user = request.user if request.user.is_authenticated else None
-        session_key = request.session.session_key
+        session_key = get_cart_token(request)
         contact_data = serializer.validated_data
 
         try:
             order = OrderService.create_order_from_cart(
                 user=user, session_key=session_key, contact_data=contact_data
             )
+            cart_service.clear()
             return Response({"id": str(order.id)}, status=status.HTTP_201_CREATED)
         except ValidationError as e:
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     def list(self, request):
-        orders = Order.objects.filter(user=request.user).select_related("user")
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        История заказов: keyset-пагинация по (-created_at, -id) по индексу
+        order_user_created_idx, только нужные для краткого вида поля.
+        """
+        items = OrderItem.objects.select_related("product").only(
+            *OrderSummarySerializer.item_fields
+        )
+        orders = (
+            Order.objects.filter(user_id=request.user.pk)
+            .only(*OrderSummarySerializer.order_fields)
+            .prefetch_related(Prefetch("items", queryset=items))
+            .order_by("-created_at")
+        )
+        page = self.paginate_queryset(orders)
+        serializer = OrderSummarySerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     def retrieve(self, request, pk=None):
         try:
-            order = Order.objects.get(pk=pk, user=request.user)
+            order = self.get_orders().get(pk=pk, user_id=request.user.pk)
             serializer = OrderSerializer(order)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Order.DoesNotExist:
@@ -157,12 +194,12 @@ class OrderViewSet(viewsets.ViewSet):
     )
     def edit(self, request, pk=None):
         try:
-            order = Order.objects.get(pk=pk)
+            order = self.get_orders().get(pk=pk)
         except Order.DoesNotExist:
             return Response({"detail": "Заказ не найден"}, status=404)
 
         user = request.user
-        if not (user.is_staff or order.user == user):
+        if not (user.is_staff or order.user_id == user.pk):
             return Response({"detail": "Нет доступа к заказу"}, status=403)
 
         serializer = OrderUpdateSerializer(order, data=request.data, partial=True)
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser as BaseTokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+
+class TokenUser(BaseTokenUser):
+    """
+    Пользователь из access-токена (JWTStatelessUserAuthentication).
+
+    id и is_staff берутся из claims, поэтому проверки прав обходятся без
+    запросов к БД. Поля профиля (email, phone, get_full_name() и т.п.)
+    при первом обращении загружают пользователя одним запросом.
+    """
+
+    @cached_property
+    def id(self):
+        # Claim — строка, а User.pk — UUID: сравнения с obj.user_id должны совпадать
+        return get_user_model()._meta.pk.to_python(
+            self.token[api_settings.USER_ID_CLAIM]
+        )
+
+    @cached_property
+    def user(self):
+        user = get_user_model().objects.filter(pk=self.id, is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed("Пользователь не найден или неактивен")
+        return user
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr == "token":
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.user, attr)
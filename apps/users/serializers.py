@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+
+def access_token_for(refresh, user):
+    """
+    access-токен с is_staff из текущих данных пользователя. В refresh-токене
+    is_staff нет: иначе он копировался бы в каждый новый access-токен
+    весь срок жизни refresh-токена.
+    """
+    access = refresh.access_token
+    access["is_staff"] = user.is_staff
+    return access
+
+
+class TokenObtainPairSerializer(TokenObtainSerializer):
+    """Пара токенов; is_staff в access-токене нужен для проверок прав без БД."""
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        refresh = self.get_token(self.user)
+        data["refresh"] = str(refresh)
+        data["access"] = str(access_token_for(refresh, self.user))
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+        return data
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Новый access-токен по refresh-токену. Пользователь перечитывается из БД:
+    снятие is_staff и блокировка действуют с ближайшего обновления.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        data = {"access": str(access_token_for(refresh, user))}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION and hasattr(refresh, "blacklist"):
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
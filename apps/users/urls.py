@@ -0,0 +1,10 @@
+from django.urls import path
+from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
+
+from apps.users.views import LoginView
+
+urlpatterns = [
+    path("login/", LoginView.as_view(), name="auth-login"),
+    path("refresh/", TokenRefreshView.as_view(), name="auth-refresh"),
+    path("verify/", TokenVerifyView.as_view(), name="auth-verify"),
+]
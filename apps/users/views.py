@@ -0,0 +1,32 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from apps.cart.cart_services import CartService
+from apps.users.serializers import TokenObtainPairSerializer
+
+
+class LoginView(TokenObtainPairView):
+    """
+    Вход по email и паролю: выдаёт access/refresh токены и, как вход
+    через сессию, переносит гостевую корзину в корзину пользователя.
+    """
+
+    serializer_class = TokenObtainPairSerializer
+
+    @extend_schema(
+        summary="Войти",
+        description="Возвращает access- и refresh-токены. Гостевая корзина "
+        "из текущей сессии объединяется с корзиной пользователя.",
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        CartService.merge_guest_cart(request, serializer.user)
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
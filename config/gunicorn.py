@@ -0,0 +1,25 @@
+"""
+Настройки gunicorn: gunicorn config.wsgi:application -c config/gunicorn.py
+
+Число соединений с БД зависит от workers и threads: по одному на поток
+(CONN_MAX_AGE) или пул размером GUNICORN_THREADS на процесс (DB_POOL),
+см. DATABASES в config/settings/base.py.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+
+# Перезапуск воркера после N запросов (со случайным разбросом, чтобы
+# воркеры не перезапускались одновременно) закрывает и его соединения
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+# Приложение загружается в каждом воркере после fork: соединения и пул
+# не наследуются от master-процесса
+preload_app = False
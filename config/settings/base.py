@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -31,6 +32,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "apps.users",
     "apps.catalog",
     "apps.orders",
@@ -43,6 +45,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.middleware.PrimaryPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -77,6 +80,22 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Соединения: постоянные (DB_CONN_MAX_AGE сек.) с проверкой перед повторным
+# использованием или, при DB_POOL=True, пул psycopg 3 в каждом процессе
+# gunicorn (CONN_MAX_AGE тогда 0 — соединение возвращается в пул после
+# запроса). Каждому потоку воркера нужно своё соединение, поэтому пул по
+# умолчанию размером GUNICORN_THREADS (config/gunicorn.py). Всего соединений
+# до GUNICORN_WORKERS * DB_POOL_MAX_SIZE — это должно быть меньше
+# max_connections PostgreSQL. Проверка: manage.py bench_db_connections.
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "1"))
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+DB_POOL_OPTIONS = {
+    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", str(GUNICORN_THREADS))),
+    # Ожидание свободного соединения (сек.), затем ошибка запроса
+    "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -85,9 +104,32 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pool": DB_POOL_OPTIONS} if DB_POOL else {},
     }
 }
 
+# Реплики для чтения каталога: DB_REPLICAS="host1:3,host2:1" (хост[:вес]),
+# остальные параметры — как у default. Для проверки локально можно указать
+# тот же сервер (DB_REPLICAS=localhost); в тестах реплики — зеркала default.
+DATABASE_REPLICAS = {}
+for number, replica in enumerate(
+    filter(None, os.getenv("DB_REPLICAS", "").split(",")), start=1
+):
+    host, _, weight = replica.strip().partition(":")
+    alias = f"replica{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS[alias] = int(weight or 1)
+DATABASE_ROUTERS = ["apps.core.db_router.ReplicaRouter"]
+# После записи (и изменения каталога) чтения идут в primary столько секунд —
+# больше, чем отстаёт реплика
+DATABASE_PIN_SECONDS = int(os.getenv("DB_PIN_SECONDS", "5"))
+
 AUTH_USER_MODEL = "users.User"
 
 # Password validation
@@ -133,21 +175,155 @@ MEDIA_URL = "/media/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Кэш: locmem по умолчанию (разработка, тесты), в проде — общий бэкенд,
+# например CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# и CACHE_LOCATION=redis://redis:6379/1
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+# Общий для всех воркеров кэш (не locmem/dummy одного процесса): без него
+# гостевые корзины в кэше и cached_db-сессии расходятся между воркерами
+SHARED_CACHE = CACHES["default"]["BACKEND"] not in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# Хранение сессий (SESSION_STRATEGY):
+# db — таблица django_session, чтение и запись на каждый запрос с сессией;
+# cached_db — общий кэш (CACHE_BACKEND, например Redis) с записью в БД,
+# с кэшем одного процесса (locmem) не работает — см. apps.core.sessions;
+# signed_cookies — данные в подписанной cookie, без БД (для API-клиентов;
+# сессию нельзя отозвать на сервере, данные видны клиенту).
+# Гостевая корзина привязана к токену в данных сессии (apps.cart.tokens),
+# а не к ключу сессии, поэтому работает с любым вариантом.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "apps.core.sessions",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_STRATEGY = os.getenv(
+    "SESSION_STRATEGY", "cached_db" if SHARED_CACHE else "db"
+)
+SESSION_ENGINE = SESSION_ENGINES[SESSION_STRATEGY]
+SESSION_CACHE_ALIAS = os.getenv("SESSION_CACHE_ALIAS", "default")
 SESSION_COOKIE_AGE = 3600
 
+# Хранилище гостевых корзин: кэш (строки в БД появляются только при
+# оформлении заказа или входе) — только с общим кэшем, иначе
+# apps.cart.storage.DatabaseCartStorage
+CART_GUEST_STORAGE = os.getenv(
+    "CART_GUEST_STORAGE",
+    (
+        "apps.cart.storage.CacheCartStorage"
+        if SHARED_CACHE
+        else "apps.cart.storage.DatabaseCartStorage"
+    ),
+)
+# Гостевая корзина живёт не дольше сессии, в которой хранится её токен
+CART_CACHE_TTL = int(os.getenv("CART_CACHE_TTL", str(SESSION_COOKIE_AGE)))
+# Гостевая корзина без изменений дольше этого срока (сек.) удаляется sweep_guest_data
+CART_GUEST_STALE_AFTER = int(
+    os.getenv("CART_GUEST_STALE_AFTER", str(60 * 60 * 24 * 7))
+)
+# Outbox: аренда события воркером, число попыток и задержка между ними (сек.)
+OUTBOX_LEASE = int(os.getenv("OUTBOX_LEASE", "300"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_BACKOFF_BASE = 5
+OUTBOX_BACKOFF_MAX = 60 * 60
+# Idempotency-Key: срок хранения ответа и блокировки выполняющегося запроса
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(60 * 60 * 24)))
+IDEMPOTENCY_LOCK_TIMEOUT = 30
+# Время резерва товара в корзине (секунды), продлевается при изменении позиции
+CART_RESERVATION_TTL = int(os.getenv("CART_RESERVATION_TTL", "900"))
+
 REST_FRAMEWORK = {
     "COERCE_DECIMAL_TO_STRING": True,
+    # orjson: вывод совпадает со стандартным JSONRenderer/JSONParser
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # JWT без запроса к БД: пользователь — apps.users.authentication.TokenUser;
+    # сессия остаётся для админки и browsable API
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.OrderingFilter",
         "rest_framework.filters.SearchFilter",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.ApproximateCountPagination",
     "PAGE_SIZE": 10,
 }
 
+# JWT (/api/v1/auth/): user_id и is_staff в claims access-токена. is_staff
+# и активность перечитываются из БД при обновлении (/refresh/), поэтому
+# снятие прав или блокировка действуют не дольше ACCESS_TOKEN_LIFETIME
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(
+        seconds=int(os.getenv("JWT_ACCESS_LIFETIME", str(60 * 15)))
+    ),
+    "REFRESH_TOKEN_LIFETIME": timedelta(
+        seconds=int(os.getenv("JWT_REFRESH_LIFETIME", str(60 * 60 * 24 * 7)))
+    ),
+    "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_USER_CLASS": "apps.users.authentication.TokenUser",
+    "TOKEN_OBTAIN_SERIALIZER": "apps.users.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.TokenRefreshSerializer",
+}
+
+# Поиск по каталогу: "fulltext" — PostgreSQL tsvector с ранжированием,
+# "basic" — стандартный SearchFilter (ILIKE по name, description, sku)
+CATALOG_SEARCH_BACKEND = os.getenv("CATALOG_SEARCH_BACKEND", "fulltext")
+CATALOG_SEARCH_CONFIG = "russian"
+# Порог word_similarity для нечёткого поиска (?search_mode=fuzzy)
+CATALOG_TRIGRAM_THRESHOLD = float(os.getenv("CATALOG_TRIGRAM_THRESHOLD", "0.5"))
+# Тот же порог для индексного оператора %> — параметром подключения ко всем
+# базам (default и реплики), без SET на каждый поиск
+for database in DATABASES.values():
+    if database["ENGINE"] == "django.db.backends.postgresql":
+        database["OPTIONS"] = {
+            **database["OPTIONS"],
+            "options": f"-c pg_trgm.word_similarity_threshold={CATALOG_TRIGRAM_THRESHOLD}",
+        }
+
+# Подсказки поиска (/api/v1/catalog/suggest/): индекс в памяти процесса,
+# ограниченный по числу ключей и перестраиваемый целиком раз в TTL секунд
+CATALOG_SUGGEST_MAX_ENTRIES = int(os.getenv("CATALOG_SUGGEST_MAX_ENTRIES", "200000"))
+CATALOG_SUGGEST_TTL = int(os.getenv("CATALOG_SUGGEST_TTL", "300"))
+
+# Кэш ответов каталога (list/retrieve), инвалидируется версиями моделей
+CATALOG_CACHE_ENABLED = os.getenv("CATALOG_CACHE_ENABLED", "True") == "True"
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", "600"))
+# Блокировка пересчёта после смены версии и максимальное ожидание без устаревшей копии
+CATALOG_CACHE_LOCK_TIMEOUT = 10
+CATALOG_CACHE_LOCK_WAIT = 2
+
+# Фасеты каталога (/api/v1/catalog/products/facets/)
+CATALOG_PRICE_BUCKETS = [0, 5000, 10000, 20000, 50000]
+CATALOG_DISCOUNT_BUCKETS = [(0, 0), (1, 10), (11, 30), (31, 100)]
+CATALOG_FACETS_CACHE_TTL = int(os.getenv("CATALOG_FACETS_CACHE_TTL", "600"))
+
+# Пагинация: выше порога возвращается оценка планировщика вместо COUNT(*),
+# точные значения кэшируются на короткое время
+PAGINATION_ESTIMATE_COUNT_THRESHOLD = int(
+    os.getenv("PAGINATION_ESTIMATE_COUNT_THRESHOLD", "10000")
+)
+PAGINATION_COUNT_CACHE_TTL = int(os.getenv("PAGINATION_COUNT_CACHE_TTL", "30"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Homestyle Mebel API",
     "DESCRIPTION": "E-commerce API for catalog, cart, and orders.",
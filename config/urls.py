@@ -13,6 +13,7 @@ urlpatterns = [
     # Админка
     path("admin/", admin.site.urls),
     # API v1
+    path("api/v1/auth/", include("apps.users.urls")),
     path("api/v1/catalog/", include("apps.catalog.urls")),
     path("api/v1/carts/", include("apps.cart.urls")),
     path("api/v1/orders/", include("apps.orders.urls")),
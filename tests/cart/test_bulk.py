@@ -0,0 +1,110 @@
+from decimal import Decimal
+
+import pytest
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from apps.cart.models import Cart, CartItem
+from apps.catalog.models import Product
+
+
+@pytest.fixture
+def products(category):
+    return [
+        Product.objects.create(
+            name=f"Товар {i}",
+            sku=f"BULK{i:03}",
+            price=Decimal("10.00") * (i + 1),
+            stock=10,
+            category=category,
+        )
+        for i in range(3)
+    ]
+
+
+def bulk(client, items):
+    return client.post(
+        reverse("carts-bulk-add"), {"items": items}, content_type="application/json"
+    )
+
+
+def payload(*pairs):
+    return [{"product_id": str(product.id), "quantity": q} for product, q in pairs]
+
+
+@pytest.fixture
+def user_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cached_db_sessions")
+def test_bulk_add_upserts_items(user_client, user, products, django_assert_num_queries):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=products[0], quantity=2)
+
+    items = payload(
+        (products[0], 3), (products[1], 1), (products[2], 4), (products[1], 1)
+    )
+    # Пользователь (сессия — из кэша, cached_db), корзина, текущие позиции,
+    # товары под блокировкой, резервы, upsert резервов и позиций (в savepoint),
+    # корзина с итогами и позиции — при любом числе товаров
+    with django_assert_num_queries(13):
+        response = bulk(user_client, items)
+    assert response.status_code == 200
+
+    quantities = dict(cart.items.values_list("product__sku", "quantity"))
+    assert quantities == {"BULK000": 5, "BULK001": 2, "BULK002": 4}
+    assert response.data["items_count"] == 11
+    assert response.data["total"] == "210.00"
+    assert len(response.data["items"]) == 3
+
+
+@pytest.mark.django_db
+def test_bulk_add_is_atomic(user_client, user, products):
+    response = bulk(user_client, payload((products[0], 1), (products[1], 11)))
+    assert response.status_code == 400
+    assert not CartItem.objects.filter(cart__user=user).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_add_unknown_product(user_client, products):
+    items = payload((products[0], 1)) + [
+        {"product_id": "00000000-0000-0000-0000-000000000000", "quantity": 1}
+    ]
+    response = bulk(user_client, items)
+    assert response.status_code == 400
+    assert "00000000-0000-0000-0000-000000000000" in str(response.data)
+
+
+@pytest.mark.django_db
+def test_bulk_add_validates_payload(user_client):
+    assert bulk(user_client, []).status_code == 400
+    response = bulk(user_client, [{"product_id": "x", "quantity": 0}])
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+def test_bulk_add_guest_cache_cart(products):
+    client = Client()
+    assert bulk(client, payload((products[0], 2))).status_code == 200
+    response = bulk(client, payload((products[0], 1), (products[2], 1)))
+    assert response.status_code == 200
+    assert response.data["items_count"] == 4
+    assert not Cart.objects.exists()
+
+
+@pytest.mark.django_db
+@override_settings(CART_GUEST_STORAGE="apps.cart.storage.DatabaseCartStorage")
+def test_bulk_add_guest_database_cart(products):
+    client = Client()
+    bulk(client, payload((products[0], 2)))
+    response = bulk(client, payload((products[0], 1), (products[1], 3)))
+    assert response.status_code == 200
+    assert dict(Cart.objects.get().items.values_list("product__sku", "quantity")) == {
+        "BULK000": 3,
+        "BULK001": 3,
+    }
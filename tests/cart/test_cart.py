@@ -1,16 +1,10 @@
 import pytest
-from django.test import Client
 from django.urls import reverse
 from rest_framework import status
 
 from apps.cart.models import Cart, CartItem
 
 
-@pytest.fixture
-def client():
-    return Client()
-
-
 @pytest.mark.django_db
 class TestCartViewSet:
     def test_retrieve_empty_cart(self, client, user):
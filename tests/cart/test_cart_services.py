@@ -44,7 +44,7 @@ class TestCartService:
     def test_get_or_create_cart_anon(self, anon_request):
         cart = CartService.get_or_create_cart(anon_request)
         assert cart.user is None
-        assert cart.session_key == anon_request.session.session_key
+        assert cart.session_key == anon_request.session["cart_token"]
 
     def test_add_item_new(self, user, product):
         cart = Cart.objects.create(user=user)
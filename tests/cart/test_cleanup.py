@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.cart.cleanup_services import CleanupService
+from apps.cart.models import Cart, CartItem, StockReservation
+from apps.orders.models import Order
+
+
+def live_session():
+    session = SessionStore()
+    session.create()
+    return session.session_key
+
+
+def expired_session():
+    session_key = live_session()
+    Session.objects.filter(session_key=session_key).update(
+        expire_date=timezone.now() - timedelta(minutes=1)
+    )
+    return session_key
+
+
+def guest_cart(product, session_key, age=None):
+    cart = Cart.objects.create(session_key=session_key)
+    CartItem.objects.create(cart=cart, product=product, quantity=1)
+    StockReservation.objects.create(
+        cart_id=cart.pk,
+        product=product,
+        quantity=1,
+        expires_at=timezone.now() + timedelta(minutes=15),
+    )
+    if age:
+        Cart.objects.filter(pk=cart.pk).update(updated_at=timezone.now() - age)
+    return cart
+
+
+@pytest.mark.django_db
+def test_expired_sessions_are_deleted_in_batches():
+    expired = [expired_session() for _ in range(5)]
+    alive = live_session()
+
+    batches = list(CleanupService.sweep_sessions(batch_size=2))
+
+    assert batches == [2, 2, 1]
+    assert list(Session.objects.values_list("session_key", flat=True)) == [alive]
+    assert not Session.objects.filter(session_key__in=expired).exists()
+
+
+@pytest.mark.django_db
+def test_stale_guest_carts(user, product):
+    active = guest_cart(product, "a" * 32)
+    orphaned = guest_cart(product, "x" * 32, age=timedelta(days=8))
+    abandoned = guest_cart(product, "z" * 32, age=timedelta(days=30))
+    ordered = guest_cart(product, "y" * 32, age=timedelta(days=8))
+    Order.objects.create(cart=ordered, full_name="Гость", phone="+79991112233")
+    own = Cart.objects.create(user=user)
+    Cart.objects.filter(pk=own.pk).update(
+        updated_at=timezone.now() - timedelta(days=30)
+    )
+
+    assert sum(CleanupService.sweep_guest_carts(batch_size=1)) == 2
+
+    assert set(Cart.objects.values_list("pk", flat=True)) == {
+        active.pk,
+        ordered.pk,
+        own.pk,
+    }
+    assert not CartItem.objects.filter(cart_id__in=[orphaned.pk, abandoned.pk]).exists()
+    assert not StockReservation.objects.filter(
+        cart_id__in=[orphaned.pk, abandoned.pk]
+    ).exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "engine",
+    [
+        "django.contrib.sessions.backends.cache",
+        "django.contrib.sessions.backends.signed_cookies",
+    ],
+)
+def test_sessions_outside_db_are_not_swept(engine):
+    expired_session()
+    with override_settings(SESSION_ENGINE=engine):
+        assert list(CleanupService.sweep_sessions()) == []
+    assert Session.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_command_reports_progress_and_rate(product, capsys):
+    for _ in range(3):
+        expired_session()
+    guest_cart(product, "x" * 32, age=timedelta(days=8))
+
+    call_command("sweep_guest_data", "--batch-size", "2")
+
+    out = capsys.readouterr().out
+    assert "sessions: batch 2, deleted 1 (total 3," in out
+    assert "Deleted 3 sessions in" in out
+    assert "Deleted 1 guest carts in" in out
+    assert "rows/s" in out
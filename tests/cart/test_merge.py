@@ -0,0 +1,164 @@
+from datetime import timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.cart.models import Cart, CartItem, StockReservation
+from apps.catalog.models import Product
+from apps.orders.models import Order
+from tests.conftest import add
+
+DATABASE_STORAGE = "apps.cart.storage.DatabaseCartStorage"
+CACHE_STORAGE = "apps.cart.storage.CacheCartStorage"
+
+
+@pytest.fixture
+def chair(category):
+    return Product.objects.create(
+        name="Стул", sku="SKU002", price=Decimal("15.00"), stock=10, category=category
+    )
+
+
+def quantities(cart):
+    return dict(cart.items.values_list("product__sku", "quantity"))
+
+
+@pytest.mark.django_db
+def test_merge_into_sums_and_clamps_to_stock(user, product, chair):
+    guest = Cart.objects.create(session_key="a" * 32)
+    CartItem.objects.create(cart=guest, product=product, quantity=4)
+    CartItem.objects.create(cart=guest, product=chair, quantity=2)
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=3)
+
+    assert CartItem.objects.filter(cart=guest).merge_into(cart.pk) == 2
+
+    # 4 + 3 ограничено остатком 5
+    assert quantities(cart) == {"SKU001": 5, "SKU002": 2}
+    assert quantities(guest) == {"SKU001": 4, "SKU002": 2}
+
+
+@pytest.mark.django_db
+def test_merge_into_clamps_to_other_reservations(user, product):
+    StockReservation.objects.create(
+        cart_id=uuid4(),
+        product=product,
+        quantity=3,
+        expires_at=timezone.now() + timedelta(minutes=5),
+    )
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=1)
+
+    CartItem.objects.merge_into(cart.pk, {product.pk: 4})
+
+    # Из 5 на складе 3 зарезервированы другой корзиной
+    assert quantities(cart) == {"SKU001": 2}
+
+
+@pytest.mark.django_db
+def test_merge_into_skips_sold_out_and_deleted(user, product, chair):
+    chair.stock = 0
+    chair.save()
+    cart = Cart.objects.create(user=user)
+
+    CartItem.objects.merge_into(cart.pk, {product.pk: 1, chair.pk: 1, Product().pk: 1})
+
+    assert quantities(cart) == {"SKU001": 1}
+
+
+@pytest.mark.django_db
+def test_merge_is_a_single_statement(user, product, chair, django_assert_num_queries):
+    cart = Cart.objects.create(user=user)
+    with django_assert_num_queries(1):
+        CartItem.objects.merge_into(cart.pk, {product.pk: 1, chair.pk: 3})
+    assert quantities(cart) == {"SKU001": 1, "SKU002": 3}
+
+
+@pytest.mark.django_db
+@override_settings(CART_GUEST_STORAGE=DATABASE_STORAGE)
+def test_login_merges_database_guest_cart(client, user, product, chair):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=1)
+    add(client, product, 2)
+    add(client, chair, 1)
+    guest = Cart.objects.get(user__isnull=True)
+
+    client.force_login(user)
+
+    assert quantities(cart) == {"SKU001": 3, "SKU002": 1}
+    assert not Cart.objects.filter(pk=guest.pk).exists()
+    assert set(StockReservation.objects.values_list("cart_id", flat=True)) == {cart.pk}
+    assert "cart_id" not in client.session
+
+    response = client.get(reverse("carts-get-current-cart"))
+    assert response.data["items_count"] == 4
+
+
+@pytest.mark.django_db
+@override_settings(CART_GUEST_STORAGE=DATABASE_STORAGE)
+def test_login_creates_user_cart_from_guest(client, user, product):
+    add(client, product, 2)
+
+    client.force_login(user)
+
+    cart = Cart.objects.get()
+    assert cart.user == user
+    assert quantities(cart) == {"SKU001": 2}
+
+
+@pytest.mark.django_db
+@override_settings(CART_GUEST_STORAGE=DATABASE_STORAGE)
+def test_login_keeps_guest_cart_with_order(client, user, product):
+    add(client, product, 1)
+    guest = Cart.objects.get()
+    Order.objects.create(cart=guest, full_name="Гость", phone="+79991112233")
+
+    client.force_login(user)
+
+    assert Cart.objects.filter(pk=guest.pk).exists()
+    assert quantities(Cart.objects.get(user=user)) == {"SKU001": 1}
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("shared_cache")
+def test_login_merges_cached_guest_cart_with_clamp(client, user, product):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=4)
+    add(client, product, 1)
+
+    # Остаток изменился после добавления в гостевую корзину
+    Product.objects.filter(pk=product.pk).update(stock=4)
+    client.force_login(user)
+
+    assert quantities(cart) == {"SKU001": 4}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("storage", [CACHE_STORAGE, DATABASE_STORAGE])
+def test_login_does_not_revive_expired_hold(request, client, user, product, storage):
+    if storage == CACHE_STORAGE:
+        request.getfixturevalue("shared_cache")
+    with override_settings(CART_GUEST_STORAGE=storage):
+        add(client, product, 4)
+        StockReservation.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        # Истёкший резерв гостя не мешает другой корзине
+        other = Cart.objects.create(session_key="b" * 32)
+        StockReservation.objects.create(
+            cart_id=other.pk,
+            product=product,
+            quantity=3,
+            expires_at=timezone.now() + timedelta(minutes=5),
+        )
+
+        client.force_login(user)
+
+    cart = Cart.objects.get(user=user)
+    assert quantities(cart) == {"SKU001": 2}
+    holds = StockReservation.objects.active()
+    assert dict(holds.values_list("cart_id", "quantity")) == {other.pk: 3}
@@ -1,22 +1,14 @@
 import pytest
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.sessions.middleware import SessionMiddleware
-from django.contrib.sessions.models import Session
 from django.test import RequestFactory
-from django.utils import timezone
 from rest_framework.request import Request
-from rest_framework.test import APIClient
 from rest_framework.views import APIView
 
 from apps.cart.models import Cart, CartItem
 from apps.cart.permissions import IsCartAccessAllowed
 
 
-@pytest.fixture
-def api_client():
-    return APIClient()
-
-
 @pytest.fixture
 def cart(user):
     return Cart.objects.create(user=user)
@@ -71,10 +63,13 @@ class TestIsCartAccessAllowed:
         view.action = "update_item"
         assert permission.has_permission(request, view) is True
 
-    def test_has_permission_update_anon_with_session(self, anon_request):
+    def test_has_permission_update_anon_with_cart_token(self, anon_request):
         permission = IsCartAccessAllowed()
         view = APIView()
         view.action = "update_item"
+        # Сессия без корзины не даёт доступа, токен корзины — даёт
+        assert permission.has_permission(anon_request, view) is False
+        anon_request.session["cart_token"] = "a" * 32
         assert permission.has_permission(anon_request, view) is True
 
     def test_has_permission_update_anon_no_session(self):
@@ -111,21 +106,13 @@ class TestIsCartAccessAllowed:
         cart_item.cart.user = user
         assert permission.has_object_permission(request, None, cart_item) is False
 
-    def test_has_object_permission_anon_with_session(self, anon_cart):
+    def test_has_object_permission_anon_with_cart_token(self, anon_cart):
         factory = RequestFactory()
         request = factory.get("/")
         middleware = SessionMiddleware(lambda x: None)
         middleware.process_request(request)
-        request.session["test"] = "data"  # Добавляем данные в сессию
-        request.session.save()
-        # Создаём сессию с нужным session_key
-        session_data = request.session._session  # Получаем словарь сессии
-        session = Session.objects.create(
-            session_key=anon_cart.session_key,
-            session_data=request.session.encode(session_data),  # Передаём session_data
-            expire_date=timezone.now() + timezone.timedelta(days=14),
-        )
-        request.session = request.session.__class__(session.session_key)
+        # Владелец гостевой корзины — по токену в данных сессии
+        request.session["cart_token"] = anon_cart.session_key
         request.user = AnonymousUser()
         cart_item = anon_cart.items.first()
         permission = IsCartAccessAllowed()
@@ -0,0 +1,230 @@
+import re
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError as DRFValidationError
+
+from apps.cart.cart_services import CartService
+from apps.cart.models import Cart, CartItem, StockReservation
+from apps.cart.reservation_services import ReservationService
+from apps.catalog.models import Product
+from apps.orders.models import Order
+from apps.orders.services.order_services import OrderService
+from tests.conftest import UserFactory
+
+CONTACTS = {"full_name": "Иван", "phone": "+79990001122"}
+
+
+def user_service():
+    return CartService(Cart.objects.create(user=UserFactory.create()))
+
+
+@pytest.mark.django_db
+def test_add_item_reserves_stock(product):
+    first, second = user_service(), user_service()
+    first.add_item(product.id, 3)
+
+    hold = StockReservation.objects.get(cart_id=first.cart.pk)
+    assert hold.quantity == 3
+    assert hold.expires_at > timezone.now()
+    with pytest.raises(ValidationError, match="В наличии: 2"):
+        second.add_item(product.id, 3)
+    second.add_item(product.id, 2)
+
+
+@pytest.mark.django_db
+def test_update_and_remove_adjust_reservation(product):
+    service = user_service()
+    item = service.add_item(product.id, 2)
+    service.update_item(item.id, 4)
+    assert StockReservation.objects.get().quantity == 4
+
+    service.remove_item(item.id)
+    assert not StockReservation.objects.exists()
+
+
+@pytest.mark.django_db
+def test_expired_reservations_are_ignored_and_swept(product):
+    StockReservation.objects.create(
+        cart_id=uuid4(),
+        product=product,
+        quantity=product.stock,
+        expires_at=timezone.now() - timedelta(seconds=1),
+    )
+    assert ReservationService.available_stock([product]) == {product.pk: 5}
+    user_service().add_item(product.id, 5)
+
+    call_command("release_expired_reservations", batch_size=1)
+    assert StockReservation.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_guest_reservation_blocks_users(product):
+    client = Client()
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 4},
+        content_type="application/json",
+    )
+    with pytest.raises(ValidationError):
+        user_service().add_item(product.id, 2)
+
+
+@pytest.mark.django_db
+def test_checkout_respects_other_reservations(product):
+    owner, other = user_service(), user_service()
+    owner.add_item(product.id, 3)
+    CartItem.objects.create(cart=other.cart, product=product, quantity=3)
+
+    with pytest.raises(DRFValidationError, match="Доступно: 2"):
+        OrderService.create_order_from_cart(user=other.cart.user, contact_data=CONTACTS)
+
+    OrderService.create_order_from_cart(user=owner.cart.user, contact_data=CONTACTS)
+    product.refresh_from_db()
+    assert product.stock == 2
+    assert not StockReservation.objects.exists()
+
+
+@pytest.mark.django_db
+def test_guest_checkout_releases_reservations(product):
+    client = Client()
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 2},
+        content_type="application/json",
+    )
+    cart_id = StockReservation.objects.get().cart_id
+
+    response = client.post(
+        reverse("orders-list"), CONTACTS, content_type="application/json"
+    )
+    assert response.status_code == 201
+    assert Order.objects.get().cart_id == cart_id
+    assert not StockReservation.objects.exists()
+
+
+@pytest.mark.django_db
+def test_login_transfers_reservations(user, product):
+    cart = Cart.objects.create(user=user)
+    CartService(cart).add_item(product.id, 1)
+    client = Client()
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 2},
+        content_type="application/json",
+    )
+
+    client.force_login(user)
+    hold = StockReservation.objects.get()
+    assert (hold.cart_id, hold.quantity) == (cart.pk, 3)
+
+
+@pytest.mark.django_db
+def test_transfer_clamps_to_available_stock(product):
+    guest, cart, other = uuid4(), uuid4(), uuid4()
+    expires_at = timezone.now() + timedelta(minutes=5)
+    StockReservation.objects.bulk_create(
+        [
+            StockReservation(
+                cart_id=guest, product=product, quantity=2, expires_at=expires_at
+            ),
+            StockReservation(
+                cart_id=cart, product=product, quantity=2, expires_at=expires_at
+            ),
+        ]
+    )
+    # Другая корзина заняла остаток после того, как резерв гостя был создан
+    StockReservation.objects.create(
+        cart_id=other, product=product, quantity=2, expires_at=expires_at
+    )
+
+    ReservationService.transfer(guest, cart)
+
+    assert dict(StockReservation.objects.values_list("cart_id", "quantity")) == {
+        cart: 3,
+        other: 2,
+    }
+
+
+def locked_tables(queries):
+    """Таблицы в порядке первой блокировки строк (FOR UPDATE или запись)."""
+    tables = []
+    for query in queries:
+        sql = query["sql"]
+        write = re.match(r'(?:INSERT INTO|UPDATE|DELETE FROM) "(\w+)"', sql)
+        if write:
+            table = write.group(1)
+        elif "FOR UPDATE OF" in sql:
+            table = re.search(r'FOR UPDATE OF \(?"(\w+)"', sql).group(1)
+        elif "FOR UPDATE" in sql:
+            table = re.search(r'FROM "(\w+)"', sql).group(1)
+        else:
+            continue
+        if table not in tables:
+            tables.append(table)
+    return tables
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("operation", ["add", "add_items", "update", "checkout"])
+def test_products_are_locked_before_cart_items(product, operation):
+    service = user_service()
+    item = service.add_item(product.id, 1)
+    with CaptureQueriesContext(connection) as queries:
+        if operation == "add":
+            service.add_item(product.id, 1)
+        elif operation == "add_items":
+            service.add_items([{"product_id": product.pk, "quantity": 1}])
+        elif operation == "update":
+            service.update_item(item.id, 2)
+        else:
+            OrderService.create_order_from_cart(
+                user=service.cart.user, contact_data=CONTACTS
+            )
+
+    tables = locked_tables(queries.captured_queries)
+    # Тот же порядок, что при оформлении заказа, — без взаимных блокировок
+    assert tables.index("catalog_product") < tables.index("cart_cartitem")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reservations_do_not_oversell(category):
+    product = Product.objects.create(
+        name="Хит продаж",
+        sku="HOT-1",
+        price=Decimal("100.00"),
+        stock=10,
+        category=category,
+    )
+    services = [user_service() for _ in range(30)]
+    results = []
+    barrier = threading.Barrier(len(services))
+
+    def reserve(service):
+        barrier.wait()
+        try:
+            service.add_item(product.id, 1)
+            results.append(True)
+        except ValidationError:
+            results.append(False)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=reserve, args=(s,)) for s in services]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 10
+    assert sum(StockReservation.objects.values_list("quantity", flat=True)) == 10
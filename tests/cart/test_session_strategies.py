@@ -0,0 +1,86 @@
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.cart.models import Cart
+from apps.orders.models import Order
+from tests.conftest import add
+
+CONTACTS = {"full_name": "Гость", "phone": "+79991112233"}
+STRATEGIES = list(settings.SESSION_ENGINES.items())
+
+
+@pytest.fixture(params=STRATEGIES, ids=[name for name, _ in STRATEGIES])
+def engine(request):
+    if request.param[0] == "cached_db":
+        request.getfixturevalue("shared_cache")
+    with override_settings(SESSION_ENGINE=request.param[1]):
+        yield request.param[0]
+
+
+@pytest.fixture(
+    params=[
+        "apps.cart.storage.CacheCartStorage",
+        "apps.cart.storage.DatabaseCartStorage",
+    ],
+    ids=["cache", "database"],
+)
+def guest_storage(request):
+    if request.param.endswith("CacheCartStorage"):
+        request.getfixturevalue("shared_cache")
+    with override_settings(CART_GUEST_STORAGE=request.param):
+        yield
+
+
+@pytest.mark.django_db
+def test_guest_checkout_with_any_engine(engine, guest_storage, product):
+    client = Client()
+    assert add(client, product, 2).status_code == 201
+
+    item = client.get(reverse("carts-get-current-cart")).data["items"][0]
+    response = client.patch(
+        reverse("carts-update-item", kwargs={"pk": item["id"]}),
+        {"quantity": 3},
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+
+    response = client.post(
+        reverse("orders-list"), CONTACTS, content_type="application/json"
+    )
+    assert response.status_code == 201
+    assert Order.objects.get().items.get().quantity == 3
+
+
+@pytest.mark.django_db
+def test_login_merge_with_any_engine(engine, guest_storage, user, product):
+    client = Client()
+    add(client, product, 2)
+
+    client.force_login(user)
+
+    assert Cart.objects.get(user=user).items.get().quantity == 2
+
+
+@pytest.mark.django_db
+@override_settings(SESSION_ENGINE=settings.SESSION_ENGINES["signed_cookies"])
+def test_signed_cookies_do_not_touch_session_table(product):
+    client = Client()
+    with CaptureQueriesContext(connection) as captured:
+        add(client, product)
+        client.get(reverse("carts-get-current-cart"))
+
+    assert not [q for q in captured.captured_queries if "django_session" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_bench_sessions_command(product, capsys):
+    call_command("bench_sessions", "--rounds", "1", "--host", "testserver")
+
+    out = capsys.readouterr().out
+    assert "signed_cookies: 0.00 запросов к django_session" in out
+    assert "db: " in out and "cached_db: " in out
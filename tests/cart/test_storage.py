@@ -0,0 +1,138 @@
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.cart.models import Cart, CartItem
+from apps.cart.storage import BaseCartStorage
+from apps.orders.models import Order
+from tests.conftest import add
+
+CONTACTS = {"full_name": "Гость", "phone": "+79991112233"}
+
+pytestmark = pytest.mark.usefixtures("shared_cache")
+
+
+@pytest.mark.django_db
+def test_guest_browsing_does_not_write(client):
+    response = client.get(reverse("carts-list"))
+    assert response.status_code == 200
+    assert response.data == []
+    assert not Session.objects.exists()
+    assert not Cart.objects.exists()
+
+
+@pytest.mark.django_db
+def test_guest_cart_lives_in_cache(client, product):
+    assert add(client, product, 2).status_code == 201
+    response = add(client, product, 1)
+    assert response.data["quantity"] == 3
+    assert not Cart.objects.exists()
+
+    detail = client.get(reverse("carts-get-current-cart")).data
+    (item,) = detail["items"]
+    assert item["product"]["sku"] == product.sku
+    assert detail["total"] == str(product.actual_price * 3)
+    assert detail["items_count"] == 3
+    assert client.get(reverse("carts-list")).data[0]["id"] == item["id"]
+
+    response = client.patch(
+        reverse("carts-update-item", kwargs={"pk": item["id"]}),
+        {"quantity": 4},
+        content_type="application/json",
+    )
+    assert response.data["quantity"] == 4
+
+    response = client.delete(reverse("carts-remove", kwargs={"pk": item["id"]}))
+    assert response.status_code == 204
+    assert client.get(reverse("carts-list")).data == []
+    assert not CartItem.objects.exists()
+
+
+@pytest.mark.django_db
+def test_guest_stock_is_validated(client, product):
+    response = add(client, product, product.stock + 1)
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_unknown_item_returns_404(client, product):
+    add(client, product)
+    response = client.delete(
+        reverse("carts-remove", kwargs={"pk": "00000000-0000-0000-0000-000000000000"})
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_checkout_materializes_guest_cart(client, product):
+    add(client, product, 2)
+    response = client.post(
+        reverse("orders-list"), CONTACTS, content_type="application/json"
+    )
+    assert response.status_code == 201
+
+    order = Order.objects.get(pk=response.data["id"])
+    assert order.items.get().quantity == 2
+    assert order.cart.user is None
+    assert order.cart.session_key is not None
+    # Токен корзины после оформления сбрасывается — следующая корзина новая
+    assert "cart_token" not in client.session
+    assert client.get(reverse("carts-list")).data == []
+
+
+@pytest.mark.django_db
+def test_failed_checkout_keeps_guest_cart(client, product):
+    add(client, product, 2)
+    product.stock = 1
+    product.save()
+    response = client.post(
+        reverse("orders-list"), CONTACTS, content_type="application/json"
+    )
+    assert response.status_code == 400
+    assert client.get(reverse("carts-list")).data[0]["quantity"] == 2
+
+
+@pytest.mark.django_db
+def test_login_merges_guest_cart(client, user, product):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=1)
+    add(client, product, 2)
+
+    client.force_login(user)
+    assert cart.items.get().quantity == 3
+    assert "cart_token" not in client.session
+
+
+@pytest.mark.django_db
+@override_settings(CART_GUEST_STORAGE="apps.cart.storage.DatabaseCartStorage")
+def test_database_storage_for_guests(client, product):
+    add(client, product, 2)
+    cart = Cart.objects.get()
+    assert cart.session_key == client.session["cart_token"]
+    assert cart.items.get().quantity == 2
+
+
+def test_incomplete_storage_cannot_be_created():
+    class ReadOnlyStorage(BaseCartStorage):
+        cart = None
+
+        def get_items(self):
+            return []
+
+        def get_detail(self):
+            return None
+
+    with pytest.raises(TypeError, match="add_item"):
+        ReadOnlyStorage()
+
+
+@pytest.mark.django_db
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    CART_GUEST_STORAGE="apps.cart.storage.CacheCartStorage",
+)
+def test_cache_storage_requires_shared_cache(client, product):
+    with pytest.raises(ImproperlyConfigured, match="общий кэш"):
+        add(client, product)
@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from apps.cart.cart_services import CartService
+from apps.cart.models import Cart, CartItem
+from apps.orders.services.order_services import OrderService
+from tests.conftest import make_products
+
+
+@pytest.fixture
+def cart(user, category):
+    cart = Cart.objects.create(user=user)
+    products = make_products(category, 4, stock=100)
+    products[3].available_for_order = False
+    products[3].save()
+    for quantity, product in enumerate(products, start=1):
+        CartItem.objects.create(cart=cart, product=product, quantity=quantity)
+    CartItem.objects.create(cart=cart, product=None, quantity=2)
+    return cart
+
+
+def python_total(cart):
+    items = CartItem.objects.filter(cart=cart).select_related("product")
+    return sum(
+        (
+            (
+                (item.product.actual_price * item.quantity)
+                if item.product and item.product.available_for_order
+                else Decimal("0.00")
+            )
+            for item in items
+        ),
+        Decimal("0.00"),
+    )
+
+
+@pytest.mark.django_db
+def test_annotated_totals_match_python(cart):
+    annotated = Cart.objects.with_totals().get(pk=cart.pk)
+    assert annotated.total == python_total(cart)
+    assert annotated.items_count == 1 + 2 + 3 + 4 + 2
+    assert annotated.lines_count == 5
+
+    for item in CartService(cart).get_items():
+        expected = (
+            item.product.actual_price * item.quantity
+            if item.product and item.product.available_for_order
+            else Decimal("0.00")
+        )
+        assert item.total_price == expected
+
+
+@pytest.mark.django_db
+def test_total_without_annotation_is_one_query(cart, django_assert_num_queries):
+    expected = python_total(cart)
+    cart = Cart.objects.get(pk=cart.pk)
+    with django_assert_num_queries(1):
+        assert cart.total == expected
+    assert CartService(cart).total() == cart.total
+
+
+@pytest.mark.django_db
+def test_empty_cart_totals(user):
+    cart = Cart.objects.with_totals().get(pk=Cart.objects.create(user=user).pk)
+    assert cart.total == Decimal("0.00")
+    assert cart.items_count == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cached_db_sessions")
+@pytest.mark.parametrize("lines", [1, 20])
+def test_cart_detail_query_count_is_fixed(
+    user, category, lines, django_assert_num_queries
+):
+    cart = Cart.objects.create(user=user)
+    for product in make_products(category, lines, stock=100):
+        CartItem.objects.create(cart=cart, product=product, quantity=2)
+
+    client = Client()
+    client.force_login(user)
+    # пользователь (сессия — из кэша), корзина, корзина с итогами, позиции с товарами
+    with django_assert_num_queries(4):
+        response = client.get(reverse("carts-get-current-cart"))
+    assert response.status_code == 200
+    assert len(response.data["items"]) == lines
+    assert response.data["items_count"] == 2 * lines
+
+
+@pytest.mark.django_db
+def test_admin_changelist_uses_annotation(admin_client, cart):
+    response = admin_client.get(reverse("admin:cart_cart_changelist"))
+    assert response.status_code == 200
+    (row,) = response.context["cl"].result_list
+    assert row.subtotal == python_total(cart)
+
+
+@pytest.mark.django_db
+def test_checkout_uses_sql_prices(user, cart):
+    CartItem.objects.filter(cart=cart, product=None).delete()
+    expected = python_total(cart)
+    order = OrderService.create_order_from_cart(
+        user=user,
+        contact_data={"full_name": "Иван", "phone": "+79990001122"},
+    )
+    assert order.items.count() == 4
+    assert order.total == expected
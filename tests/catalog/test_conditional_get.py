@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.catalog.models import ProductExtraImage
+
+PRODUCTS_URL = "/api/v1/catalog/products/"
+CATEGORIES_URL = "/api/v1/catalog/categories/"
+
+
+@pytest.mark.django_db
+def test_validators_are_set(api_client, product):
+    for url in (
+        PRODUCTS_URL,
+        f"{PRODUCTS_URL}{product.slug}/",
+        CATEGORIES_URL,
+        f"{CATEGORIES_URL}{product.category.slug}/",
+    ):
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response["ETag"].startswith('"')
+        assert "Last-Modified" in response
+        assert "Accept" in response["Vary"]
+
+
+@pytest.mark.django_db
+def test_list_if_none_match_returns_304_without_queries(
+    api_client, product, django_assert_num_queries
+):
+    etag = api_client.get(PRODUCTS_URL)["ETag"]
+    with django_assert_num_queries(0):
+        response = api_client.get(PRODUCTS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_list_etag_depends_on_query(api_client, product):
+    etag = api_client.get(PRODUCTS_URL)["ETag"]
+    response = api_client.get(
+        PRODUCTS_URL, {"ordering": "sku"}, HTTP_IF_NONE_MATCH=etag
+    )
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_detail_if_none_match_uses_one_query(
+    api_client, product, django_assert_num_queries
+):
+    url = f"{PRODUCTS_URL}{product.slug}/"
+    etag = api_client.get(url)["ETag"]
+    with django_assert_num_queries(1):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_detail_etag_changes_with_product_category_and_images(api_client, product):
+    url = f"{PRODUCTS_URL}{product.slug}/"
+    etags = {api_client.get(url)["ETag"]}
+
+    product.price = Decimal("250.00")
+    product.save()
+    etags.add(api_client.get(url)["ETag"])
+
+    product.category.description = "Новое описание"
+    product.category.save()
+    etags.add(api_client.get(url)["ETag"])
+
+    ProductExtraImage.objects.create(product=product, image="products/extra.jpg")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=", ".join(etags))
+    assert response.status_code == 200
+    etags.add(response["ETag"])
+    assert len(etags) == 4
+
+
+@pytest.mark.django_db
+def test_list_etag_changes_after_write(api_client, product):
+    etag = api_client.get(PRODUCTS_URL)["ETag"]
+    product.stock = 0
+    product.save()
+    response = api_client.get(PRODUCTS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_if_modified_since(api_client, product):
+    url = f"{CATEGORIES_URL}{product.category.slug}/"
+    last_modified = api_client.get(url)["Last-Modified"]
+    response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db
+def test_missing_object_returns_404(api_client):
+    response = api_client.get(f"{PRODUCTS_URL}missing/")
+    assert response.status_code == 404
+    assert "ETag" not in response
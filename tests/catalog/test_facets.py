@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.catalog.models import Category, Product
+
+FACETS_URL = "/api/v1/catalog/products/facets/"
+
+
+@pytest.fixture
+def catalog(category):
+    chairs = Category.objects.create(name="Стулья")
+    specs = [
+        ("SKU-1", category, "3000", 0, 5),
+        ("SKU-2", category, "7000", 5, 0),
+        ("SKU-3", chairs, "12000", 20, 2),
+        ("SKU-4", chairs, "60000", 50, 1),
+    ]
+    return [
+        Product.objects.create(
+            name=f"Товар {sku}",
+            sku=sku,
+            price=Decimal(price),
+            discount=discount,
+            stock=stock,
+            category=cat,
+        )
+        for sku, cat, price, discount, stock in specs
+    ]
+
+
+def _counts(facet):
+    return {item["value"]: item["count"] for item in facet}
+
+
+@pytest.mark.django_db
+def test_facets_are_computed_in_one_query(client, catalog, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = client.get(FACETS_URL)
+    data = response.json()
+
+    assert data["count"] == 4
+    assert _counts(data["category"]) == {"stolyi": 2, "stulya": 2}
+    assert _counts(data["availability_status"]) == {
+        "in_stock": 3,
+        "backorder": 1,
+        "unavailable": 0,
+    }
+    assert _counts(data["discount"]) == {"0-0": 1, "1-10": 1, "11-30": 1, "31-100": 1}
+    assert _counts(data["price"]) == {
+        "0-5000": 1,
+        "5000-10000": 1,
+        "10000-20000": 1,
+        "20000-50000": 0,
+        "50000+": 1,
+    }
+
+
+@pytest.mark.django_db
+def test_facets_follow_current_filters(client, catalog):
+    data = client.get(FACETS_URL, {"category": "stulya"}).json()
+    assert data["count"] == 2
+    assert _counts(data["category"]) == {"stulya": 2}
+
+
+@pytest.mark.django_db
+def test_facets_are_cached_until_catalog_changes(
+    client, catalog, django_assert_num_queries
+):
+    client.get(FACETS_URL)
+    with django_assert_num_queries(0):
+        assert client.get(FACETS_URL).json()["count"] == 4
+
+    product = catalog[0]
+    product.price = Decimal("25000")
+    product.save()
+    data = client.get(FACETS_URL).json()
+    assert _counts(data["price"])["20000-50000"] == 1
+
+
+@pytest.mark.django_db
+def test_facets_with_in_stock_filter(client, catalog):
+    data = client.get(FACETS_URL, {"in_stock": "true"}).json()
+    assert data["count"] == 3
@@ -0,0 +1,111 @@
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from apps.cart.models import Cart, CartItem
+from apps.catalog.models import ProductExtraImage
+from apps.orders.services.order_services import OrderService
+
+PRODUCTS_URL = "/api/v1/catalog/products/"
+CATEGORIES_URL = "/api/v1/catalog/categories/"
+
+
+@pytest.mark.django_db
+def test_list_and_detail_are_served_from_cache(
+    api_client, product, django_assert_num_queries
+):
+    # Для объекта ETag требует одного запроса updated_at
+    detail_url = f"{PRODUCTS_URL}{product.slug}/"
+    for url, queries in ((PRODUCTS_URL, 0), (detail_url, 1), (CATEGORIES_URL, 0)):
+        assert api_client.get(url)["X-Cache"] == "MISS"
+        with django_assert_num_queries(queries):
+            response = api_client.get(url)
+        assert response["X-Cache"] == "HIT"
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_query_string_is_normalized(api_client, product):
+    api_client.get(PRODUCTS_URL, {"ordering": "sku", "limit": 5})
+    response = api_client.get(f"{PRODUCTS_URL}?limit=5&ordering=sku")
+    assert response["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+def test_product_save_invalidates(api_client, product):
+    api_client.get(PRODUCTS_URL)
+    product.price = Decimal("250.00")
+    product.save()
+
+    response = api_client.get(PRODUCTS_URL)
+    assert response["X-Cache"] == "MISS"
+    assert response.data["results"][0]["price"] == "250.00"
+
+
+@pytest.mark.django_db
+def test_category_change_invalidates_product_detail(api_client, product):
+    url = f"{PRODUCTS_URL}{product.slug}/"
+    api_client.get(url)
+    product.category.description = "Новое описание"
+    product.category.save()
+
+    response = api_client.get(url)
+    assert response["X-Cache"] == "MISS"
+    assert response.data["category"]["description"] == "Новое описание"
+
+
+@pytest.mark.django_db
+def test_extra_image_invalidates_product_detail(api_client, product, django_test_image):
+    url = f"{PRODUCTS_URL}{product.slug}/"
+    api_client.get(url)
+    ProductExtraImage.objects.create(
+        product=product, image=django_test_image, ordering=1
+    )
+    response = api_client.get(url)
+    assert len(response.data["extra_images"]) == 1
+
+
+@pytest.mark.django_db
+def test_stock_update_in_checkout_invalidates(api_client, product, user):
+    api_client.get(PRODUCTS_URL)
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=2)
+    OrderService.create_order_from_cart(
+        user=user,
+        contact_data={"full_name": "Иван", "phone": "+79990000000"},
+    )
+
+    response = api_client.get(PRODUCTS_URL)
+    assert response.data["results"][0]["stock"] == 3
+
+
+@pytest.mark.django_db
+def test_not_found_is_not_cached(api_client, product):
+    api_client.get(f"{PRODUCTS_URL}missing/")
+    response = api_client.get(f"{PRODUCTS_URL}missing/")
+    assert response.status_code == 404
+    assert not response.has_header("X-Cache")
+
+
+@pytest.mark.django_db
+@override_settings(CATALOG_CACHE_LOCK_WAIT=0)
+def test_concurrent_miss_gets_stale_copy(
+    api_client, product, mocker, django_assert_num_queries
+):
+    api_client.get(CATEGORIES_URL)
+    product.category.save()
+
+    # Пока другой запрос пересчитывает ответ, отдаётся последняя копия
+    mocker.patch.object(cache, "add", return_value=False)
+    with django_assert_num_queries(0):
+        response = api_client.get(CATEGORIES_URL)
+    assert response["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db
+@override_settings(CATALOG_CACHE_ENABLED=False)
+def test_cache_can_be_disabled(api_client, product):
+    api_client.get(PRODUCTS_URL)
+    assert "X-Cache" not in api_client.get(PRODUCTS_URL)
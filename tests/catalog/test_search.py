@@ -0,0 +1,142 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.catalog.models import Product
+from apps.catalog.serializers import ProductListValuesSerializer
+from apps.catalog.services.product_services import ProductServices
+from apps.catalog.services.search_services import ProductSearchService
+
+PRODUCTS_URL = "/api/v1/catalog/products/"
+
+
+def _skus(response):
+    data = response.data
+    if isinstance(data, dict) and "results" in data:
+        data = data["results"]
+    return [item["sku"] for item in data]
+
+
+@pytest.fixture
+def sofa(category):
+    return Product.objects.create(
+        name="Диван угловой",
+        sku="SKU-0101",
+        price=Decimal("45000.00"),
+        stock=5,
+        category=category,
+        description="Подходит к обеденному столу",
+    )
+
+
+@pytest.mark.django_db
+@override_settings(CATALOG_SEARCH_BACKEND="basic")
+def test_basic_backend_uses_icontains(client, product, sofa):
+    response = client.get(PRODUCTS_URL, {"search": "углов"})
+    assert response.status_code == 200
+    assert _skus(response) == ["SKU-0101"]
+
+
+@pytest.mark.django_db
+def test_fulltext_matches_word_forms(client, product, sofa):
+    response = client.get(PRODUCTS_URL, {"search": "угловые диваны"})
+    assert _skus(response) == ["SKU-0101"]
+
+
+@pytest.mark.django_db
+def test_fulltext_ranks_name_above_description(client, product, sofa):
+    response = client.get(PRODUCTS_URL, {"search": "обеденный"})
+    assert _skus(response) == [product.sku, sofa.sku]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("search_mode", ["fulltext", "fuzzy"])
+def test_search_pages_have_no_gaps_or_duplicates(client, category, search_mode):
+    # Ранги различаются в последних знаках float4 — курсор должен их сохранить
+    skus = []
+    for i in range(12):
+        product = Product.objects.create(
+            name=f"Стул обеденный {'мягкий ' * (i % 4)}{i}",
+            sku=f"CHAIR-{i:02d}",
+            price=Decimal("100.00"),
+            stock=1,
+            category=category,
+            description="стул " * i,
+        )
+        skus.append(product.sku)
+
+    seen, url = [], PRODUCTS_URL
+    params = {"search": "стул", "search_mode": search_mode, "limit": 2}
+    while url:
+        response = client.get(url, params if not seen else None)
+        assert response.status_code == 200
+        seen += _skus(response)
+        url = response.data["next"]
+    assert sorted(seen) == skus
+
+
+@pytest.mark.django_db
+def test_fulltext_matches_sku(client, product, sofa):
+    response = client.get(PRODUCTS_URL, {"search": "SKU-0101"})
+    assert _skus(response) == ["SKU-0101"]
+
+
+@pytest.mark.django_db
+def test_refresh_search_vectors_after_bulk_update(client, product):
+    Product.objects.filter(pk=product.pk).update(name="Комод")
+    ProductServices.refresh_search_vectors(Product.objects.filter(pk=product.pk))
+
+    response = client.get(PRODUCTS_URL, {"search": "комод"})
+    assert _skus(response) == [product.sku]
+
+
+@pytest.mark.django_db
+def test_fuzzy_tolerates_typos(client, product, sofa):
+    response = client.get(
+        PRODUCTS_URL, {"search": "дивн угловй", "search_mode": "fuzzy"}
+    )
+    assert _skus(response) == ["SKU-0101"]
+
+
+@pytest.mark.django_db
+def test_fuzzy_rows_have_rank_without_similarities(product, sofa):
+    queryset = ProductSearchService.fuzzy(Product.objects.all(), "дивн")
+    (row,) = ProductListValuesSerializer().prepare_queryset(queryset)
+    assert row["sku"] == sofa.sku
+    assert isinstance(row["search_rank"], float)
+    assert "name_similarity" not in row
+
+
+@pytest.mark.django_db
+def test_fuzzy_matches_partial_sku(client, product, sofa):
+    response = client.get(PRODUCTS_URL, {"search": "0101", "search_mode": "fuzzy"})
+    assert _skus(response) == ["SKU-0101"]
+
+
+@pytest.mark.django_db
+def test_fuzzy_combines_with_product_filter(client, product, sofa):
+    response = client.get(
+        PRODUCTS_URL,
+        {"search": "дивн", "search_mode": "fuzzy", "max_price": "1000"},
+    )
+    assert _skus(response) == []
+
+
+@pytest.mark.django_db
+def test_fuzzy_threshold_is_part_of_query(client, product, sofa):
+    params = {"search": "дивн угловй", "search_mode": "fuzzy", "count": "false"}
+    with override_settings(CATALOG_TRIGRAM_THRESHOLD=0.99, CATALOG_CACHE_ENABLED=False):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(PRODUCTS_URL, params)
+    assert _skus(response) == []
+    assert not [q for q in captured.captured_queries if "set_config" in q["sql"]]
+
+
+@pytest.mark.django_db
+@override_settings(CATALOG_SEARCH_BACKEND="basic")
+def test_unknown_search_mode_uses_default(client, product, sofa):
+    response = client.get(PRODUCTS_URL, {"search": "углов", "search_mode": "regex"})
+    assert _skus(response) == ["SKU-0101"]
@@ -0,0 +1,165 @@
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from apps.catalog.models import Product
+from apps.catalog.services.suggest_services import (
+    PRODUCT,
+    REBUILD_LOCK_KEY,
+    SuggestIndex,
+    suggest_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    suggest_index.clear()
+    yield
+    suggest_index.clear()
+
+
+@pytest.fixture
+def sofa(category):
+    return Product.objects.create(
+        name="Диван угловой",
+        sku="SKU-0101",
+        price=Decimal("45000.00"),
+        stock=5,
+        category=category,
+    )
+
+
+def _build(**kwargs):
+    index = SuggestIndex(**kwargs)
+    index.rebuild(
+        categories=[(1, "Столы", "stolyi")],
+        products=[
+            (10, "Стол обеденный", "SKU001", "stol-obedennyij-sku001"),
+            (11, "Диван угловой", "SKU-0101", "divan-uglovoj-sku-0101"),
+        ],
+    )
+    return index
+
+
+def test_suggest_by_name_prefix_lists_categories_first():
+    results = _build().suggest("Сто")
+    assert [(r["type"], r["name"]) for r in results] == [
+        ("category", "Столы"),
+        ("product", "Стол обеденный"),
+    ]
+
+
+def test_suggest_by_inner_word_and_sku_part():
+    index = _build()
+    assert [r["sku"] for r in index.suggest("угл")] == ["SKU-0101"]
+    assert [r["sku"] for r in index.suggest("0101")] == ["SKU-0101"]
+
+
+def test_suggest_respects_limit():
+    assert len(_build().suggest("с", limit=1)) == 1
+
+
+def test_index_is_capped():
+    index = _build(max_entries=3)
+    assert len(index) <= 3
+    assert index.suggest("диван") == []
+
+
+def test_remove_drops_all_keys():
+    index = _build()
+    index.remove("product", 11)
+    assert index.suggest("угл") == []
+    assert index.suggest("диван") == []
+
+
+@pytest.mark.django_db
+def test_signals_update_built_index(product, django_capture_on_commit_callbacks):
+    suggest_index.rebuild()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.name = "Комод"
+        product.save()
+        # До коммита индекс не меняется
+        assert suggest_index.suggest("ком") == []
+    assert [r["name"] for r in suggest_index.suggest("ком")] == ["Комод"]
+    assert suggest_index.suggest("стол о") == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        product.delete()
+    assert suggest_index.suggest("ком") == []
+
+
+@pytest.mark.django_db
+def test_rolled_back_save_does_not_change_index(product):
+    suggest_index.rebuild()
+    name = product.name
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        product.name = "Комод"
+        product.save()
+        raise RuntimeError
+
+    assert suggest_index.suggest("ком") == []
+    assert [r["name"] for r in suggest_index.suggest("стол о")] == [name]
+
+
+class SlowIndex(SuggestIndex):
+    """Сборка ждёт сигнала, чтобы проверить поведение во время перестройки."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        if self.loads > 1:
+            self.release.wait(5)
+        return [], [(11, f"Диван {self.loads}", "SKU-0101", "divan")]
+
+
+def test_stale_index_is_served_during_single_rebuild():
+    index = SlowIndex(ttl=0)
+    index.ensure_built()
+    assert [r["name"] for r in index.suggest("диван")] == ["Диван 1"]
+
+    time.sleep(0.01)
+    threads = [threading.Thread(target=index.ensure_built) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(1)
+
+    # Запросы не ждут перестройку и получают старый индекс
+    assert [r["name"] for r in index.suggest("диван")] == ["Диван 1"]
+    index.remove(PRODUCT, 12)
+    index.add_product(
+        Product(id=12, name="Диван новый", sku="SKU-0202", slug="divan-novyj")
+    )
+
+    index.release.set()
+    deadline = time.monotonic() + 5
+    while cache.get(REBUILD_LOCK_KEY) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert index.loads == 2
+    # Изменение, пришедшее во время сборки, не потерялось при подмене
+    assert sorted(r["name"] for r in index.suggest("диван")) == [
+        "Диван 2",
+        "Диван новый",
+    ]
+
+
+@pytest.mark.django_db
+def test_suggest_view_does_not_query_db(client, sofa, django_assert_num_queries):
+    suggest_index.rebuild()
+    with django_assert_num_queries(0):
+        response = client.get(reverse("catalog-suggest"), {"q": "диван"})
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"type": "product", "name": sofa.name, "slug": sofa.slug, "sku": sofa.sku}
+    ]
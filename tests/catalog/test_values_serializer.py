@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+import pytest
+from django.db.models import F
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.catalog.models import Product
+from apps.catalog.serializers import ProductListSerializer, ProductListValuesSerializer
+from apps.catalog.views import ProductViewSet
+
+PRODUCTS_URL = "/api/v1/catalog/products/"
+
+
+@pytest.fixture
+def products(category):
+    Product.objects.create(
+        name="Стул", sku="SKU002", price=Decimal("1999.9"), discount=33, stock=0
+    )
+    Product.objects.create(
+        name="Шкаф",
+        sku="SKU003",
+        price=Decimal("12345.67"),
+        stock=2,
+        category=category,
+        main_image="",
+    )
+    Product.objects.create(
+        name="Кровать",
+        sku="SKU004",
+        price=Decimal("0"),
+        stock=1,
+        category=category,
+        main_image="catalog/products/main/кровать 1.png",
+    )
+    return Product.objects.select_related("category").order_by("sku")
+
+
+@pytest.mark.django_db
+def test_output_is_byte_identical(products):
+    request = APIRequestFactory().get(PRODUCTS_URL, secure=True)
+    context = {"request": request}
+    renderer = JSONRenderer()
+    values_serializer = ProductListValuesSerializer(context=context)
+
+    expected = renderer.render(
+        ProductListSerializer(products, many=True, context=context).data
+    )
+    actual = renderer.render(
+        values_serializer.to_representation(
+            values_serializer.prepare_queryset(products)
+        )
+    )
+    assert actual == expected
+
+
+@pytest.mark.django_db
+def test_aliases_are_not_selected(products):
+    queryset = (
+        products.alias(markup=F("price") - F("_actual_price"))
+        .filter(markup__gte=0)
+        .annotate(rank=F("stock"))
+    )
+    rows = ProductListValuesSerializer().prepare_queryset(queryset)
+    row = rows[0]
+    assert row["rank"] == row["stock"]
+    assert "markup" not in row
+
+
+@pytest.mark.django_db
+def test_list_endpoint_matches_model_serializer(products, monkeypatch):
+    client = APIClient()
+    params = {"ordering": "-price", "limit": 2}
+    monkeypatch.setattr("django.conf.settings.CATALOG_CACHE_ENABLED", False)
+    fast = client.get(PRODUCTS_URL, params)
+    fast_next = client.get(fast.data["next"])
+
+    monkeypatch.setattr(ProductViewSet, "values_serializer_class", None)
+    regular = client.get(PRODUCTS_URL, params)
+    regular_next = client.get(regular.data["next"])
+
+    assert fast.content == regular.content
+    assert fast_next.content == regular_next.content
+
+
+@pytest.mark.django_db
+def test_values_list_uses_single_query(products, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = APIClient().get(PRODUCTS_URL)
+    assert len(response.data["results"]) == 3
@@ -4,9 +4,14 @@ from decimal import Decimal
 import factory
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
 from faker import Faker
 from PIL import Image
+from rest_framework.test import APIClient
 
 from apps.catalog.models import Category, Product, ProductExtraImage
 
@@ -15,6 +20,77 @@ fake = Faker()
 User = get_user_model()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def requires_postgres():
+    """Проект работает только на PostgreSQL: блокировки строк, поиск, сырой SQL."""
+    if connection.vendor != "postgresql":
+        pytest.fail(
+            f"Тесты запускаются только на PostgreSQL, настроено: {connection.vendor}",
+            pytrace=False,
+        )
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш (locmem) живёт дольше транзакции теста — очищаем его между тестами."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def shared_cache(tmp_path):
+    """
+    Общий для процессов кэш (файловый, как Redis в проде) и гостевые
+    корзины в нём — CacheCartStorage не работает с locmem.
+    """
+    caches = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    }
+    with override_settings(
+        CACHES=caches, CART_GUEST_STORAGE="apps.cart.storage.CacheCartStorage"
+    ):
+        yield
+
+
+@pytest.fixture
+def cached_db_sessions(shared_cache, settings):
+    """Сессии cached_db поверх общего кэша — как в проде с Redis."""
+    settings.SESSION_ENGINE = settings.SESSION_ENGINES["cached_db"]
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def add(client, product, quantity=1):
+    """Добавить товар в корзину через API."""
+    return client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": quantity},
+        content_type="application/json",
+    )
+
+
+def make_products(category, count, stock=10):
+    """Товары с разными ценами и скидками."""
+    return [
+        Product.objects.create(
+            name=f"Товар {i}",
+            sku=f"ITEM{i:03}",
+            price=Decimal("99.99") + i,
+            discount=i * 7 % 50,
+            stock=stock,
+            category=category,
+        )
+        for i in range(count)
+    ]
+
+
 @pytest.fixture
 def category():
     return Category.objects.create(name=" Столы ")
@@ -0,0 +1,31 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("threads", ["1", "3"])
+def test_bench_db_connections_command(threads, capsys):
+    max_age = connection.settings_dict["CONN_MAX_AGE"]
+
+    call_command(
+        "bench_db_connections",
+        "--requests",
+        "20",
+        "--threads",
+        threads,
+        "--host",
+        "testserver",
+    )
+
+    out = capsys.readouterr().out
+    assert "no persistence (CONN_MAX_AGE=0):" in out
+    assert f"configured (CONN_MAX_AGE={max_age}):" in out
+    assert "соединений на 1000 запросов" in out
+    assert connection.settings_dict["CONN_MAX_AGE"] == max_age
+
+
+@pytest.mark.django_db
+def test_bench_db_connections_refuses_transaction():
+    with pytest.raises(CommandError):
+        call_command("bench_db_connections", "--requests", "1")
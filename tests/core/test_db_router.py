@@ -0,0 +1,115 @@
+import time
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.cart.models import Cart
+from apps.catalog.cache import MODIFIED_KEY
+from apps.catalog.models import Category, Product
+from apps.core.db_router import (
+    ReplicaRouter,
+    WeightedRoundRobin,
+    is_pinned,
+    pin_primary,
+    replica_reads,
+    routing_scope,
+)
+from apps.core.middleware import PIN_COOKIE
+
+REPLICAS = {"replica1": 2, "replica2": 1}
+
+
+def test_weighted_round_robin_is_smooth():
+    balancer = WeightedRoundRobin({"a": 2, "b": 1, "off": 0})
+
+    picks = [balancer.next() for _ in range(6)]
+
+    assert picks == ["a", "b", "a", "a", "b", "a"]
+    assert WeightedRoundRobin({}).next() is None
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+def test_catalog_reads_go_to_replicas_only_in_scope():
+    router = ReplicaRouter()
+    with routing_scope():
+        assert router.db_for_read(Product) is None
+        with replica_reads():
+            picks = [router.db_for_read(Product) for _ in range(3)]
+            assert router.db_for_read(Cart) is None
+    assert picks == ["replica1", "replica2", "replica1"]
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+def test_write_pins_request_to_primary():
+    router = ReplicaRouter()
+    with routing_scope(), replica_reads():
+        assert router.db_for_read(Category) == "replica1"
+        assert router.db_for_write(Category) == "default"
+        assert is_pinned()
+        assert router.db_for_read(Category) is None
+    with routing_scope():
+        assert not is_pinned()
+
+
+@pytest.mark.django_db
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+def test_reads_in_transaction_stay_on_primary():
+    router = ReplicaRouter()
+    with routing_scope(), replica_reads():
+        with transaction.atomic():
+            assert router.db_for_read(Product) is None
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+def test_replicas_are_not_migrated():
+    router = ReplicaRouter()
+    assert router.allow_migrate("replica1", "catalog") is False
+    assert router.allow_migrate("default", "catalog") is None
+
+
+@pytest.mark.django_db
+def test_unsafe_request_sets_pin_cookie(client, product):
+    response = client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 1},
+        content_type="application/json",
+    )
+    assert response.cookies[PIN_COOKIE]["max-age"] == settings.DATABASE_PIN_SECONDS
+
+    response = client.get(reverse("category-list"))
+    assert PIN_COOKIE not in response.cookies
+
+
+def test_pin_primary_is_reset_between_requests():
+    with routing_scope():
+        with routing_scope():
+            pin_primary()
+            assert is_pinned()
+        assert not is_pinned()
+
+
+replica_required = pytest.mark.skipif(
+    not settings.DATABASE_REPLICAS, reason="нужен DB_REPLICAS (зеркало default)"
+)
+
+
+@replica_required
+@pytest.mark.django_db(transaction=True, databases="__all__")
+def test_catalog_get_reads_from_replica(client, category):
+    alias = next(iter(settings.DATABASE_REPLICAS))
+    # Каталог изменён давно — иначе чтения идут в primary
+    cache.set(MODIFIED_KEY.format("catalog.category"), int(time.time()) - 60)
+
+    with CaptureQueriesContext(connections[alias]) as replica:
+        assert client.get(reverse("category-list")).status_code == 200
+    assert replica.captured_queries
+
+    client.cookies[PIN_COOKIE] = "1"
+    with CaptureQueriesContext(connections[alias]) as replica:
+        assert client.get(reverse("category-list") + "?x=1").status_code == 200
+    assert not replica.captured_queries
@@ -0,0 +1,141 @@
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+from apps.cart.models import Cart, CartItem
+from apps.orders.models import Order
+from tests.conftest import UserFactory
+
+CONTACTS = {"full_name": "Иван", "phone": "+79990001122"}
+
+
+@pytest.fixture
+def user_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def post(client, name, data, key):
+    return client.post(
+        reverse(name), data, content_type="application/json", HTTP_IDEMPOTENCY_KEY=key
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cached_db_sessions")
+def test_order_replay_returns_stored_response(
+    user_client, user, product, django_assert_num_queries
+):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=2)
+
+    first = post(user_client, "orders-list", CONTACTS, "order-1")
+    assert first.status_code == 201
+
+    # Повтор: только пользователь (сессия — из кэша), доменные таблицы не трогаются
+    with django_assert_num_queries(1):
+        replay = post(user_client, "orders-list", CONTACTS, "order-1")
+    assert replay.status_code == 201
+    assert replay["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+    assert Order.objects.count() == 1
+    product.refresh_from_db()
+    assert product.stock == 3
+
+
+@pytest.mark.django_db
+def test_key_reused_with_other_body_is_rejected(user_client, product):
+    data = {"product_id": str(product.id), "quantity": 1}
+    assert post(user_client, "carts-add", data, "add-1").status_code == 201
+
+    response = post(user_client, "carts-add", {**data, "quantity": 2}, "add-1")
+    assert response.status_code == 422
+    assert CartItem.objects.get().quantity == 1
+
+
+@pytest.mark.django_db
+def test_cart_add_replay_does_not_duplicate(user_client, product):
+    data = {"product_id": str(product.id), "quantity": 1}
+    for _ in range(3):
+        post(user_client, "carts-add", data, "add-1")
+    assert CartItem.objects.get().quantity == 1
+
+    post(user_client, "carts-add", data, "add-2")
+    assert CartItem.objects.get().quantity == 2
+
+
+@pytest.mark.django_db
+def test_keys_are_scoped_per_user(user_client, product):
+    other = Client()
+    other.force_login(UserFactory())
+    data = {"product_id": str(product.id), "quantity": 1}
+
+    post(user_client, "carts-add", data, "same")
+    response = post(other, "carts-add", data, "same")
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response
+    assert CartItem.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_failed_request_is_not_stored(user_client, product):
+    data = {"product_id": str(product.id), "quantity": 50}
+    assert post(user_client, "carts-add", data, "add-1").status_code == 400
+
+    product.stock = 100
+    product.save()
+    assert post(user_client, "carts-add", data, "add-1").status_code == 201
+
+
+@pytest.mark.django_db
+def test_in_flight_key_conflicts(user_client, user, product):
+    cache.add(f"idempotency:user:{user.pk}:busy:lock", 1)
+    data = {"product_id": str(product.id), "quantity": 1}
+    assert post(user_client, "carts-add", data, "busy").status_code == 409
+    assert not CartItem.objects.exists()
+
+
+@pytest.mark.django_db
+def test_without_header_behaves_as_before(user_client, product):
+    data = {"product_id": str(product.id), "quantity": 1}
+    user_client.post(reverse("carts-add"), data, content_type="application/json")
+    user_client.post(reverse("carts-add"), data, content_type="application/json")
+    assert CartItem.objects.get().quantity == 2
+
+
+def guest_with_cart(product):
+    client = Client()
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 1},
+        content_type="application/json",
+    )
+    return client
+
+
+@pytest.mark.django_db
+def test_guest_order_replay_after_checkout(product):
+    client = guest_with_cart(product)
+
+    first = post(client, "orders-list", CONTACTS, "guest-order")
+    assert first.status_code == 201
+
+    # Токен корзины уже сброшен, но ответ находится по id гостя
+    replay = post(client, "orders-list", CONTACTS, "guest-order")
+    assert replay.status_code == 201
+    assert replay["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+    assert Order.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_guests_do_not_share_keys(product):
+    first = post(guest_with_cart(product), "orders-list", CONTACTS, "same-key")
+    second = post(guest_with_cart(product), "orders-list", CONTACTS, "same-key")
+
+    assert second.status_code == 201
+    assert "Idempotent-Replayed" not in second
+    assert second.json() != first.json()
+    assert Order.objects.count() == 2
@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from apps.cart.models import Cart, CartItem
+from apps.core import outbox
+from apps.core.models import OutboxEvent
+from apps.core.outbox import OutboxService, publish
+from apps.orders.services.order_services import OrderService
+
+CONTACTS = {"full_name": "Иван", "phone": "+79990001122"}
+
+
+@pytest.fixture
+def calls():
+    """Регистрирует тестовые обработчики order.created на время теста."""
+    received = []
+
+    @outbox.handler("order.created")
+    def remember(payload):
+        received.append(payload)
+
+    @outbox.handler("order.created")
+    def explode(payload):
+        raise RuntimeError("CRM недоступна")
+
+    yield received
+    outbox._handlers.pop("order.created")
+
+
+def checkout(user, product, quantity=1):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=quantity)
+    return OrderService.create_order_from_cart(user=user, contact_data=CONTACTS)
+
+
+@pytest.mark.django_db
+def test_checkout_writes_event_per_handler(calls, user, product):
+    order = checkout(user, product)
+
+    events = OutboxEvent.objects.order_by("handler")
+    assert [event.handler.rsplit(".", 1)[-1] for event in events] == [
+        "explode",
+        "remember",
+    ]
+    assert all(event.payload == {"order_id": str(order.pk)} for event in events)
+    assert calls == []
+
+
+@pytest.mark.django_db
+def test_failed_checkout_writes_no_events(calls, user, product):
+    with pytest.raises(ValidationError):
+        checkout(user, product, quantity=100)
+    assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db
+def test_without_handlers_nothing_is_written(user, product):
+    checkout(user, product)
+    assert not OutboxEvent.objects.exists()
+
+
+@pytest.mark.django_db
+def test_process_batch_completes_and_retries(calls, user, product):
+    order = checkout(user, product)
+
+    assert OutboxService.process_batch() == 2
+    assert calls == [{"order_id": str(order.pk)}]
+
+    done = OutboxEvent.objects.get(handler__endswith="remember")
+    assert done.status == OutboxEvent.Status.DONE
+    assert done.processed_at is not None
+
+    retry = OutboxEvent.objects.get(handler__endswith="explode")
+    assert retry.status == OutboxEvent.Status.PENDING
+    assert retry.attempts == 1
+    assert retry.last_error == "RuntimeError: CRM недоступна"
+    assert retry.available_at > timezone.now()
+
+    # До окончания задержки событие не выбирается
+    assert OutboxService.process_batch() == 0
+
+
+@pytest.mark.django_db
+@override_settings(OUTBOX_MAX_ATTEMPTS=2)
+def test_event_fails_after_max_attempts(calls):
+    publish("order.created", {"order_id": "x"})
+    OutboxEvent.objects.filter(handler__endswith="remember").delete()
+
+    for _ in range(2):
+        OutboxEvent.objects.update(available_at=timezone.now())
+        OutboxService.process_batch()
+
+    event = OutboxEvent.objects.get()
+    assert event.status == OutboxEvent.Status.FAILED
+    assert event.attempts == 2
+
+
+@override_settings(OUTBOX_BACKOFF_BASE=5, OUTBOX_BACKOFF_MAX=60)
+def test_backoff_is_exponential_and_capped():
+    delays = [OutboxService.backoff(n).total_seconds() for n in range(1, 6)]
+    assert delays == [5, 10, 20, 40, 60]
+
+
+@pytest.mark.django_db
+def test_expired_lease_is_reclaimed(calls):
+    publish("order.created", {"order_id": "x"})
+    OutboxEvent.objects.update(
+        status=OutboxEvent.Status.PROCESSING,
+        available_at=timezone.now() + timedelta(minutes=5),
+    )
+    assert OutboxService.process_batch() == 0
+
+    OutboxEvent.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+    assert OutboxService.process_batch() == 2
+    assert calls == [{"order_id": "x"}]
+
+
+@pytest.mark.django_db
+def test_worker_command_runs_handlers_in_pool(calls, capsys):
+    for i in range(3):
+        publish("order.created", {"order_id": str(i)})
+
+    call_command("run_outbox_worker", "--once", "--workers", "2", "--batch-size", "2")
+
+    assert sorted(payload["order_id"] for payload in calls) == ["0", "1", "2"]
+    assert "Processed 6 events." in capsys.readouterr().out
+    assert OutboxEvent.objects.filter(status=OutboxEvent.Status.DONE).count() == 3
@@ -0,0 +1,198 @@
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F
+
+from apps.cart.models import Cart
+from apps.catalog.models import Category, Product
+from apps.core.pagination import KeysetPagination
+from apps.orders.models import Order
+from tests.conftest import UserFactory
+
+PRODUCTS_URL = "/api/v1/catalog/products/"
+
+
+@pytest.fixture
+def products(category):
+    # Цены и скидки повторяются, чтобы проверить tiebreaker по id
+    return [
+        Product.objects.create(
+            name=f"Стул {i}",
+            sku=f"SKU-{i:03d}",
+            price=Decimal(100 * (i % 4)),
+            discount=i % 3,
+            stock=i % 5,
+            category=category,
+        )
+        for i in range(23)
+    ]
+
+
+def _walk(client, params, link="next"):
+    seen, url, pages = [], PRODUCTS_URL, 0
+    while url:
+        response = client.get(url, params if pages == 0 else None)
+        assert response.status_code == 200
+        seen.extend(item["sku"] for item in response.data["results"])
+        url, pages = response.data[link], pages + 1
+    return seen, pages
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "ordering", ["price", "-price", "sku", "-discount", "stock", "-stock,price"]
+)
+def test_walks_every_ordering_without_gaps_or_duplicates(
+    api_client, products, ordering
+):
+    skus, pages = _walk(api_client, {"ordering": ordering, "limit": 5})
+    assert pages == 5
+    assert len(skus) == len(set(skus)) == len(products)
+
+    by_sku = {p.sku: p for p in products}
+    keys = []
+    for sku in skus:
+        key = []
+        for name in ordering.split(","):
+            value = getattr(by_sku[sku], name.lstrip("-"))
+            key.append(-value if name.startswith("-") else value)
+        keys.append(key if ordering != "sku" else sku)
+    assert keys == sorted(keys)
+
+
+@pytest.mark.django_db
+def test_previous_link_returns_same_page(api_client, products):
+    first = api_client.get(PRODUCTS_URL, {"limit": 5})
+    second = api_client.get(first.data["next"])
+    back = api_client.get(second.data["previous"])
+    assert back.data["results"] == first.data["results"]
+    assert back.data["previous"] is None
+
+
+@pytest.mark.django_db
+def test_response_has_no_count(api_client, products):
+    response = api_client.get(PRODUCTS_URL)
+    assert "count" not in response.data
+    assert len(response.data["results"]) == 10
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(api_client, products):
+    response = api_client.get(PRODUCTS_URL, {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_cursor_is_bound_to_ordering(api_client, products):
+    next_url = api_client.get(PRODUCTS_URL, {"ordering": "sku"}).data["next"]
+    cursor = next_url.split("cursor=")[1].split("&")[0]
+    response = api_client.get(PRODUCTS_URL, {"ordering": "price", "cursor": cursor})
+    assert response.status_code == 404
+
+
+def test_expression_ordering_is_rejected():
+    queryset = Product.objects.order_by(F("price").desc(), "sku")
+    with pytest.raises(ImproperlyConfigured, match="выражению"):
+        KeysetPagination().get_ordering(queryset)
+
+
+@pytest.mark.django_db
+def test_offset_pagination_only_for_staff(api_client, products):
+    response = api_client.get(PRODUCTS_URL, {"offset": 20})
+    assert "count" not in response.data
+
+    api_client.force_authenticate(UserFactory(is_staff=True))
+    response = api_client.get(PRODUCTS_URL, {"offset": 20})
+    assert response.data["count"] == len(products)
+    assert len(response.data["results"]) == 3
+
+
+CATEGORIES_URL = "/api/v1/catalog/categories/"
+
+
+@pytest.mark.django_db
+def test_exact_count_is_reported_and_cached(api_client, category):
+    response = api_client.get(CATEGORIES_URL)
+    assert response.data["count"] == 1
+    assert response.data["count_exact"] is True
+
+    Category.objects.create(name="Шкафы")
+    response = api_client.get(CATEGORIES_URL, {"offset": 0})
+    assert response.data["count"] == 1
+    assert len(response.data["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_large_estimate_replaces_count(api_client, category, mocker):
+    estimate = mocker.patch(
+        "apps.core.pagination.estimate_count", return_value=1_000_000
+    )
+    response = api_client.get(CATEGORIES_URL)
+    estimate.assert_called_once()
+    assert response.data["count"] == 1_000_000
+    assert response.data["count_exact"] is False
+
+
+@pytest.mark.django_db
+def test_count_can_be_disabled(api_client, category, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = api_client.get(CATEGORIES_URL, {"count": "false"})
+    assert "count" not in response.data
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_next_link_without_count(api_client, products):
+    api_client.force_authenticate(UserFactory(is_staff=True))
+    response = api_client.get(
+        PRODUCTS_URL, {"offset": 0, "limit": 20, "count": "false"}
+    )
+    assert response.data["next"] is not None
+    response = api_client.get(response.data["next"])
+    assert response.data["next"] is None
+    assert len(response.data["results"]) == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", ["true", "false"])
+def test_browsable_api_page_controls(api_client, products, count):
+    api_client.force_authenticate(UserFactory(is_staff=True))
+    params = {"offset": 5, "limit": 5, "count": count, "format": "api"}
+    response = api_client.get(PRODUCTS_URL, params)
+    assert response.status_code == 200
+    assert (b'class="pagination"' in response.content) == (count == "true")
+
+    # Без count число страниц неизвестно — ссылки на соседние страницы
+    paginator = response.renderer_context["view"].paginator
+    context = paginator.get_html_context()
+    assert context["next_url"] is not None
+    assert context["previous_url"] is not None
+
+
+@pytest.mark.django_db
+def test_keyset_count_on_request(api_client, products):
+    response = api_client.get(PRODUCTS_URL, {"count": "true", "min_price": "200"})
+    assert response.data["count"] == sum(1 for p in products if p.price >= 200)
+    assert response.data["count_exact"] is True
+
+
+@pytest.mark.django_db
+def test_count_cache_is_per_queryset_not_per_params(api_client):
+    owner, other = UserFactory(), UserFactory()
+    for _ in range(3):
+        Order.objects.create(
+            user=owner,
+            cart=Cart.objects.create(user=owner),
+            full_name="Иван",
+            phone="+79990001122",
+        )
+
+    api_client.force_authenticate(owner)
+    response = api_client.get("/api/v1/orders/", {"count": "true"})
+    assert response.data["count"] == 3
+
+    api_client.force_authenticate(other)
+    response = api_client.get("/api/v1/orders/", {"count": "true"})
+    assert response.data["count"] == 0
+    assert response.data["results"] == []
@@ -0,0 +1,117 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.urls import reverse
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.cart.models import Cart, CartItem
+from apps.core.parsers import ORJSONParser
+from apps.core.renderers import ORJSONRenderer
+from apps.orders.services.order_services import OrderService
+
+MOSCOW = ZoneInfo("Europe/Moscow")
+
+PAYLOAD = {
+    "decimal": Decimal("1999.90"),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "moscow": datetime.datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=MOSCOW),
+    "utc": datetime.datetime(2025, 3, 1, 9, 30, tzinfo=datetime.timezone.utc),
+    "date": datetime.date(2025, 3, 1),
+    "time": datetime.time(12, 30, 15, 500),
+    "duration": datetime.timedelta(hours=1, seconds=5),
+    # PhoneNumberField сериализатора отдаёт строку в формате E.164
+    "phone": str(PhoneNumber.from_string("+79990001122")),
+    "text": "Стол обеденный ",
+    "nested": [{"a": 1, "b": None}, (1.5, True)],
+    1: "int key",
+}
+
+
+def test_render_matches_stdlib_renderer():
+    assert ORJSONRenderer().render(PAYLOAD) == JSONRenderer().render(PAYLOAD)
+
+
+def test_indent_and_overflow_fall_back_to_stdlib():
+    context = {"indent": 4}
+    assert ORJSONRenderer().render(PAYLOAD, renderer_context=context) == (
+        JSONRenderer().render(PAYLOAD, renderer_context=context)
+    )
+    assert ORJSONRenderer().render({"big": 2**70}) == b'{"big":1180591620717411303424}'
+
+
+def test_raw_phone_number_is_rejected_like_stdlib():
+    data = {"phone": PhoneNumber.from_string("+79990001122")}
+    with pytest.raises(TypeError):
+        JSONRenderer().render(data)
+    with pytest.raises(TypeError):
+        ORJSONRenderer().render(data)
+
+
+def test_render_none_is_empty():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_parser():
+    body = '{"name": "Стол", "price": 10.5, "items": [1, 2]}'.encode()
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+        io.BytesIO(body)
+    )
+    for invalid in (b"{", b'{"price": NaN}'):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(invalid))
+
+
+def test_parser_respects_encoding():
+    body = '{"name": "Стол"}'.encode("cp1251")
+    context = {"encoding": "cp1251"}
+    assert ORJSONParser().parse(io.BytesIO(body), parser_context=context) == {
+        "name": "Стол"
+    }
+
+
+@pytest.fixture
+def order(user, product):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=product, quantity=2)
+    return OrderService.create_order_from_cart(
+        user=user,
+        contact_data={
+            "full_name": "Иван",
+            "phone": "+79990001122",
+            "email": "i@example.com",
+        },
+    )
+
+
+@pytest.mark.django_db
+def test_every_get_endpoint_matches_stdlib_renderer(user, product, order):
+    client = APIClient()
+    client.force_authenticate(user)
+    urls = [
+        reverse("product-list"),
+        reverse("product-detail", kwargs={"slug": product.slug}),
+        reverse("product-facets"),
+        reverse("category-list"),
+        reverse("category-detail", kwargs={"slug": product.category.slug}),
+        reverse("catalog-suggest") + "?q=стол",
+        reverse("carts-list"),
+        reverse("carts-get-current-cart"),
+        reverse("orders-list"),
+        reverse("orders-detail", kwargs={"pk": order.pk}),
+    ]
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200, url
+        assert isinstance(response.accepted_renderer, ORJSONRenderer)
+        expected = JSONRenderer().render(
+            response.data, response.accepted_media_type, response.renderer_context
+        )
+        assert response.content == expected, url
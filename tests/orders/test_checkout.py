@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+from django.db import connection
+from rest_framework.exceptions import ValidationError
+
+from apps.cart.models import Cart, CartItem
+from apps.catalog.models import Product
+from apps.orders.models import Order
+from apps.orders.services.order_services import OrderService
+from tests.conftest import UserFactory, make_products
+
+CONTACTS = {"full_name": "Иван", "phone": "+79990001122"}
+
+
+def make_cart(products, quantity=1):
+    user = UserFactory.create()
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.bulk_create(
+        CartItem(cart=cart, product=product, quantity=quantity) for product in products
+    )
+    return user
+
+
+@pytest.mark.django_db
+def test_decrement_stock_is_guarded(category):
+    first, second = make_products(category, 2, stock=3)
+    updated = Product.objects.decrement_stock({first.pk: 2, second.pk: 4})
+    assert updated == 1
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.stock, second.stock) == (1, 3)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("lines", [1, 15])
+def test_checkout_query_count_is_fixed(category, lines, django_assert_num_queries):
+    user = make_cart(make_products(category, lines), quantity=2)
+    # Корзина, позиции, товары, резервы, заказ, позиции заказа, списание,
+    # снятие резервов, очистка корзины и точки сохранения транзакции
+    with django_assert_num_queries(11):
+        order = OrderService.create_order_from_cart(user=user, contact_data=CONTACTS)
+    assert order.items.count() == lines
+    assert set(Product.objects.values_list("stock", flat=True)) == {8}
+
+
+@pytest.mark.django_db
+def test_checkout_touches_updated_at(product):
+    before = product.updated_at
+    user = make_cart([product])
+    OrderService.create_order_from_cart(user=user, contact_data=CONTACTS)
+    product.refresh_from_db()
+    assert product.updated_at > before
+    assert product.stock == 4
+
+
+@pytest.mark.django_db
+def test_checkout_rejects_deleted_product(user):
+    cart = Cart.objects.create(user=user)
+    CartItem.objects.create(cart=cart, product=None, quantity=1)
+    with pytest.raises(ValidationError, match="удалён"):
+        OrderService.create_order_from_cart(user=user, contact_data=CONTACTS)
+
+
+@pytest.mark.django_db
+def test_checkout_rejects_item_added_after_product_lock(product, mocker):
+    user = make_cart([product])
+    # Позиция появилась после блокировки товаров корзины
+    mocker.patch(
+        "apps.cart.reservation_services.ReservationService.lock_products",
+        return_value={},
+    )
+    with pytest.raises(ValidationError, match="Корзина изменилась"):
+        OrderService.create_order_from_cart(user=user, contact_data=CONTACTS)
+    assert not Order.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_checkouts_do_not_oversell(category):
+    first, second = make_products(category, 2, stock=10)
+    # Половина корзин содержит товары в обратном порядке — без взаимных блокировок
+    users = [
+        make_cart([first, second] if i % 2 else [second, first]) for i in range(30)
+    ]
+    results = []
+    barrier = threading.Barrier(len(users))
+
+    def checkout(user):
+        barrier.wait()
+        try:
+            OrderService.create_order_from_cart(user=user, contact_data=CONTACTS)
+            results.append(True)
+        except ValidationError:
+            results.append(False)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=checkout, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 10
+    assert Order.objects.count() == 10
+    assert set(Product.objects.values_list("stock", flat=True)) == {0}
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.cart.models import Cart
+from apps.orders.models import Order, OrderItem
+from tests.conftest import UserFactory
+
+
+@pytest.fixture
+def orders(user, product):
+    """25 заказов пользователя с разным created_at и одна позиция в каждом."""
+    now = timezone.now()
+    orders = []
+    for i in range(25):
+        order = Order.objects.create(
+            user=user,
+            cart=Cart.objects.create(user=user),
+            full_name="Иван",
+            phone="+79990001122",
+            items_count=1,
+            total=Decimal("90.00"),
+        )
+        OrderItem.objects.create(
+            order=order, product=product, quantity=1, price=Decimal("90.00")
+        )
+        orders.append(order)
+    for i, order in enumerate(orders):
+        Order.objects.filter(pk=order.pk).update(created_at=now - timedelta(hours=i))
+    return orders
+
+
+@pytest.mark.django_db
+def test_history_is_cursor_paginated_newest_first(client, user, orders):
+    client.force_login(user)
+
+    seen = []
+    url = reverse("orders-list") + "?limit=10"
+    while url:
+        data = client.get(url).json()
+        seen += [order["id"] for order in data["results"]]
+        url = data["next"]
+
+    assert seen == [str(order.id) for order in orders]
+
+
+@pytest.mark.django_db
+def test_history_summary_shape(client, user, orders, product):
+    client.force_login(user)
+
+    order = client.get(reverse("orders-list")).json()["results"][0]
+
+    assert set(order) == {"id", "status", "created_at", "items_count", "total", "items"}
+    assert order["items"] == [
+        {
+            "product_id": str(product.id),
+            "name": product.name,
+            "slug": product.slug,
+            "quantity": 1,
+            "price": "90.00",
+        }
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cached_db_sessions")
+def test_history_query_count_is_fixed(client, user, orders, django_assert_num_queries):
+    client.force_login(user)
+
+    # Пользователь (сессия — из кэша), страница заказов, позиции с товарами
+    with django_assert_num_queries(3):
+        response = client.get(reverse("orders-list") + "?limit=20")
+    assert len(response.json()["results"]) == 20
+
+
+@pytest.mark.django_db
+def test_history_only_own_orders(client, orders):
+    client.force_login(UserFactory())
+
+    assert client.get(reverse("orders-list")).json()["results"] == []
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from apps.cart.models import Cart, CartItem
+from apps.catalog.models import Product
+from apps.orders.models import Order, OrderItem
+from apps.orders.services.order_services import OrderService
+
+CONTACTS = {"full_name": "Иван", "phone": "+79990001122"}
+
+
+def place_order(user, lines):
+    cart = Cart.objects.create(user=user)
+    for product, quantity in lines:
+        CartItem.objects.create(cart=cart, product=product, quantity=quantity)
+    return OrderService.create_order_from_cart(user=user, contact_data=CONTACTS)
+
+
+@pytest.fixture
+def second_product(category):
+    return Product.objects.create(
+        name="Стул", sku="SKU002", price=Decimal("15.50"), stock=10, category=category
+    )
+
+
+@pytest.mark.django_db
+def test_checkout_stores_totals(user, product, second_product):
+    order = place_order(user, [(product, 2), (second_product, 3)])
+
+    order.refresh_from_db()
+    # 2 × 90.00 (скидка 10%) + 3 × 15.50
+    assert order.subtotal == Decimal("226.50")
+    assert order.total == Decimal("226.50")
+    assert order.items_count == 5
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("cached_db_sessions")
+def test_list_does_not_aggregate_per_order(
+    client, user, product, second_product, django_assert_num_queries
+):
+    for i in range(3):
+        place_order(user, [(product, 1), (second_product, 1)])
+        # Оформленная корзина остаётся за заказом, следующему нужна новая
+        Cart.objects.filter(user=user).update(user=None, session_key=f"{i}" * 20)
+    client.force_login(user)
+
+    # Пользователь (сессия — из кэша), заказы, позиции с товарами —
+    # при любом числе заказов
+    with django_assert_num_queries(3):
+        response = client.get(reverse("orders-list"))
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [order["total"] for order in results] == [105.5] * 3
+    assert {order["items_count"] for order in results} == {2}
+
+
+@pytest.mark.django_db
+def test_backfill_command_recalculates(user, product, second_product, capsys):
+    order = place_order(user, [(product, 1), (second_product, 2)])
+    empty = Order.objects.create(
+        cart=Cart.objects.create(user=user), full_name="Пусто", phone="+79990001123"
+    )
+    Order.objects.update(subtotal=0, total=0, items_count=0)
+
+    call_command("backfill_order_totals", "--batch-size", "1")
+
+    order.refresh_from_db()
+    assert (order.subtotal, order.total, order.items_count) == (
+        Decimal("121.00"),
+        Decimal("121.00"),
+        3,
+    )
+    empty.refresh_from_db()
+    assert (empty.total, empty.items_count) == (Decimal("0.00"), 0)
+    assert "Updated totals of 2 orders." in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+def test_recalculate_after_item_change(user, product, second_product):
+    order = place_order(user, [(product, 1)])
+    OrderItem.objects.create(
+        order=order, product=second_product, quantity=2, price=Decimal("15.50")
+    )
+
+    OrderService.recalculate_totals(order)
+
+    assert order.total == Decimal("121.00")
+    assert order.items_count == 3
@@ -0,0 +1,228 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.cart.models import Cart, CartItem
+from apps.orders.models import Order
+from tests.conftest import UserFactory
+
+
+def login(client, user):
+    response = client.post(
+        reverse("auth-login"),
+        {"email": user.email, "password": "password"},
+        format="json",
+    )
+    assert response.status_code == 200
+    return response.data
+
+
+def bearer(user):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {login(APIClient(), user)['access']}"
+    )
+    return client
+
+
+def tables(captured):
+    return " ".join(q["sql"] for q in captured.captured_queries)
+
+
+@pytest.mark.django_db
+def test_login_embeds_user_id_and_is_staff(user):
+    staff = UserFactory.create(is_staff=True)
+
+    token = AccessToken(login(APIClient(), user)["access"])
+    staff_token = AccessToken(login(APIClient(), staff)["access"])
+
+    assert token["user_id"] == str(user.pk)
+    assert token["is_staff"] is False
+    assert staff_token["is_staff"] is True
+
+
+@pytest.mark.django_db
+def test_refresh_and_verify(user):
+    tokens = login(APIClient(), user)
+    client = APIClient()
+
+    refreshed = client.post(
+        reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert refreshed.status_code == 200
+    assert AccessToken(refreshed.data["access"])["is_staff"] is False
+
+    verified = client.post(
+        reverse("auth-verify"), {"token": tokens["access"]}, format="json"
+    )
+    assert verified.status_code == 200
+
+
+@pytest.mark.django_db
+def test_refresh_rereads_is_staff(user):
+    staff = UserFactory.create(is_staff=True)
+    tokens = login(APIClient(), staff)
+    assert "is_staff" not in RefreshToken(tokens["refresh"]).payload
+
+    staff.is_staff = False
+    staff.save()
+    response = APIClient().post(
+        reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert response.status_code == 200
+    assert AccessToken(response.data["access"])["is_staff"] is False
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+    response = client.post(reverse("category-list"), {"name": "Стулья"}, format="json")
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_refresh_rejects_inactive_user(user):
+    tokens = login(APIClient(), user)
+    user.is_active = False
+    user.save()
+
+    response = APIClient().post(
+        reverse("auth-refresh"), {"refresh": tokens["refresh"]}, format="json"
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_wrong_password(user):
+    response = APIClient().post(
+        reverse("auth-login"),
+        {"email": user.email, "password": "wrong"},
+        format="json",
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_admin_permission_without_user_lookup(user):
+    client = bearer(user)
+    staff_client = bearer(UserFactory.create(is_staff=True))
+
+    with CaptureQueriesContext(connection) as captured:
+        response = client.post(
+            reverse("category-list"), {"name": "Стулья"}, format="json"
+        )
+    assert response.status_code == 403
+    assert len(captured) == 0
+
+    response = staff_client.post(
+        reverse("category-list"), {"name": "Стулья"}, format="json"
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.django_db
+def test_cart_without_user_or_session_lookup(user, product):
+    client = bearer(user)
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 1},
+        format="json",
+    )
+    item = Cart.objects.get(user=user).items.get()
+
+    with CaptureQueriesContext(connection) as captured:
+        response = client.patch(
+            reverse("carts-update-item", kwargs={"pk": item.pk}),
+            {"quantity": 2},
+            format="json",
+        )
+    assert response.status_code == 200
+    assert "users_user" not in tables(captured)
+    assert "django_session" not in tables(captured)
+
+
+@pytest.mark.django_db
+def test_foreign_cart_item_is_forbidden(user, product):
+    other = Cart.objects.create(user=UserFactory.create())
+    item = CartItem.objects.create(cart=other, product=product, quantity=1)
+
+    response = bearer(user).patch(
+        reverse("carts-update-item", kwargs={"pk": item.pk}),
+        {"quantity": 2},
+        format="json",
+    )
+    assert response.status_code in (403, 404)
+    item.refresh_from_db()
+    assert item.quantity == 1
+
+
+@pytest.mark.django_db
+def test_order_contacts_default_to_profile(user, product):
+    client = bearer(user)
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 1},
+        format="json",
+    )
+
+    with CaptureQueriesContext(connection) as captured:
+        response = client.post(reverse("orders-list"), {}, format="json")
+    assert response.status_code == 201
+    # Профиль загружается один раз — только ради контактов заказа
+    assert tables(captured).count('FROM "users_user"') == 1
+
+    order = Order.objects.get()
+    assert order.user_id == user.pk
+    assert order.full_name == user.get_full_name()
+    assert order.phone == user.phone
+    assert order.email == user.email
+
+
+@pytest.mark.django_db
+def test_order_history_without_user_lookup(user, product):
+    client = bearer(user)
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 1},
+        format="json",
+    )
+    client.post(
+        reverse("orders-list"),
+        {"full_name": "Иван", "phone": "+79991112233", "email": "i@example.com"},
+        format="json",
+    )
+
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(reverse("orders-list"))
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 1
+    assert "users_user" not in tables(captured)
+
+
+@pytest.mark.django_db
+def test_guest_must_send_contacts(product):
+    client = APIClient()
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 1},
+        format="json",
+    )
+
+    response = client.post(reverse("orders-list"), {}, format="json")
+    assert response.status_code == 400
+    assert set(response.data) == {"full_name", "phone"}
+
+
+@pytest.mark.django_db
+def test_login_merges_guest_cart(user, product):
+    client = APIClient()
+    client.post(
+        reverse("carts-add"),
+        {"product_id": str(product.id), "quantity": 2},
+        format="json",
+    )
+
+    login(client, user)
+
+    assert Cart.objects.get(user=user).items.get().quantity == 2